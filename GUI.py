@@ -1,19 +1,74 @@
+import time
+_STARTED = time.perf_counter()
+
 import os
 import sys
+import multiprocessing
 import tkinter as tk
-from tkinter import messagebox
-import numpy as np
-import networkx as nx
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from PIL import Image, ImageTk
+from tkinter import filedialog, messagebox, ttk
 
-from display_utils import display_graph_result, display_matrix_result
-from welsh_powell import run_welsh_powell
+# numpy, networkx, matplotlib and PIL are only imported when an algorithm
+# runs or a result is drawn, so the main window appears without them.
+from algorithms import ALGORITHMS, display_result
+from background import BackgroundRunner
 
 
 # Define algorithms list
-algorithms = ["Welsh-Powell", "Dijkstra", "Kruskal", "Bellman-Ford", "Ford-Fulkerson", "North-West Corner", "Least Cost", "Stepping-Stone", "Potential Method"]
+algorithms = list(ALGORITHMS)
+
+LOGO_SIZE = (500, 150)
+
+# Max-flow engines offered for Ford-Fulkerson (label -> ford_fulkerson method)
+FLOW_METHODS = {"Dinic": "dinic", "Edmonds-Karp": "edmonds_karp", "Push-Relabel": "push_relabel"}
+# Coloring strategies offered for Welsh-Powell (label -> welsh_powell method)
+COLORING_METHODS = {"Welsh-Powell": "welsh_powell", "DSatur": "dsatur",
+                    "Jones-Plassmann": "jones_plassmann"}
+# All-pairs methods (label -> all_pairs method)
+ALL_PAIRS_METHODS = {"Automatic": "auto", "Floyd-Warshall": "floyd_warshall",
+                     "Dijkstra per source": "dijkstra"}
+# Algorithms with an engine selector: (label, choices)
+METHOD_CHOICES = {"Ford-Fulkerson": ("Max-flow engine:", FLOW_METHODS),
+                  "Welsh-Powell": ("Coloring strategy:", COLORING_METHODS),
+                  "All-Pairs": ("Method:", ALL_PAIRS_METHODS)}
+
+def asset_path(*parts):
+    if getattr(sys, 'frozen', False):
+        # If the application is frozen (running as an executable)
+        base_path = sys._MEIPASS
+    else:
+        # If the application is running in a normal Python environment
+        base_path = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base_path, *parts)
+
+def load_logo():
+    """Logo as a PhotoImage, scaled to LOGO_SIZE once and cached on disk"""
+    width, height = LOGO_SIZE
+    source = asset_path('img', 'logo emsi.png')
+    bundled = asset_path('img', f'logo emsi {width}x{height}.png')
+    cached = os.path.join(os.path.expanduser('~'), '.cache', 'project_tkinter',
+                          f'logo emsi {width}x{height}.png')
+
+    # Tk reads PNG natively, so a pre-scaled copy needs no PIL at all
+    if os.path.exists(bundled):
+        return tk.PhotoImage(file=bundled)
+    if os.path.exists(cached) and os.path.getmtime(cached) >= os.path.getmtime(source):
+        return tk.PhotoImage(file=cached)
+
+    from PIL import Image
+    logo_img = Image.open(source).resize(LOGO_SIZE, Image.LANCZOS)
+    try:
+        os.makedirs(os.path.dirname(cached), exist_ok=True)
+        logo_img.save(cached)
+        return tk.PhotoImage(file=cached)
+    except OSError:
+        from PIL import ImageTk
+        return ImageTk.PhotoImage(logo_img)
+
+def report_startup_time(root):
+    """Print how long it took until the main window was first drawn"""
+    elapsed_ms = (time.perf_counter() - _STARTED) * 1000
+    print(f"Startup time: {elapsed_ms:.0f} ms")
+    root.startup_time_ms = elapsed_ms
 
 def create_credits_frame(parent):
     """Create a professionally styled credits frame"""
@@ -44,25 +99,7 @@ def setup_main_window():
     
     # Load and display logo
     try:
-        if getattr(sys, 'frozen', False):
-
-            # If the application is frozen (running as an executable)
-
-            base_path = sys._MEIPASS
-
-        else:
-
-            # If the application is running in a normal Python environment
-
-            base_path = os.path.dirname(__file__)
-
-
-
-        logo_path = os.path.join(base_path, 'img', 'logo emsi.png')
-
-        logo_img = Image.open(logo_path)
-        logo_img = logo_img.resize((500, 150), Image.LANCZOS)  # Adjust size as needed
-        logo_photo = ImageTk.PhotoImage(logo_img)
+        logo_photo = load_logo()
         logo_label = tk.Label(main_container, image=logo_photo, bg='#ffffff')
         logo_label.image = logo_photo  # Keep a reference
         logo_label.pack(pady=(0, 20))
@@ -197,11 +234,22 @@ def open_algorithm_window(algo_name):
             # Get additional inputs based on algorithm type
             kwargs = {'vertices': vertices}
             
+            if input_fields.get('graph_file') and input_fields['graph_file'].get().strip():
+                kwargs['graph_file'] = input_fields['graph_file'].get().strip()
             if algo_name in ["Dijkstra", "Bellman-Ford"]:
                 kwargs['source'] = int(input_fields['source'].get())
+            elif algo_name in METHOD_CHOICES:
+                kwargs['method'] = METHOD_CHOICES[algo_name][1][input_fields['method'].get()]
             elif algo_name in ["North-West Corner", "Least Cost", "Stepping-Stone", "Potential Method"]:
-                kwargs['supply'] = [int(x) for x in input_fields['supply'].get().split(',')]
-                kwargs['demand'] = [int(x) for x in input_fields['demand'].get().split(',')]
+                # Each field holds either comma-separated values or a file path
+                for key in ('supply', 'demand'):
+                    text = input_fields[key].get().strip()
+                    if os.path.isfile(text):
+                        kwargs[f'{key}_file'] = text
+                    else:
+                        kwargs[key] = [float(x) for x in text.split(',')]
+                if input_fields['costs_file'].get().strip():
+                    kwargs['costs_file'] = input_fields['costs_file'].get().strip()
 
             display_algorithm_code_and_result(algo_name, **kwargs)
         except ValueError as e:
@@ -221,43 +269,68 @@ def display_algorithm_code_and_result(algo_name, **kwargs):
     title_label = tk.Label(frame, text=f"{algo_name} Result", font=("Helvetica", 14, "bold"))
     title_label.pack(pady=10)
 
-    # Call the respective algorithm module based on the algorithm name
-    if algo_name == "Welsh-Powell":
-        from welsh_powell import run_welsh_powell
-        run_welsh_powell(frame, kwargs['vertices'])
-    elif algo_name == "Dijkstra":
-        from dijkstra import run_dijkstra
-        run_dijkstra(frame, kwargs['vertices'])
-    elif algo_name == "Kruskal":
-        from kruskal import run_kruskal
-        run_kruskal(frame, kwargs['vertices'])
-    elif algo_name == "Bellman-Ford":
-        from bellman_ford import run_bellman_ford
-        run_bellman_ford(frame, kwargs['vertices'], kwargs['source'])
-    elif algo_name == "Ford-Fulkerson":
-        from ford_fulkerson import run_ford_fulkerson
-        run_ford_fulkerson(frame, kwargs['vertices'])
-    elif algo_name == "North-West Corner":
-        from north_west_corner import run_north_west_corner
-        run_north_west_corner(frame, kwargs['vertices'])
-    elif algo_name == "Least Cost":
-        from least_cost import run_least_cost_method
-        run_least_cost_method(frame, kwargs['vertices'])
-    elif algo_name == "Stepping-Stone":
-        from stepping_stone import run_stepping_stone_method
-        run_stepping_stone_method(frame, kwargs['vertices'])
-    elif algo_name == "Potential Method":
-        from potential_method import run_potential_method
-        run_potential_method(frame, kwargs['vertices'])
+    # Progress while the run is queued / solving in a worker process
+    status_frame = tk.Frame(frame)
+    status_frame.pack(pady=10)
+    status_label = tk.Label(status_frame, text="Waiting in queue...", font=("Arial", 11))
+    status_label.pack()
+    progress = ttk.Progressbar(status_frame, mode='indeterminate', length=300)
+    progress.pack(pady=5)
+    progress.start(15)
+
+    def show_status():
+        if job.state == "queued":
+            status_label.config(text=f"Waiting in queue ({job.queue_position} run(s) ahead)...")
+        elif job.state == "running":
+            status_label.config(text=f"Solving... {job.elapsed:.1f} s")
+
+    def close_status():
+        runner.remove_listener(show_status)
+        if status_frame.winfo_exists():
+            status_frame.destroy()
+
+    def on_done(instance, result):
+        close_status()
+        if not frame.winfo_exists():
+            return
+        try:
+            display_result(algo_name, frame, instance, result, params)
+        except Exception as e:
+            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+            print(f"Error in {algo_name}: {str(e)}")
+
+    def on_error(message):
+        close_status()
+        messagebox.showerror("Error", f"An error occurred: {message.splitlines()[0]}")
+        print(f"Error in {algo_name}: {message}")
+
+    def on_cancel():
+        close_status()
+        if frame.winfo_exists():
+            tk.Label(frame, text="Run cancelled", font=("Arial", 12)).pack(pady=10)
+
+    def close_window():
+        job.cancel()
+        result_window.destroy()
+
+    # Only the instance parameters the generators use are sent to the worker
+    params = {key: kwargs[key] for key in ('vertices', 'source', 'method', 'graph_file', 'supply', 'demand',
+                                           'supply_file', 'demand_file', 'costs_file') if key in kwargs}
+    job = runner.submit(algo_name, params, on_done=on_done, on_error=on_error, on_cancel=on_cancel)
+    runner.add_listener(show_status)
+    show_status()
+
+    btn_cancel = tk.Button(status_frame, text="Cancel", width=12, command=job.cancel)
+    btn_cancel.pack(pady=5)
+    result_window.protocol("WM_DELETE_WINDOW", close_window)
         
         
     # Display Graph Result
 def display_graph_result(frame, fig, result):
     result_label = tk.Label(frame, text=result, font=("Arial", 12), wraplength=700)
     result_label.pack(pady=10)
-    canvas = FigureCanvasTkAgg(fig, master=frame)
-    canvas.draw()
-    canvas.get_tk_widget().pack()
+    from display_utils import figure_pool
+    figure_pool.show(frame, fig)
 
 # Display Matrix Result
 def display_matrix_result(frame, matrix, supply, demand, result):
@@ -291,6 +364,7 @@ def create_welsh_powell_frame(parent):
             vertices = int(vertices_entry.get())
             if vertices <= 0:
                 raise ValueError("Number of vertices must be positive")
+            from welsh_powell import run_welsh_powell
             run_welsh_powell(result_frame, vertices)
         except ValueError as e:
             messagebox.showerror("Error", str(e))
@@ -320,6 +394,28 @@ def create_algorithm_inputs(frame, algo_name):
     vertices_entry.pack(side=tk.LEFT, padx=5)
     input_fields['vertices'] = vertices_entry
     
+    # Graph algorithms can also read their graph from a file instead
+    if ALGORITHMS[algo_name].kind == "graph":
+        file_frame = tk.Frame(input_frame)
+        file_frame.pack(pady=5)
+        
+        file_label = tk.Label(file_frame, text="Graph file (optional):")
+        file_label.pack(side=tk.LEFT)
+        
+        file_entry = tk.Entry(file_frame, width=30)
+        file_entry.pack(side=tk.LEFT, padx=5)
+        input_fields['graph_file'] = file_entry
+        
+        def browse():
+            path = filedialog.askopenfilename(filetypes=[
+                ("Graph files", "*.txt *.csv *.tsv *.edges *.mtx *.npy"), ("All files", "*.*")])
+            if path:
+                file_entry.delete(0, tk.END)
+                file_entry.insert(0, path)
+        
+        browse_button = tk.Button(file_frame, text="Browse...", command=browse)
+        browse_button.pack(side=tk.LEFT)
+    
     # Algorithm-specific inputs
     if algo_name in ["Dijkstra", "Bellman-Ford"]:
         source_frame = tk.Frame(input_frame)
@@ -333,11 +429,24 @@ def create_algorithm_inputs(frame, algo_name):
         source_entry.pack(side=tk.LEFT, padx=5)
         input_fields['source'] = source_entry
         
+    elif algo_name in METHOD_CHOICES:
+        label, choices = METHOD_CHOICES[algo_name]
+        method_frame = tk.Frame(input_frame)
+        method_frame.pack(pady=5)
+        
+        method_label = tk.Label(method_frame, text=label)
+        method_label.pack(side=tk.LEFT)
+        
+        method_box = ttk.Combobox(method_frame, values=list(choices), state='readonly')
+        method_box.current(0)
+        method_box.pack(side=tk.LEFT, padx=5)
+        input_fields['method'] = method_box
+        
     elif algo_name in ["North-West Corner", "Least Cost", "Stepping-Stone", "Potential Method"]:
         supply_frame = tk.Frame(input_frame)
         supply_frame.pack(pady=5)
         
-        supply_label = tk.Label(supply_frame, text="Supply (comma-separated):")
+        supply_label = tk.Label(supply_frame, text="Supply (comma-separated or file):")
         supply_label.pack(side=tk.LEFT)
         
         supply_entry = tk.Entry(supply_frame)
@@ -348,18 +457,45 @@ def create_algorithm_inputs(frame, algo_name):
         demand_frame = tk.Frame(input_frame)
         demand_frame.pack(pady=5)
         
-        demand_label = tk.Label(demand_frame, text="Demand (comma-separated):")
+        demand_label = tk.Label(demand_frame, text="Demand (comma-separated or file):")
         demand_label.pack(side=tk.LEFT)
         
         demand_entry = tk.Entry(demand_frame)
         demand_entry.insert(0, "15,25,35")
         demand_entry.pack(side=tk.LEFT, padx=5)
         input_fields['demand'] = demand_entry
+        
+        costs_frame = tk.Frame(input_frame)
+        costs_frame.pack(pady=5)
+        
+        costs_label = tk.Label(costs_frame, text="Cost matrix file (optional):")
+        costs_label.pack(side=tk.LEFT)
+        
+        costs_entry = tk.Entry(costs_frame, width=30)
+        costs_entry.pack(side=tk.LEFT, padx=5)
+        input_fields['costs_file'] = costs_entry
+        
+        def browse_costs():
+            path = filedialog.askopenfilename(filetypes=[
+                ("Matrix files", "*.csv *.txt *.tsv *.npy"), ("All files", "*.*")])
+            if path:
+                costs_entry.delete(0, tk.END)
+                costs_entry.insert(0, path)
+        
+        browse_costs_button = tk.Button(costs_frame, text="Browse...", command=browse_costs)
+        browse_costs_button.pack(side=tk.LEFT)
     
     return input_frame, input_fields
 
 
 
-root = setup_main_window()
+if __name__ == "__main__":
+    # Worker processes of frozen builds re-enter here
+    multiprocessing.freeze_support()
+
+    root = setup_main_window()
+    runner = BackgroundRunner(root)
+    root.after_idle(report_startup_time, root)
 
-root.mainloop()
\ No newline at end of file
+    root.mainloop()
+    runner.shutdown()
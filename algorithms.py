@@ -0,0 +1,119 @@
+from dataclasses import dataclass
+from importlib import import_module
+from typing import Callable, Optional
+
+# Registry of the algorithms offered by the GUI. Modules are only imported
+# when an algorithm is first used, and nothing here needs tkinter, so the
+# same entries drive the GUI, the background workers and batch jobs.
+
+
+def _no_args(instance, params):
+    return ()
+
+
+def _method_args(instance, params):
+    return (params['method'],) if 'method' in params else ()
+
+
+def _source_args(instance, params):
+    return (params.get('source', 0),)
+
+
+def _source_sink_args(instance, params):
+    return (0, instance[0].number_of_nodes() - 1, params.get('method', 'dinic'))
+
+
+@dataclass
+class AlgorithmSpec:
+    module: str
+    generate: str
+    solve: str
+    display: str
+    kind: str                      # "graph" or "transportation"
+    solve_args: Callable = _no_args
+    # Interactive display: takes the display arguments followed by the solve arguments
+    editor: Optional[str] = None
+
+    def load(self, attribute):
+        return getattr(import_module(self.module), attribute)
+
+
+ALGORITHMS = {
+    "Welsh-Powell": AlgorithmSpec("welsh_powell", "generate_welsh_powell_graph",
+                                  "solve_welsh_powell", "display_welsh_powell", "graph",
+                                  _method_args),
+    "Dijkstra": AlgorithmSpec("dijkstra", "generate_dijkstra_graph",
+                              "solve_dijkstra", "display_dijkstra", "graph", _source_args,
+                              editor="edit_dijkstra"),
+    "Kruskal": AlgorithmSpec("kruskal", "generate_kruskal_graph",
+                             "solve_kruskal", "display_kruskal", "graph"),
+    "Bellman-Ford": AlgorithmSpec("bellman_ford", "generate_bellman_ford_graph",
+                                  "solve_bellman_ford", "display_bellman_ford", "graph", _source_args),
+    "All-Pairs": AlgorithmSpec("all_pairs", "generate_all_pairs_graph",
+                               "solve_all_pairs", "display_all_pairs", "graph", _method_args),
+    "Ford-Fulkerson": AlgorithmSpec("ford_fulkerson", "generate_flow_network",
+                                    "solve_ford_fulkerson", "display_ford_fulkerson", "graph",
+                                    _source_sink_args, editor="edit_ford_fulkerson"),
+    "North-West Corner": AlgorithmSpec("north_west_corner", "generate_transportation_problem",
+                                       "solve_north_west_corner", "display_north_west_corner",
+                                       "transportation"),
+    "Least Cost": AlgorithmSpec("least_cost", "generate_transportation_problem",
+                                "solve_least_cost", "display_least_cost", "transportation"),
+    "Stepping-Stone": AlgorithmSpec("stepping_stone", "generate_transportation_problem",
+                                    "solve_stepping_stone", "display_stepping_stone",
+                                    "transportation"),
+    "Potential Method": AlgorithmSpec("potential_method", "generate_transportation_problem",
+                                      "solve_potential_method", "display_potential_method",
+                                      "transportation"),
+}
+
+
+def get_algorithm(name):
+    try:
+        return ALGORITHMS[name]
+    except KeyError:
+        raise ValueError(f"Unknown algorithm: {name}")
+
+
+def generate_instance(name, params):
+    """Instance for an algorithm, as the tuple of arguments its solver takes:
+    random (graphs with the generator's edge density unless ``params`` has
+    one), or read from ``params['graph_file']`` for graph algorithms"""
+    spec = get_algorithm(name)
+    if params.get('graph_file'):
+        from graph_io import graph_instance, load_graph
+        return graph_instance(name, load_graph(params['graph_file']))
+    generate = spec.load(spec.generate)
+    if spec.kind == "transportation":
+        supply = params.get('supply_file') or params.get('supply')
+        demand = params.get('demand_file') or params.get('demand')
+        if params.get('costs_file') or (supply is not None and demand is not None):
+            from transportation_io import load_transportation_problem
+            return load_transportation_problem(supply, demand, params.get('costs_file'),
+                                               seed=params.get('seed'))
+        return generate(params['vertices'], seed=params.get('seed'))
+    if params.get('density') is not None:
+        return (generate(params['vertices'], params['density'], seed=params.get('seed')),)
+    return (generate(params['vertices'], seed=params.get('seed')),)
+
+
+def solve_instance(name, instance, params):
+    spec = get_algorithm(name)
+    solve = spec.load(spec.solve)
+    return solve(*instance, *spec.solve_args(instance, params))
+
+
+def run_algorithm(name, params):
+    """Generate and solve one instance headlessly; return (instance, result)"""
+    instance = generate_instance(name, params)
+    return instance, solve_instance(name, instance, params)
+
+
+def display_result(name, frame, instance, result, params=None):
+    """Draw a result in frame; with the run's ``params`` (GUI windows),
+    algorithms that have an editor show it as well"""
+    spec = get_algorithm(name)
+    if params is not None and spec.editor:
+        spec.load(spec.editor)(frame, *instance, result, *spec.solve_args(instance, params))
+    else:
+        spec.load(spec.display)(frame, *instance, result)
@@ -0,0 +1,320 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+from csr_graph import CSRGraph
+from dijkstra import dijkstra_arrays
+from graph_generator import generate_random_graph
+from graph_io import evict_cache
+from results import AllPairsResult, ShortestPathResult, trace_path
+
+# All-pairs shortest paths computed once per graph and kept on disk. The
+# distance and predecessor matrices are .npy files opened as memory maps,
+# so looking up one source/target pair reads a single entry and never
+# loads the matrices into RAM. Dense graphs (or graphs with negative
+# weights) use a blocked Floyd-Warshall that streams the matrix in row
+# chunks; sparse graphs run one Dijkstra per source in a process pool.
+#
+# The matrices go to a temporary directory removed with the store, unless
+# a directory is given or caching is asked for: cached results live under
+# CACHE_DIR, whose least recently used entries are removed once the cache
+# grows past CACHE_LIMIT bytes.
+
+DENSE_THRESHOLD = 0.1   # arcs / V^2 above which Floyd-Warshall is used
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'project_tkinter', 'all_pairs')
+CACHE_LIMIT = 2 * 2 ** 30
+
+
+def graph_key(csr):
+    """Hash of a CSRGraph's structure and weights"""
+    digest = hashlib.blake2b(digest_size=16)
+    for array in (csr.indptr, csr.indices, csr.weights):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return digest.hexdigest()
+
+
+def _row_chunk(n, budget=64 * 2 ** 20):
+    """Rows of an n x n float matrix that fit in ``budget`` bytes"""
+    return max(1, min(n, budget // (8 * max(n, 1))))
+
+
+def _initialize(csr, dist, pred):
+    n = csr.vertices
+    sources = np.repeat(np.arange(n), np.diff(csr.indptr))
+    for start in range(0, n, _row_chunk(n)):
+        stop = min(n, start + _row_chunk(n))
+        block = np.full((stop - start, n), np.inf)
+        block_pred = np.full((stop - start, n), -1, dtype=pred.dtype)
+        arcs = slice(csr.indptr[start], csr.indptr[stop])
+        rows, cols, weights = sources[arcs] - start, csr.indices[arcs], csr.weights[arcs]
+        # Parallel arcs: keep the lightest
+        np.minimum.at(block, (rows, cols), weights)
+        block_pred[rows, cols] = rows + start
+        diagonal = np.arange(stop - start)
+        block[diagonal, diagonal + start] = np.minimum(block[diagonal, diagonal + start], 0)
+        block_pred[diagonal, diagonal + start] = -1
+        dist[start:stop] = block
+        pred[start:stop] = block_pred
+
+
+def floyd_warshall_blocked(csr, dist, pred, block_size=256):
+    """Floyd-Warshall into (memory-mapped) ``dist`` / ``pred`` matrices.
+
+    Intermediate vertices are processed ``block_size`` at a time: the rows
+    of the block are first closed over the block, then every chunk of rows
+    is read once, relaxed through all the block's vertices with vectorized
+    rank-one updates, and written back. The matrix is thus streamed
+    V / block_size times instead of V times. Returns False if a negative
+    cycle was found.
+    """
+    n = csr.vertices
+    _initialize(csr, dist, pred)
+    chunk = _row_chunk(n)
+
+    for k0 in range(0, n, block_size):
+        k1 = min(n, k0 + block_size)
+        panel = np.array(dist[k0:k1])
+        panel_pred = np.array(pred[k0:k1])
+        for k in range(k0, k1):
+            # Rows of the block through vertex k (row k itself does not change)
+            through = panel[:, k, None] + panel[k - k0]
+            better = through < panel
+            panel[better] = through[better]
+            panel_pred[better] = np.broadcast_to(panel_pred[k - k0], panel.shape)[better]
+        dist[k0:k1] = panel
+        pred[k0:k1] = panel_pred
+
+        for start in range(0, n, chunk):
+            stop = min(n, start + chunk)
+            if start >= k0 and stop <= k1:
+                continue
+            block = np.array(dist[start:stop])
+            block_pred = np.array(pred[start:stop])
+            for k in range(k0, k1):
+                through = block[:, k, None] + panel[k - k0]
+                better = through < block
+                if better.any():
+                    block[better] = through[better]
+                    block_pred[better] = np.broadcast_to(panel_pred[k - k0], block.shape)[better]
+            dist[start:stop] = block
+            pred[start:stop] = block_pred
+
+    for start in range(0, n, chunk):
+        stop = min(n, start + chunk)
+        rows = np.arange(start, stop)
+        if (dist[rows, rows] < 0).any():
+            return False
+    return True
+
+
+_worker_csr = None
+
+
+def _init_worker(indptr, indices, weights, directed):
+    global _worker_csr
+    _worker_csr = CSRGraph(indptr, indices, weights, directed)
+
+
+def _dijkstra_rows(directory, start, stop):
+    """Worker: solve sources start..stop-1 and write their rows to the stored matrices"""
+    dist = np.load(os.path.join(directory, 'distances.npy'), mmap_mode='r+')
+    pred = np.load(os.path.join(directory, 'predecessors.npy'), mmap_mode='r+')
+    for source in range(start, stop):
+        dist[source], pred[source], _ = dijkstra_arrays(_worker_csr, source)
+    dist.flush()
+    pred.flush()
+    return stop - start
+
+
+def dijkstra_all_pairs(csr, directory, workers=None, chunk_size=64):
+    """Per-source Dijkstra rows written by a pool of processes"""
+    n = csr.vertices
+    ranges = [(start, min(n, start + chunk_size)) for start in range(0, n, chunk_size)]
+    workers = workers or os.cpu_count() or 1
+    # Daemonic processes (e.g. the GUI's background workers) cannot start children
+    if workers == 1 or len(ranges) == 1 or multiprocessing.current_process().daemon:
+        _init_worker(csr.indptr, csr.indices, csr.weights, csr.directed)
+        for start, stop in ranges:
+            _dijkstra_rows(directory, start, stop)
+        return
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker,
+                             initargs=(csr.indptr, csr.indices, csr.weights, csr.directed)) as pool:
+        list(pool.map(_dijkstra_rows, [directory] * len(ranges), *zip(*ranges)))
+
+
+class AllPairsStore:
+    """Memory-mapped distance / predecessor matrices of one graph.
+
+    A ``temporary`` store deletes its directory once it is closed or
+    garbage collected.
+    """
+
+    def __init__(self, directory, temporary=False):
+        self.directory = directory
+        with open(os.path.join(directory, 'meta.json')) as f:
+            self.meta = json.load(f)
+        self.distances = np.load(os.path.join(directory, 'distances.npy'), mmap_mode='r')
+        self.predecessors = np.load(os.path.join(directory, 'predecessors.npy'), mmap_mode='r')
+        self._cleanup = (weakref.finalize(self, shutil.rmtree, directory, ignore_errors=True)
+                         if temporary else None)
+
+    def close(self):
+        """Release the matrices (and remove a temporary store)"""
+        self.distances = self.predecessors = None
+        if self._cleanup is not None:
+            self._cleanup()
+
+    @property
+    def vertices(self):
+        return self.meta['vertices']
+
+    @property
+    def has_negative_cycle(self):
+        return self.meta['has_negative_cycle']
+
+    def distance(self, source, target):
+        return float(self.distances[source, target])
+
+    def path(self, source, target):
+        """Vertex sequence from source to target (empty if unreachable)"""
+        if not np.isfinite(self.distances[source, target]):
+            return []
+        return trace_path(self.predecessors[source], source, target)
+
+    def result(self, source):
+        """ShortestPathResult for one source, as the single-source solvers return"""
+        return ShortestPathResult(source, np.array(self.distances[source]),
+                                  np.array(self.predecessors[source], dtype=np.int64),
+                                  self.has_negative_cycle)
+
+
+def compute_all_pairs(graph, directory=None, method="auto", workers=None, block_size=256,
+                      cache=False, cache_limit=CACHE_LIMIT):
+    """Compute and store all-pairs shortest paths of a networkx graph, a
+    bellman_ford.Graph or a CSRGraph.
+
+    Results are kept in ``directory`` and reused when the same graph is
+    asked for again. Without a directory they go to a temporary one, or
+    with ``cache`` to a per-graph folder under CACHE_DIR, which is then
+    trimmed to ``cache_limit`` bytes.
+    """
+    if isinstance(graph, CSRGraph):
+        csr = graph
+    elif hasattr(graph, 'edge_arrays'):
+        csr = CSRGraph.from_edges(graph.V, *graph.edge_arrays())
+    else:
+        csr = CSRGraph.from_networkx(graph)
+    key = graph_key(csr)
+    temporary = directory is None and not cache
+    if temporary:
+        directory = tempfile.mkdtemp(prefix='all_pairs_')
+    elif directory is None:
+        directory = os.path.join(CACHE_DIR, key)
+    meta_path = os.path.join(directory, 'meta.json')
+    if os.path.exists(meta_path):
+        store = AllPairsStore(directory)
+        if store.meta.get('key') == key:
+            if cache:
+                # The meta.json time orders the cache entries by last use
+                os.utime(meta_path)
+            return store
+
+    try:
+        store = _compute(csr, key, directory, method, workers, block_size, temporary)
+    except BaseException:
+        if temporary:
+            shutil.rmtree(directory, ignore_errors=True)
+        raise
+    if cache:
+        evict_cache(os.path.dirname(directory), cache_limit, keep=directory)
+    return store
+
+
+def _compute(csr, key, directory, method, workers, block_size, temporary):
+    meta_path = os.path.join(directory, 'meta.json')
+    n = csr.vertices
+    negative = csr.num_arcs > 0 and csr.weights.min() < 0
+    if method == "auto":
+        dense = csr.num_arcs > DENSE_THRESHOLD * n * n
+        method = "floyd_warshall" if dense or negative else "dijkstra"
+    if method == "dijkstra" and negative:
+        raise ValueError("Dijkstra's algorithm requires non-negative weights")
+    if method not in ("floyd_warshall", "dijkstra"):
+        raise ValueError(f"Unknown all-pairs method: {method}")
+
+    os.makedirs(directory, exist_ok=True)
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+    pred_dtype = np.int32 if n < 2 ** 31 else np.int64
+    dist = np.lib.format.open_memmap(os.path.join(directory, 'distances.npy'), mode='w+',
+                                     dtype=np.float64, shape=(n, n))
+    pred = np.lib.format.open_memmap(os.path.join(directory, 'predecessors.npy'), mode='w+',
+                                     dtype=pred_dtype, shape=(n, n))
+    if method == "floyd_warshall":
+        has_negative_cycle = not floyd_warshall_blocked(csr, dist, pred, block_size)
+        dist.flush()
+        pred.flush()
+    else:
+        del dist, pred
+        dijkstra_all_pairs(csr, directory, workers)
+        has_negative_cycle = False
+
+    # Written last: a store without meta.json is incomplete
+    with open(meta_path, 'w') as f:
+        json.dump({'key': key, 'vertices': n, 'method': method,
+                   'has_negative_cycle': has_negative_cycle}, f)
+    return AllPairsStore(directory, temporary)
+
+
+def generate_all_pairs_graph(vertices, density=0.3, seed=None):
+    """Random directed graph with positive integer weights, every vertex
+    reachable from vertex 0"""
+    return generate_random_graph(vertices, density, directed=True, weights=(1, 10),
+                                 seed=seed).to_networkx()
+
+
+def solve_all_pairs(graph, method="auto"):
+    """All-pairs shortest paths loaded into memory as an AllPairsResult.
+    Graphs too large for V x V arrays in RAM should keep the store of
+    compute_all_pairs instead."""
+    store = compute_all_pairs(graph, method=method)
+    try:
+        return AllPairsResult(np.array(store.distances), np.array(store.predecessors, dtype=np.int64),
+                              store.has_negative_cycle, store.meta['method'])
+    finally:
+        store.close()
+
+
+def display_all_pairs(frame, graph, result: AllPairsResult):
+    from tkinter import messagebox
+    from display_utils import display_graph_result, subplots
+    from matrix_renderer import draw_matrix
+
+    if result.has_negative_cycle:
+        messagebox.showwarning("Warning", "Graph contains a negative cycle!")
+        return
+
+    # Distance matrix; cells are annotated only when few enough are in view
+    fig, ax = subplots(frame, figsize=(8, 6))
+    renderer = draw_matrix(ax, result.distances, title='All-Pairs Shortest Path Distances', fmt='{:g}')
+    fig.colorbar(renderer.image)
+
+    n = len(result.distances)
+    reachable = np.isfinite(result.distances).sum() - n
+    result_text = f"All-Pairs Shortest Paths ({result.method.replace('_', '-')})\n\n"
+    result_text += f"Vertices: {n}, reachable ordered pairs: {reachable}\n"
+    if reachable:
+        finite = np.where(np.isfinite(result.distances), result.distances, -np.inf)
+        source, target = np.unravel_index(np.argmax(finite), finite.shape)
+        path = ' -> '.join(map(str, result.path(source, target)))
+        result_text += (f"Longest shortest path: {source} to {target}, "
+                        f"Distance = {finite[source, target]:g}, Path = {path}\n")
+
+    display_graph_result(frame, fig, result_text)
@@ -0,0 +1,195 @@
+import multiprocessing
+import os
+import time
+import traceback
+from collections import deque
+
+from algorithms import run_algorithm
+
+# Background execution of the solvers for the GUI. Runs are queued and
+# handed to a small pool of worker processes; results come back through
+# pipes that the Tk main loop polls with after(), so the interface never
+# blocks on a solve and a running job can be cancelled by stopping its
+# worker.
+
+
+def _worker_loop(conn):
+    """Worker process: solve (job_id, algorithm, params) requests until told to stop"""
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        if message is None:
+            break
+        job_id, name, params = message
+        try:
+            conn.send((job_id, "done", run_algorithm(name, params)))
+        except Exception as e:
+            conn.send((job_id, "error", f"{e}\n\n{traceback.format_exc()}"))
+
+
+class Job:
+    """One queued or running solve"""
+
+    def __init__(self, runner, job_id, name, params, on_done, on_error, on_cancel):
+        self.runner = runner
+        self.id = job_id
+        self.name = name
+        self.params = params
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_cancel = on_cancel
+        self.state = "queued"
+        self.started = None
+
+    @property
+    def elapsed(self):
+        return 0.0 if self.started is None else time.perf_counter() - self.started
+
+    @property
+    def queue_position(self):
+        """Number of runs waiting ahead of this one (None once started)"""
+        return self.runner.queue_position(self)
+
+    def cancel(self):
+        self.runner.cancel(self)
+
+
+class _Worker:
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_loop, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.job = None
+
+    def stop(self, force=False):
+        if force:
+            self.process.terminate()
+        else:
+            try:
+                self.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        self.conn.close()
+
+
+class BackgroundRunner:
+    """Queue of solver runs executed by up to ``max_workers`` worker processes.
+
+    Callbacks (``on_done(instance, result)``, ``on_error(message)``,
+    ``on_cancel()``) and the optional ``on_poll()`` hook are always called
+    from the Tk main loop.
+    """
+
+    def __init__(self, root, max_workers=None, poll_interval=100):
+        self.root = root
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        self.poll_interval = poll_interval
+        # Forking a process that holds Tk state is unsafe, always start clean
+        self.context = multiprocessing.get_context("spawn")
+        self.pending = deque()
+        self.workers = []
+        self.listeners = []
+        self._next_id = 0
+        self._polling = False
+
+    def submit(self, name, params, on_done=None, on_error=None, on_cancel=None):
+        self._next_id += 1
+        job = Job(self, self._next_id, name, params, on_done, on_error, on_cancel)
+        self.pending.append(job)
+        self._dispatch()
+        self._schedule_poll()
+        return job
+
+    def add_listener(self, callback):
+        """Call ``callback()`` on every poll while runs are queued or running"""
+        self.listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+
+    def queue_position(self, job):
+        try:
+            return self.pending.index(job)
+        except ValueError:
+            return None
+
+    def cancel(self, job):
+        if job.state == "queued":
+            self.pending.remove(job)
+        elif job.state == "running":
+            # The only way to interrupt a solve is to stop its process
+            worker = next(w for w in self.workers if w.job is job)
+            worker.stop(force=True)
+            self.workers.remove(worker)
+        else:
+            return
+        job.state = "cancelled"
+        if job.on_cancel:
+            job.on_cancel()
+        self._dispatch()
+
+    def shutdown(self):
+        for job in list(self.pending):
+            job.state = "cancelled"
+        self.pending.clear()
+        for worker in self.workers:
+            worker.stop(force=worker.job is not None)
+        self.workers.clear()
+
+    def _dispatch(self):
+        while self.pending:
+            worker = next((w for w in self.workers if w.job is None), None)
+            if worker is None:
+                if len(self.workers) >= self.max_workers:
+                    return
+                worker = _Worker(self.context)
+                self.workers.append(worker)
+            job = self.pending.popleft()
+            worker.conn.send((job.id, job.name, job.params))
+            worker.job = job
+            job.state = "running"
+            job.started = time.perf_counter()
+
+    def _schedule_poll(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_interval, self._poll)
+
+    def _poll(self):
+        self._polling = False
+        for worker in list(self.workers):
+            job = worker.job
+            if job is None:
+                continue
+            try:
+                if not worker.conn.poll():
+                    if worker.process.is_alive():
+                        continue
+                    raise EOFError
+                _, status, payload = worker.conn.recv()
+            except (EOFError, OSError):
+                # The worker died (out of memory, killed...): replace it
+                self.workers.remove(worker)
+                status, payload = "error", "The solver process stopped unexpectedly"
+            worker.job = None
+            self._finish(job, status, payload)
+
+        self._dispatch()
+        for callback in list(self.listeners):
+            callback()
+        if self.pending or any(w.job is not None for w in self.workers):
+            self._schedule_poll()
+
+    def _finish(self, job, status, payload):
+        if status == "done":
+            job.state = "done"
+            if job.on_done:
+                job.on_done(*payload)
+        else:
+            job.state = "failed"
+            if job.on_error:
+                job.on_error(payload)
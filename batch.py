@@ -0,0 +1,440 @@
+import math
+import multiprocessing
+import os
+import time
+import traceback
+from collections import deque
+from itertools import islice
+from dataclasses import dataclass, field, fields, replace
+from multiprocessing import shared_memory
+from multiprocessing.connection import wait
+from typing import Any, Optional
+import numpy as np
+
+from algorithms import generate_instance, solve_instance
+from graph_generator import EdgeList
+
+# Batch execution of many solver runs on a pool of worker processes, for
+# scenario sweeps without the GUI. Tasks are sent to the workers in chunks
+# and results come back in task order. Large arrays of the instances (cost
+# matrices, edge arrays) are copied once into shared memory blocks, and the
+# workers map those blocks instead of receiving pickled copies; an array
+# used by several tasks is shared only once. A task that runs past the
+# timeout has its worker stopped and replaced, and the rest of its chunk is
+# queued again.
+
+SHARE_MIN_BYTES = 64 * 1024   # smaller arrays are cheaper to pickle
+
+
+@dataclass
+class BatchTask:
+    """One run: an algorithm name, its parameters and optionally the instance.
+
+    Without an instance the worker generates one from ``params`` (as
+    ``algorithms.generate_instance`` does). The instance is either the
+    tuple of solver arguments or, for graph algorithms, an EdgeList solved
+    directly from its arrays.
+    """
+    name: str
+    params: dict = field(default_factory=dict)
+    instance: Any = None
+
+
+@dataclass
+class BatchResult:
+    index: int
+    name: str
+    params: dict
+    status: str                    # "done", "error" or "timeout"
+    result: Any = None
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+    @property
+    def ok(self):
+        return self.status == "done"
+
+
+@dataclass(frozen=True)
+class SharedArray:
+    """Reference to an array stored in a shared memory block"""
+    block: str
+    shape: tuple
+    dtype: str
+
+
+def solve_edges(name, edges, params):
+    """Solve a graph algorithm straight from an EdgeList's arrays"""
+    from csr_graph import CSRGraph
+
+    weights = edges.weights if edges.weights is not None else np.ones(len(edges))
+    if name == "Welsh-Powell":
+        from welsh_powell import solve_welsh_powell
+        csr = CSRGraph.from_edges(edges.vertices, edges.sources, edges.targets, weights, directed=False)
+        return solve_welsh_powell(csr, params.get('method', 'welsh_powell'), params.get('seed'))
+    if name == "Dijkstra":
+        from dijkstra import solve_dijkstra
+        csr = CSRGraph.from_edges(edges.vertices, edges.sources, edges.targets, weights, edges.directed)
+        return solve_dijkstra(csr, params.get('source', 0))
+    if name == "Kruskal":
+        from kruskal import minimum_spanning_forest
+        return minimum_spanning_forest(edges.vertices, edges.sources, edges.targets, weights,
+                                       params.get('method', 'auto'))
+    if name == "Bellman-Ford":
+        from bellman_ford import Graph, solve_bellman_ford
+        g = Graph(edges.vertices)
+        g.add_edges_from_arrays(edges.sources, edges.targets, weights)
+        return solve_bellman_ford(g, params.get('source', 0))
+    if name == "All-Pairs":
+        from all_pairs import solve_all_pairs
+        csr = CSRGraph.from_edges(edges.vertices, edges.sources, edges.targets, weights, edges.directed)
+        return solve_all_pairs(csr, params.get('method', 'auto'))
+    if name == "Ford-Fulkerson":
+        from ford_fulkerson import ResidualGraph, max_flow
+        capacities = edges.capacities if edges.capacities is not None else weights
+        sources, targets = edges.sources, edges.targets
+        if not edges.directed:
+            sources, targets = np.concatenate([sources, targets]), np.concatenate([targets, sources])
+            capacities = np.concatenate([capacities, capacities])
+        g = ResidualGraph(edges.vertices, sources, targets, capacities)
+        return max_flow(g, params.get('source', 0), params.get('sink', edges.vertices - 1),
+                        params.get('method', 'dinic'))
+    raise ValueError(f"{name} does not take an edge list")
+
+
+def run_task(name, params, instance=None):
+    """Solve one task in the current process"""
+    if instance is None:
+        instance = generate_instance(name, params)
+    elif isinstance(instance, EdgeList):
+        return solve_edges(name, instance, params)
+    return solve_instance(name, instance, params)
+
+
+class _SharedBlocks:
+    """Shared memory blocks of the running tasks, owned by the parent process.
+
+    A block lives while a task using it is in flight and is unlinked
+    after the last one finishes, so a long stream of tasks holds only the
+    blocks of its current window.
+    """
+
+    def __init__(self, min_bytes=SHARE_MIN_BYTES):
+        self.min_bytes = min_bytes
+        self.shared = {}      # id(array) -> SharedArray; keyed by identity to share each array once
+        self.blocks = {}      # block name -> [array (kept alive), block, tasks using it]
+
+    def _share(self, value):
+        # Memory maps already pickle as a reference to their file
+        if isinstance(value, np.ndarray) and not isinstance(value, np.memmap):
+            if value.nbytes < self.min_bytes or value.dtype.hasobject:
+                return value
+            if id(value) not in self.shared:
+                block = shared_memory.SharedMemory(create=True, size=value.nbytes)
+                np.ndarray(value.shape, value.dtype, buffer=block.buf)[...] = value
+                self.shared[id(value)] = SharedArray(block.name, value.shape, value.dtype.str)
+                self.blocks[block.name] = [value, block, 0]
+            return self.shared[id(value)]
+        if isinstance(value, EdgeList):
+            return replace(value, **{f.name: self._share(getattr(value, f.name)) for f in fields(value)})
+        if type(value) in (tuple, list):
+            return type(value)(self._share(item) for item in value)
+        return value
+
+    def share(self, instance):
+        """Copy of a task's instance with its large arrays replaced by SharedArray references"""
+        shared = self._share(instance)
+        for name in _block_names(shared):
+            self.blocks[name][2] += 1
+        return shared
+
+    def done(self, shared):
+        """A task sent with ``share`` has finished"""
+        for name in _block_names(shared):
+            entry = self.blocks[name]
+            entry[2] -= 1
+            if not entry[2]:
+                self._unlink(name)
+
+    def _unlink(self, name):
+        array, block, _ = self.blocks.pop(name)
+        del self.shared[id(array)]
+        block.close()
+        block.unlink()
+
+    def release(self):
+        for name in list(self.blocks):
+            self._unlink(name)
+
+
+class _Attachments:
+    """Shared memory blocks mapped by a worker process"""
+
+    def __init__(self):
+        self.blocks = {}
+
+    def restore(self, value):
+        """Inverse of _SharedBlocks.share, with read-only views of the blocks"""
+        if isinstance(value, SharedArray):
+            block = self.blocks.get(value.block)
+            if block is None:
+                # Workers share the parent's resource tracker, which already
+                # knows the block: the parent alone unlinks it
+                block = shared_memory.SharedMemory(name=value.block)
+                self.blocks[value.block] = block
+            array = np.ndarray(value.shape, np.dtype(value.dtype), buffer=block.buf)
+            array.flags.writeable = False
+            return array
+        if isinstance(value, EdgeList):
+            return replace(value, **{f.name: self.restore(getattr(value, f.name)) for f in fields(value)})
+        if type(value) in (tuple, list):
+            return type(value)(self.restore(item) for item in value)
+        return value
+
+    def close(self, keep=()):
+        """Unmap the blocks not in ``keep``"""
+        for name in [name for name in self.blocks if name not in keep]:
+            try:
+                self.blocks[name].close()
+                del self.blocks[name]
+            except BufferError:
+                # Still viewed by a live array; tried again after the next chunk
+                pass
+
+
+def _block_names(value):
+    if isinstance(value, SharedArray):
+        return {value.block}
+    if isinstance(value, EdgeList):
+        value = [getattr(value, f.name) for f in fields(value)]
+    if type(value) in (tuple, list):
+        return set().union(*map(_block_names, value))
+    return set()
+
+
+def _worker_loop(conn):
+    """Worker process: solve chunks of (index, name, params, instance), one reply per task"""
+    attachments = _Attachments()
+    # Imports are done: task timeouts start counting from here
+    conn.send(None)
+    while True:
+        try:
+            chunk = conn.recv()
+        except EOFError:
+            break
+        if chunk is None:
+            break
+        attachments.close(keep=_block_names([task[3] for task in chunk]))
+        for index, name, params, instance in chunk:
+            start = time.perf_counter()
+            try:
+                result = run_task(name, params, attachments.restore(instance))
+                reply = (index, "done", result, None)
+            except Exception as e:
+                reply = (index, "error", None, f"{e}\n\n{traceback.format_exc()}")
+            conn.send(reply + (time.perf_counter() - start,))
+            # No references to the shared views may outlive the chunk
+            result = reply = None
+    attachments.close()
+
+
+class _Worker:
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_loop, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.chunk = deque()     # task indices sent and not answered yet, in run order
+        self.ready = False       # set once the process has started up
+        self.started = None      # when the first of them started
+
+    def send(self, chunk, messages):
+        self.chunk.extend(chunk)
+        self.started = time.perf_counter()
+        self.conn.send(messages)
+
+    def expired(self, timeout, now):
+        return timeout is not None and self.ready and now - self.started >= timeout
+
+    def stop(self, force=False):
+        if force:
+            self.process.terminate()
+            self.process.join()
+        else:
+            try:
+                self.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        self.conn.close()
+
+
+class BatchExecutor:
+    """Pool of worker processes running BatchTasks.
+
+    ``chunk_size`` tasks are sent to a worker at a time (by default about
+    four chunks per worker); ``timeout`` is the limit in seconds for each
+    task. Use as a context manager, or call shutdown() when done.
+    """
+
+    def __init__(self, max_workers=None, chunk_size=None, timeout=None,
+                 share_min_bytes=SHARE_MIN_BYTES):
+        # 0 runs the tasks in this process, without timeouts
+        self.max_workers = (os.cpu_count() or 1) if max_workers is None else max_workers
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.share_min_bytes = share_min_bytes
+        self.context = multiprocessing.get_context("spawn")
+        self.workers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+    def shutdown(self):
+        for worker in self.workers:
+            worker.stop(force=bool(worker.chunk))
+        for worker in self.workers:
+            worker.process.join()
+        self.workers = []
+
+    def map(self, tasks, ordered=True):
+        """Run the tasks and yield their BatchResults, in task order unless
+        ``ordered`` is False (then as they finish).
+
+        ``tasks`` may be any iterable, including an endless generator: it is
+        read only as workers become free, so memory use does not grow with
+        the number of tasks.
+        """
+        size = self.chunk_size
+        if size is None:
+            # Unknown length: one task at a time keeps the stream flowing
+            size = max(1, math.ceil(len(tasks) / (4 * max(1, self.max_workers)))) if hasattr(tasks, '__len__') else 1
+        tasks = (task if isinstance(task, BatchTask) else BatchTask(*task) for task in tasks)
+        if not self.max_workers or multiprocessing.current_process().daemon:
+            # Daemonic processes (e.g. the GUI's background workers) cannot start children
+            yield from self._map_inline(tasks)
+            return
+
+        blocks = _SharedBlocks(self.share_min_bytes)
+        try:
+            yield from self._dispatch(tasks, size, blocks, ordered)
+        finally:
+            # Stop workers still holding unanswered tasks (the caller stopped early)
+            for worker in [w for w in self.workers if w.chunk]:
+                worker.stop(force=True)
+                self.workers.remove(worker)
+            blocks.release()
+
+    def run(self, tasks):
+        """List of the BatchResults of the tasks, in task order"""
+        return list(self.map(tasks))
+
+    def _map_inline(self, tasks):
+        for i, task in enumerate(tasks):
+            start = time.perf_counter()
+            try:
+                result = BatchResult(i, task.name, task.params, "done",
+                                     run_task(task.name, task.params, task.instance))
+            except Exception as e:
+                result = BatchResult(i, task.name, task.params, "error",
+                                     error=f"{e}\n\n{traceback.format_exc()}")
+            result.seconds = time.perf_counter() - start
+            yield result
+
+    def _dispatch(self, tasks, size, blocks, ordered):
+        sent = {}            # index -> (task, shared instance) of the tasks in flight
+        pending = deque()    # chunks to send again after their worker was stopped
+        results = {}
+        next_index = 0       # next result to yield
+        count = 0            # tasks read so far
+        exhausted = False
+        # Finished results held back while an earlier task still runs
+        backlog = 4 * size * self.max_workers
+
+        while True:
+            idle = [w for w in self.workers if not w.chunk]
+            while idle or len(self.workers) < self.max_workers:
+                if pending:
+                    chunk = pending.popleft()
+                elif exhausted or len(results) >= backlog:
+                    break
+                else:
+                    chunk = []
+                    for task in islice(tasks, size):
+                        sent[count] = (task, blocks.share(task.instance))
+                        chunk.append(count)
+                        count += 1
+                    exhausted = len(chunk) < size
+                    if not chunk:
+                        break
+                worker = idle.pop() if idle else self._start_worker()
+                worker.send(chunk, [(i, sent[i][0].name, sent[i][0].params, sent[i][1]) for i in chunk])
+            if not sent:
+                break
+
+            busy = [w for w in self.workers if w.chunk]
+            running = [w for w in busy if w.ready]
+            wait_for = None
+            if self.timeout is not None and running:
+                now = time.perf_counter()
+                wait_for = max(0.0, min(w.started + self.timeout - now for w in running))
+            ready = wait([w.conn for w in busy], wait_for)
+
+            now = time.perf_counter()
+            for worker in busy:
+                if worker.conn in ready:
+                    try:
+                        reply = worker.conn.recv()
+                    except (EOFError, OSError):
+                        self._lost(worker, pending, results, sent, blocks, "error",
+                                   "Worker process stopped unexpectedly")
+                        continue
+                    if reply is None:
+                        worker.ready = True
+                        worker.started = time.perf_counter()
+                        continue
+                    index, status, result, error, seconds = reply
+                    worker.chunk.popleft()
+                    worker.started = time.perf_counter()
+                    task, shared = sent.pop(index)
+                    blocks.done(shared)
+                    results[index] = BatchResult(index, task.name, task.params, status,
+                                                 result, error, seconds)
+                elif worker.expired(self.timeout, now):
+                    self._lost(worker, pending, results, sent, blocks, "timeout",
+                               f"No result within {self.timeout} s")
+
+            if ordered:
+                while next_index in results:
+                    yield results.pop(next_index)
+                    next_index += 1
+            else:
+                for index in sorted(results):
+                    yield results.pop(index)
+
+    def _start_worker(self):
+        worker = _Worker(self.context)
+        self.workers.append(worker)
+        return worker
+
+    def _lost(self, worker, pending, results, sent, blocks, status, error):
+        """Record the running task of a stopped worker; queue the rest of its chunk"""
+        index = worker.chunk.popleft()
+        task, shared = sent.pop(index)
+        blocks.done(shared)
+        results[index] = BatchResult(index, task.name, task.params, status, error=error,
+                                     seconds=time.perf_counter() - worker.started)
+        if worker.chunk:
+            pending.appendleft(list(worker.chunk))
+        worker.chunk.clear()
+        worker.stop(force=True)
+        self.workers.remove(worker)
+
+
+def run_batch(tasks, max_workers=None, chunk_size=None, timeout=None):
+    """Run BatchTasks (or (name, params[, instance]) tuples) on a process
+    pool; return their BatchResults in task order"""
+    with BatchExecutor(max_workers, chunk_size, timeout) as executor:
+        return executor.run(tasks)
@@ -1,12 +1,8 @@
-import tkinter as tk
-from tkinter import messagebox
 import numpy as np
 import networkx as nx
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from display_utils import display_graph_result
-import random
 from typing import Dict, List, Tuple, Optional
+from results import ShortestPathResult
+from graph_generator import generate_random_graph
 
 class Graph:
     def __init__(self, vertices: int):
@@ -14,80 +10,161 @@ class Graph:
         self.edges: List[Tuple[int, int, float]] = []
         self.graph = nx.DiGraph()
         
-    def generate_random_graph(self, edge_density: float = 0.3):
+    def generate_random_graph(self, edge_density: float = 0.3, seed=None):
         
-        # First ensure the graph is connected by creating a random tree
-        vertices = list(range(self.V))
-        connected = [0]  # Start with vertex 0
-        unconnected = vertices[1:]
-        
-        while unconnected:
-            v1 = random.choice(connected)
-            v2 = random.choice(unconnected)
-            weight = random.randint(1, 100)
-            self.add_edge(v1, v2, weight)
-            unconnected.remove(v2)
-            connected.append(v2)
-        
-        # Add additional random edges based on edge density
-        for i in range(self.V):
-            for j in range(self.V):
-                if i != j and random.random() < edge_density:
-                    if not any(e[0] == i and e[1] == j for e in self.edges):
-                        weight = random.randint(1, 100)
-                        self.add_edge(i, j, weight)
+        # Random edges plus a spanning tree so every vertex is reachable from 0
+        edges = generate_random_graph(self.V, edge_density, directed=True,
+                                      weights=(1, 101), seed=seed)
+        self.add_edges_from_arrays(edges.sources, edges.targets, edges.weights)
     
     def add_edge(self, u: int, v: int, w: float):
         
         self.edges.append((u, v, w))
         self.graph.add_edge(u, v, weight=w)
+        self._arrays = None
+
+    def add_edges_from_arrays(self, us: np.ndarray, vs: np.ndarray, ws: np.ndarray):
+        """Add many edges at once from parallel arrays"""
+        new_edges = list(zip(np.asarray(us).tolist(), np.asarray(vs).tolist(), np.asarray(ws).tolist()))
+        self.edges.extend(new_edges)
+        self.graph.add_weighted_edges_from(new_edges)
+        self._arrays = None
+
+    def edge_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return the edges as (sources, targets, weights) NumPy arrays"""
+        if getattr(self, '_arrays', None) is None:
+            edges = np.array(self.edges, dtype=float).reshape(-1, 3)
+            self._arrays = (edges[:, 0].astype(np.int64),
+                            edges[:, 1].astype(np.int64),
+                            edges[:, 2])
+        return self._arrays
+
+    def _relax_vectorized(self, src: int):
+        """Relax every edge per pass with array operations, stopping once a pass changes nothing"""
+        us, vs, ws = self.edge_arrays()
+        dist = np.full(self.V, np.inf)
+        dist[src] = 0
+        pred = np.full(self.V, -1, dtype=np.int64)
+
+        passes = 0
+        for passes in range(1, self.V + 1):
+            candidate = dist[us] + ws
+            best = dist.copy()
+            np.minimum.at(best, vs, candidate)
+            improved = candidate < dist[vs]
+            improved &= candidate == best[vs]
+            if not improved.any():
+                return dist, pred, False, passes
+            if passes == self.V:
+                # Still improving after V-1 full passes: negative cycle
+                break
+            pred[vs[improved]] = us[improved]
+            dist = best
+        return dist, pred, True, passes
+
+    def _relax_queue(self, src: int):
+        """Queue-based relaxation (SPFA), only revisiting vertices whose distance dropped"""
+        from collections import deque
+
+        us, vs, ws = self.edge_arrays()
+        order = np.argsort(us, kind='stable')
+        indptr = np.searchsorted(us[order], np.arange(self.V + 1)).tolist()
+        targets = vs[order].tolist()
+        weights = ws[order].tolist()
+
+        dist = [float('inf')] * self.V
+        dist[src] = 0
+        pred = [-1] * self.V
+        hops = [0] * self.V  # edges on the current path, reaching V means a negative cycle
+        in_queue = [False] * self.V
+        queue = deque([src])
+        in_queue[src] = True
+        pops = 0
+
+        while queue:
+            u = queue.popleft()
+            in_queue[u] = False
+            pops += 1
+            du = dist[u]
+            for k in range(indptr[u], indptr[u + 1]):
+                v = targets[k]
+                nd = du + weights[k]
+                if nd < dist[v]:
+                    dist[v] = nd
+                    pred[v] = u
+                    hops[v] = hops[u] + 1
+                    if hops[v] >= self.V:
+                        return np.array(dist), np.array(pred, dtype=np.int64), True, pops
+                    if not in_queue[v]:
+                        in_queue[v] = True
+                        queue.append(v)
+
+        return np.array(dist), np.array(pred, dtype=np.int64), False, pops
+
+    def bellman_ford_arrays(self, src: int, method: str = "auto") -> Tuple[np.ndarray, np.ndarray, bool, int]:
+        """Shortest paths as (distances, predecessors, has_negative_cycle, iterations) arrays.
+
+        ``method`` is "vectorized" (full array passes with early exit), "queue"
+        (SPFA, best on sparse graphs) or "auto".
+        """
+        if method == "auto":
+            method = "queue" if len(self.edges) <= 2 * self.V else "vectorized"
+        if method == "vectorized":
+            return self._relax_vectorized(src)
+        if method == "queue":
+            return self._relax_queue(src)
+        raise ValueError(f"Unknown Bellman-Ford method: {method}")
     
-    def bellman_ford(self, src: int) -> Tuple[Optional[Dict[int, float]], Optional[Dict[int, int]], bool, List[Tuple[int, int]]]:
-        
-        distances = {i: float('inf') for i in range(self.V)}
-        distances[src] = 0
-        predecessors = {i: None for i in range(self.V)}
-        
-        # Relax edges |V| - 1 times
-        for _ in range(self.V - 1):
-            for u, v, w in self.edges:
-                if distances[u] != float('inf') and distances[u] + w < distances[v]:
-                    distances[v] = distances[u] + w
-                    predecessors[v] = u
-        
-        # Check for negative cycles
-        for u, v, w in self.edges:
-            if distances[u] != float('inf') and distances[u] + w < distances[v]:
-                return None, None, True, []
+    def bellman_ford(self, src: int, method: str = "auto") -> Tuple[Optional[Dict[int, float]], Optional[Dict[int, int]], bool, List[Tuple[int, int]]]:
         
+        dist, pred, has_negative_cycle, _ = self.bellman_ford_arrays(src, method)
+        if has_negative_cycle:
+            return None, None, True, []
+
+        distances = dict(enumerate(dist.tolist()))
+        predecessors = {v: (p if p >= 0 else None) for v, p in enumerate(pred.tolist())}
+
         # Collect all edges that are part of shortest paths
-        shortest_path_edges = []
-        for v in range(self.V):
-            if predecessors[v] is not None:
-                shortest_path_edges.append((predecessors[v], v))
+        shortest_path_edges = [(p, v) for v, p in enumerate(pred.tolist()) if p >= 0]
         
         return distances, predecessors, False, shortest_path_edges
 
-    def visualize(self, src: int, shortest_path_edges: List[Tuple[int, int]], distances: Dict[int, float]):
-        
-        plt.figure(figsize=(12, 8))
+    def print_path(self, predecessors: Dict[int, Optional[int]], src: int, target: int):
+        """Print the path from src to target using the predecessors of bellman_ford"""
+        path = [target]
+        while path[-1] != src and predecessors.get(path[-1]) is not None:
+            path.append(predecessors[path[-1]])
+        if path[-1] != src:
+            print("unreachable")
+        else:
+            print(" -> ".join(map(str, reversed(path))))
+
+    def visualize(self, src: int, shortest_path_edges: List[Tuple[int, int]], distances: Dict[int, float], ax=None):
+        """Draw the graph on ``ax``, or in a new pyplot window when no axes are given"""
+        from layout import get_layout
+
+        standalone = ax is None
+        if standalone:
+            import matplotlib.pyplot as plt
+            ax = plt.figure(figsize=(12, 8)).gca()
         
-        # Create layout for the graph
-        pos = nx.spring_layout(self.graph, k=1, iterations=50)
+        # Create layout for the graph (cached across runs)
+        pos = get_layout(self.graph)
         
         # Draw the base graph
         nx.draw_networkx_nodes(self.graph, pos, node_color='lightblue', 
-                             node_size=500)
+                             node_size=500, ax=ax)
         
         # Highlight source node
         nx.draw_networkx_nodes(self.graph, pos, nodelist=[src],
-                             node_color='lightgreen', node_size=500)
+                             node_color='lightgreen', node_size=500, ax=ax)
         
         # Draw edges
+        path_edges = set(shortest_path_edges)
         edge_colors = []
         edge_widths = []
         for u, v in self.graph.edges():
-            if (u, v) in shortest_path_edges:
+            if (u, v) in path_edges:
                 edge_colors.append('red')
                 edge_widths.append(2.0)
             else:
@@ -95,51 +172,67 @@ class Graph:
                 edge_widths.append(1.0)
         
         nx.draw_networkx_edges(self.graph, pos, edge_color=edge_colors, 
-                             width=edge_widths, arrows=True)
+                             width=edge_widths, arrows=True, ax=ax)
         
         # Add edge labels
         edge_labels = nx.get_edge_attributes(self.graph, 'weight')
-        nx.draw_networkx_edge_labels(self.graph, pos, edge_labels)
+        nx.draw_networkx_edge_labels(self.graph, pos, edge_labels, ax=ax)
         
         # Add node labels with distances
         node_labels = {node: f'v{node}\nd={distances[node]:.1f}' 
                       for node in self.graph.nodes()}
-        nx.draw_networkx_labels(self.graph, pos, node_labels)
+        nx.draw_networkx_labels(self.graph, pos, node_labels, ax=ax)
         
-        plt.title("Shortest Paths from Source (Red edges show shortest paths)")
-        plt.axis('off')
-        plt.show()
+        ax.set_title("Shortest Paths from Source (Red edges show shortest paths)")
+        ax.axis('off')
+        if standalone:
+            plt.show()
+
+def generate_bellman_ford_graph(vertices, edge_density=0.3, seed=None):
+    """Generate a random connected directed graph with positive integer weights"""
+    g = Graph(vertices)
+    g.generate_random_graph(edge_density=edge_density, seed=seed)
+    return g
+
+def solve_bellman_ford(g: Graph, source: int = 0, method: str = "auto") -> ShortestPathResult:
+    """Single-source shortest paths, allowing negative weights"""
+    dist, pred, has_negative_cycle, iterations = g.bellman_ford_arrays(source, method)
+    if has_negative_cycle:
+        dist = np.full(g.V, np.inf)
+        pred = np.full(g.V, -1, dtype=np.int64)
+
+    return ShortestPathResult(source, dist, pred, has_negative_cycle, iterations)
+
+def display_bellman_ford(frame, g: Graph, result: ShortestPathResult):
+    from tkinter import messagebox
+    from display_utils import display_graph_result, subplots
+
+    source = result.source
+    if result.has_negative_cycle:
+        messagebox.showwarning("Warning", "Graph contains a negative cycle!")
+        return
+
+    # Visualize the graph with shortest paths in the result window
+    fig, ax = subplots(frame, figsize=(12, 8))
+    distances = {v: result.distances[v] for v in range(g.V)}
+    g.visualize(source, result.tree_edges(), distances, ax=ax)
+
+    # Prepare result text for display
+    result_text = f"Bellman-Ford Shortest Paths from vertex {source}\n\n"
+    for target in range(g.V):
+        if target != source:
+            path = ' -> '.join(map(str, result.path_to(target)))
+            result_text += f"To vertex {target}: Distance = {result.distances[target]:g}, Path = {path}\n"
+
+    # Display the result in the GUI
+    display_graph_result(frame, fig, result_text)
 
 def run_bellman_ford(frame, vertices, source=0):
+    from tkinter import messagebox
     try:
-        # Create a graph and generate a random graph
-        g = Graph(vertices)
-        g.generate_random_graph(edge_density=0.3)
-        
-        # Run Bellman-Ford from the specified source
-        distances, predecessors, has_negative_cycle, shortest_path_edges = g.bellman_ford(source)
-        
-        if has_negative_cycle:
-            messagebox.showwarning("Warning", "Graph contains a negative cycle!")
-            return
-        
-        # Visualize the graph with shortest paths
-        g.visualize(source, shortest_path_edges, distances)
-        
-        # Prepare result text for display
-        result_text = f"Bellman-Ford Shortest Paths from vertex {source}\n\n"
-        for target in range(g.V):
-            if target != source:
-                path = []
-                current = target
-                while current is not None:
-                    path.append(current)
-                    current = predecessors[current]
-                path.reverse()
-                result_text += f"To vertex {target}: Distance = {distances[target]}, Path = {' -> '.join(map(str, path))}\n"
-        
-        # Display the result in the GUI
-        display_graph_result(frame, None, result_text)  # No figure to display, just text
+        g = generate_bellman_ford_graph(vertices)
+        result = solve_bellman_ford(g, source)
+        display_bellman_ford(frame, g, result)
         
     except Exception as e:
         messagebox.showerror("Error", f"An error occurred: {str(e)}")
@@ -0,0 +1,299 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import numpy as np
+import networkx as nx
+
+from algorithms import ALGORITHMS, get_algorithm, generate_instance, solve_instance
+
+# Benchmark and cross-check suite. Every algorithm of the registry is run on
+# seeded instances at geometric size steps; generation, solving and
+# rendering are timed separately and each result is checked against a
+# networkx / scipy reference. Results are written as JSON and can be
+# compared against a stored baseline to flag regressions.
+#
+#   python benchmark.py --output results.json
+#   python benchmark.py --baseline results.json
+
+DEFAULT_SIZES = (8, 32, 128, 512)
+RENDER_LIMIT = 32      # larger instances are not rendered by default (graph drawing dominates)
+
+
+class CheckError(Exception):
+    """A result disagrees with the reference answer"""
+
+
+def _close(a, b, tolerance=1e-6):
+    return abs(a - b) <= tolerance * max(1.0, abs(a), abs(b))
+
+
+def check_shortest_paths(graph, result, method):
+    if method == "dijkstra":
+        expected = nx.single_source_dijkstra_path_length(graph, result.source)
+    else:
+        expected = nx.single_source_bellman_ford_path_length(graph, result.source)
+    for node in graph.nodes():
+        got = result.distances[node]
+        if node not in expected:
+            if np.isfinite(got):
+                raise CheckError(f"vertex {node} should be unreachable, got {got}")
+        elif not _close(got, expected[node]):
+            raise CheckError(f"distance to {node}: {got} != {expected[node]}")
+    for target in expected:
+        path = result.path_to(target)
+        length = sum(graph[u][v]['weight'] for u, v in zip(path, path[1:]))
+        if path[0] != result.source or not _close(length, expected[target]):
+            raise CheckError(f"path to {target} has length {length}, expected {expected[target]}")
+
+
+def check_all_pairs(graph, result):
+    expected = dict(nx.all_pairs_dijkstra_path_length(graph))
+    for source in graph.nodes():
+        for target in graph.nodes():
+            got = result.distances[source, target]
+            want = expected[source].get(target)
+            if want is None:
+                if np.isfinite(got):
+                    raise CheckError(f"{target} should be unreachable from {source}, got {got}")
+                continue
+            if not _close(got, want):
+                raise CheckError(f"distance {source} -> {target}: {got} != {want}")
+            path = result.path(source, target)
+            length = sum(graph[u][v]['weight'] for u, v in zip(path, path[1:]))
+            if path[0] != source or path[-1] != target or not _close(length, want):
+                raise CheckError(f"path {source} -> {target} has length {length}, expected {want}")
+
+
+def check_mst(graph, result):
+    expected = nx.minimum_spanning_tree(graph).size(weight='weight')
+    if not _close(result.total_weight, expected):
+        raise CheckError(f"total weight {result.total_weight} != {expected}")
+    forest = nx.Graph()
+    forest.add_nodes_from(graph.nodes())
+    forest.add_edges_from((u, v) for u, v, _ in result.edges)
+    if not nx.is_forest(forest) or (nx.number_connected_components(forest)
+                                    != nx.number_connected_components(graph)):
+        raise CheckError("edges do not form a spanning forest")
+
+
+def check_coloring(graph, result):
+    for u, v in graph.edges():
+        if result.colors[u] == result.colors[v]:
+            raise CheckError(f"edge ({u}, {v}) joins two vertices of color {result.colors[u]}")
+    max_degree = max((d for _, d in graph.degree()), default=0)
+    if result.num_colors > max_degree + 1:
+        raise CheckError(f"{result.num_colors} colors for maximum degree {max_degree}")
+
+
+def check_flow(graph, result):
+    expected = nx.maximum_flow_value(graph, result.source, result.sink, capacity='capacity')
+    if not _close(result.flow_value, expected):
+        raise CheckError(f"flow value {result.flow_value} != {expected}")
+    balance = dict.fromkeys(graph.nodes(), 0)
+    for u, flows in result.flow_dict.items():
+        for v, flow in flows.items():
+            if flow < -1e-9 or flow > graph[u][v]['capacity'] + 1e-9:
+                raise CheckError(f"flow {flow} on ({u}, {v}) breaks its capacity")
+            balance[u] -= flow
+            balance[v] += flow
+    for node, net in balance.items():
+        if node not in (result.source, result.sink) and not _close(net, 0):
+            raise CheckError(f"flow is not conserved at {node}")
+
+
+def transportation_optimum(supply, demand, costs):
+    """Optimal cost from scipy's linprog, or None when scipy is not installed"""
+    try:
+        from scipy.optimize import linprog
+        from scipy.sparse import coo_matrix
+    except ImportError:
+        return None
+    m, n = costs.shape
+    cells = np.arange(m * n)
+    rows = np.concatenate((cells // n, m + cells % n))
+    equality = coo_matrix((np.ones(2 * m * n), (rows, np.tile(cells, 2))), shape=(m + n, m * n))
+    solution = linprog(np.ravel(costs), A_eq=equality, b_eq=np.concatenate((supply, demand)),
+                       bounds=(0, None), method='highs')
+    return solution.fun if solution.success else None
+
+
+def check_transportation(supply, demand, costs, result, optimal):
+    allocation = np.asarray(result.allocation, dtype=float)
+    if (allocation < -1e-9).any():
+        raise CheckError("negative allocation")
+    if not np.allclose(allocation.sum(axis=1), supply) or not np.allclose(allocation.sum(axis=0), demand):
+        raise CheckError("allocation does not match supply and demand")
+    cost = float((allocation * costs).sum())
+    if not _close(cost, result.total_cost):
+        raise CheckError(f"reported cost {result.total_cost} != allocation cost {cost}")
+    if optimal:
+        expected = transportation_optimum(supply, demand, costs)
+        if expected is None:
+            return "skipped (scipy not installed)"
+        if not _close(cost, expected):
+            raise CheckError(f"cost {cost} is not optimal ({expected})")
+
+
+CHECKS = {
+    "Welsh-Powell": lambda instance, result: check_coloring(*instance, result),
+    "Dijkstra": lambda instance, result: check_shortest_paths(*instance, result, "dijkstra"),
+    "Kruskal": lambda instance, result: check_mst(*instance, result),
+    "Bellman-Ford": lambda instance, result: check_shortest_paths(instance[0].graph, result,
+                                                                  "bellman_ford"),
+    "All-Pairs": lambda instance, result: check_all_pairs(*instance, result),
+    "Ford-Fulkerson": lambda instance, result: check_flow(*instance, result),
+    "North-West Corner": lambda instance, result: check_transportation(*instance, result, False),
+    "Least Cost": lambda instance, result: check_transportation(*instance, result, False),
+    "Stepping-Stone": lambda instance, result: check_transportation(*instance, result, True),
+    "Potential Method": lambda instance, result: check_transportation(*instance, result, True),
+}
+
+
+def _timed(function, *args):
+    start = time.perf_counter()
+    value = function(*args)
+    return value, time.perf_counter() - start
+
+
+def benchmark_case(name, size, seed=0, repeat=1, render=True):
+    """Best-of-``repeat`` phase timings and the cross-check status of one case"""
+    spec = get_algorithm(name)
+    params = {'vertices': size, 'source': 0, 'seed': seed}
+    record = {"algorithm": name, "size": size, "seed": seed,
+              "generate_s": None, "solve_s": None, "render_s": None, "check": None}
+
+    for _ in range(repeat):
+        instance, generate_s = _timed(generate_instance, name, params)
+        result, solve_s = _timed(solve_instance, name, instance, params)
+        render_s = None
+        if render:
+            import matplotlib
+            matplotlib.use('Agg')
+            display = spec.load(spec.display)
+            _, render_s = _timed(display, None, *instance, result)
+        for phase, seconds in (("generate_s", generate_s), ("solve_s", solve_s),
+                               ("render_s", render_s)):
+            if seconds is not None and (record[phase] is None or seconds < record[phase]):
+                record[phase] = seconds
+
+    try:
+        record["check"] = CHECKS[name](instance, result) or "ok"
+    except CheckError as e:
+        record["check"] = f"failed: {e}"
+    return record
+
+
+def warm_up(name, render=True):
+    """Run a tiny untimed case so lazy imports of the algorithm module,
+    networkx and matplotlib are not charged to the first timed case"""
+    spec = get_algorithm(name)
+    spec.load(spec.solve)
+    try:
+        benchmark_case(name, 4, render=render)
+    except Exception:
+        pass    # a failing algorithm is reported by its timed cases
+
+
+def geometric_sizes(smallest, largest, factor):
+    sizes = []
+    size = smallest
+    while size <= largest:
+        sizes.append(int(size))
+        size *= factor
+    return sizes
+
+
+def run_benchmarks(names=None, sizes=DEFAULT_SIZES, seed=0, repeat=1, render_limit=RENDER_LIMIT,
+                   progress=None):
+    records = []
+    for name in names or list(ALGORITHMS):
+        warm_up(name, render=any(size <= render_limit for size in sizes))
+        for size in sizes:
+            record = benchmark_case(name, size, seed, repeat, render=size <= render_limit)
+            records.append(record)
+            if progress:
+                progress(record)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "networkx": nx.__version__,
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeat": repeat,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": records,
+    }
+
+
+def compare(report, baseline, threshold=1.5, min_seconds=0.005):
+    """Cases whose phase took more than ``threshold`` times its baseline time"""
+    previous = {(r["algorithm"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+    for record in report["results"]:
+        old = previous.get((record["algorithm"], record["size"]))
+        if old is None:
+            continue
+        for phase in ("generate_s", "solve_s", "render_s"):
+            new_s, old_s = record.get(phase), old.get(phase)
+            if new_s is None or old_s is None:
+                continue
+            if new_s > threshold * old_s and new_s - old_s > min_seconds:
+                regressions.append({"algorithm": record["algorithm"], "size": record["size"],
+                                    "phase": phase, "baseline_s": old_s, "current_s": new_s,
+                                    "ratio": new_s / old_s if old_s else float('inf')})
+    return regressions
+
+
+def _format(record):
+    times = "  ".join(f"{phase[:-2]}={record[phase]:.4f}s" for phase in ("generate_s", "solve_s", "render_s")
+                      if record[phase] is not None)
+    return f"{record['algorithm']:<18} n={record['size']:<6} {times}  [{record['check']}]"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark and cross-check every algorithm")
+    parser.add_argument("--algorithms", nargs="+", choices=list(ALGORITHMS), metavar="NAME",
+                        help="algorithms to run (default: all)")
+    parser.add_argument("--sizes", nargs="+", type=int, help="explicit instance sizes")
+    parser.add_argument("--min-size", type=int, default=DEFAULT_SIZES[0])
+    parser.add_argument("--max-size", type=int, default=DEFAULT_SIZES[-1])
+    parser.add_argument("--factor", type=float, default=4, help="ratio between successive sizes")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1, help="keep the best of N runs")
+    parser.add_argument("--render-limit", type=int, default=RENDER_LIMIT,
+                        help="largest size that is also rendered (0 disables rendering)")
+    parser.add_argument("--output", help="write the JSON report to this file ('-' for stdout)")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=1.5,
+                        help="slowdown ratio reported as a regression")
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes or geometric_sizes(args.min_size, args.max_size, args.factor)
+    log = sys.stderr if args.output == "-" else sys.stdout
+    report = run_benchmarks(args.algorithms, sizes, args.seed, args.repeat, args.render_limit,
+                            progress=lambda record: print(_format(record), file=log, flush=True))
+
+    failures = [r for r in report["results"] if r["check"].startswith("failed")]
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["regressions"] = compare(report, json.load(f), args.threshold)
+        for regression in report["regressions"]:
+            print(f"REGRESSION {regression['algorithm']} n={regression['size']} {regression['phase']}: "
+                  f"{regression['baseline_s']:.4f}s -> {regression['current_s']:.4f}s "
+                  f"(x{regression['ratio']:.2f})", file=log)
+
+    if args.output == "-":
+        json.dump(report, sys.stdout, indent=2)
+    elif args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    return 1 if failures or report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+import argparse
+import json
+import sys
+import numpy as np
+
+from algorithms import ALGORITHMS
+from batch import BatchExecutor, BatchTask
+from graph_generator import EdgeList
+from results import (AllPairsResult, ColoringResult, FlowResult, MSTResult, ShortestPathResult,
+                     TransportationResult)
+
+# Command-line entry point without the GUI. Instances are read as
+# newline-delimited JSON (NDJSON) from stdin or files, solved on a pool of
+# worker processes, and one JSON result line is written per instance as
+# soon as it is available. Input is read only as workers become free, so
+# memory use stays flat however long the stream is.
+#
+#   python cli.py < instances.ndjson > results.ndjson
+#   echo '{"algorithm": "dijkstra", "vertices": 200, "seed": 1}' | python cli.py --summary
+#
+# Each input line is an object with an "algorithm" (a registry name such as
+# "Potential Method", or e.g. "potential_method") and optionally an "id".
+# The instance is given by one of:
+#   "vertices" (+ "seed"; "density" for graphs) a random instance
+#   "edges": [[u, v, w], ...] (+ "vertices", "directed")
+#   "graph_file": path                         see graph_io
+#   "supply", "demand", "costs": [[...]]       null costs are forbidden routes
+#   "supply_file", "demand_file", "costs_file" see transportation_io
+# Other keys ("source", "method", ...) are passed to the solver as in the GUI.
+
+INSTANCE_KEYS = ('edges', 'directed', 'costs')
+DIRECTED_ALGORITHMS = ("Bellman-Ford", "All-Pairs", "Ford-Fulkerson")
+
+
+def _normalize(name):
+    return name.lower().replace('_', '-').replace(' ', '-')
+
+
+ALGORITHM_NAMES = {_normalize(name): name for name in ALGORITHMS}
+
+
+def algorithm_name(name):
+    try:
+        return ALGORITHM_NAMES[_normalize(name)]
+    except KeyError:
+        raise ValueError(f"Unknown algorithm: {name}")
+
+
+def _edge_list(name, record):
+    edges = np.asarray(record['edges'], dtype=float)
+    if not edges.size:
+        edges = edges.reshape(0, 2)
+    if edges.ndim != 2 or edges.shape[1] not in (2, 3):
+        raise ValueError("edges must be [u, v] or [u, v, weight] triples")
+    sources, targets = edges[:, 0].astype(np.int64), edges[:, 1].astype(np.int64)
+    weights = edges[:, 2] if edges.shape[1] == 3 else None
+    if weights is not None and np.all(weights == np.round(weights)):
+        weights = weights.astype(np.int64)
+    vertices = int(record.get('vertices', (max(sources.max(), targets.max()) + 1) if len(edges) else 0))
+    if len(edges) and (min(sources.min(), targets.min()) < 0 or max(sources.max(), targets.max()) >= vertices):
+        raise ValueError(f"edge endpoints must be vertices 0..{vertices - 1}")
+    directed = bool(record.get('directed', name in DIRECTED_ALGORITHMS))
+    return EdgeList(vertices, sources, targets, weights, weights, directed)
+
+
+def _costs(values):
+    costs = np.array([[np.inf if c is None else c for c in row] for row in values], dtype=float)
+    if costs.ndim != 2:
+        raise ValueError("costs must be a matrix (list of rows)")
+    return costs
+
+
+def parse_task(record, default_algorithm=None):
+    """BatchTask of one decoded input line"""
+    if not isinstance(record, dict):
+        raise ValueError("each line must be a JSON object")
+    name = record.get('algorithm', default_algorithm)
+    if name is None:
+        raise ValueError("no algorithm given")
+    name = algorithm_name(name)
+    params = {key: value for key, value in record.items()
+              if key != 'algorithm' and key not in INSTANCE_KEYS}
+    kind = ALGORITHMS[name].kind
+    if 'edges' in record:
+        if kind != "graph":
+            raise ValueError(f"{name} does not take edges")
+        return BatchTask(name, params, _edge_list(name, record))
+    if 'costs' in record:
+        if kind != "transportation":
+            raise ValueError(f"{name} does not take a cost matrix")
+        from transportation_io import load_transportation_problem
+        supply = params.pop('supply_file', None) or params.pop('supply', None)
+        demand = params.pop('demand_file', None) or params.pop('demand', None)
+        if supply is None or demand is None:
+            raise ValueError("costs need supply and demand")
+        return BatchTask(name, params, load_transportation_problem(supply, demand, _costs(record['costs'])))
+    if not any(key in params for key in ('vertices', 'graph_file', 'costs_file', 'supply', 'supply_file')):
+        raise ValueError("no instance given (vertices, edges, graph_file, costs or costs_file)")
+    return BatchTask(name, params)
+
+
+def _json_value(value):
+    """Plain JSON value: arrays as lists, non-finite numbers as null"""
+    if isinstance(value, np.ndarray):
+        value = value.tolist()
+    if isinstance(value, (list, tuple)):
+        return [_json_value(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    return value
+
+
+def _allocation_cells(allocation):
+    """[row, column, amount] of the non-zero cells of a dense or sparse allocation"""
+    if hasattr(allocation, 'data') and hasattr(allocation, 'rows'):
+        rows, cols, values = allocation.rows, allocation.cols, np.asarray(allocation.data)
+        keep = values != 0
+        rows, cols, values = rows[keep], cols[keep], values[keep]
+    else:
+        allocation = np.asarray(allocation)
+        rows, cols = np.nonzero(allocation)
+        values = allocation[rows, cols]
+    return [[int(i), int(j), v] for i, j, v in zip(rows.tolist(), cols.tolist(), values.tolist())]
+
+
+def result_fields(result, summary=False):
+    """JSON fields of a solver result; with ``summary`` only the scalars"""
+    if isinstance(result, ShortestPathResult):
+        fields = {'source': result.source, 'has_negative_cycle': result.has_negative_cycle,
+                  'iterations': result.iterations,
+                  'reachable': int(np.isfinite(result.distances).sum())}
+        if not summary:
+            fields.update(distances=result.distances, predecessors=result.predecessors)
+    elif isinstance(result, AllPairsResult):
+        fields = {'method': result.method, 'has_negative_cycle': result.has_negative_cycle,
+                  'reachable_pairs': int(np.isfinite(result.distances).sum())}
+        if not summary:
+            fields.update(distances=result.distances, predecessors=result.predecessors)
+    elif isinstance(result, MSTResult):
+        fields = {'total_weight': result.total_weight, 'num_edges': len(result.edges),
+                  'iterations': result.iterations}
+        if not summary:
+            fields['edges'] = [list(edge) for edge in result.edges]
+    elif isinstance(result, FlowResult):
+        fields = {'source': result.source, 'sink': result.sink, 'flow_value': result.flow_value,
+                  'iterations': result.iterations}
+        if not summary:
+            fields.update(edge_flows=result.edge_flows, cut_edges=[list(e) for e in result.cut_edges()])
+    elif isinstance(result, ColoringResult):
+        fields = {'num_colors': result.num_colors, 'iterations': result.iterations}
+        if not summary:
+            fields['colors'] = result.colors
+    elif isinstance(result, TransportationResult):
+        fields = {'total_cost': result.total_cost, 'iterations': result.iterations}
+        if not summary:
+            fields['allocation'] = _allocation_cells(result.allocation)
+    else:
+        raise TypeError(f"Unsupported result type: {type(result).__name__}")
+    return {key: _json_value(value) for key, value in fields.items()}
+
+
+def output_record(batch_result, summary=False, traceback=False):
+    record = {'id': batch_result.params.get('id'), 'algorithm': batch_result.name,
+              'status': batch_result.status, 'seconds': round(batch_result.seconds, 6)}
+    if batch_result.ok:
+        record['result'] = result_fields(batch_result.result, summary)
+    else:
+        record['error'] = batch_result.error if traceback else batch_result.error.split('\n\n')[0]
+    return record
+
+
+def _input_lines(paths):
+    for path in paths or ['-']:
+        if path == '-':
+            yield from sys.stdin
+        else:
+            with open(path) as f:
+                yield from f
+
+
+def read_tasks(lines, default_algorithm=None, on_error=None):
+    """BatchTasks of NDJSON lines, read lazily. Lines that cannot be parsed
+    are passed to ``on_error(record)`` instead; the id of a line defaults
+    to its line number."""
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        record = None
+        try:
+            record = json.loads(line)
+            if isinstance(record, dict):
+                record.setdefault('id', number)
+            yield parse_task(record, default_algorithm)
+        except (ValueError, TypeError, KeyError, OSError) as e:
+            ident = record.get('id', number) if isinstance(record, dict) else number
+            name = record.get('algorithm', default_algorithm) if isinstance(record, dict) else None
+            if on_error is not None:
+                on_error({'id': ident, 'algorithm': name, 'status': 'invalid', 'error': str(e)})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve NDJSON instances and stream NDJSON results")
+    parser.add_argument("inputs", nargs="*", help="NDJSON files (default: stdin, or '-')")
+    parser.add_argument("--algorithm", help="algorithm of lines that do not name one")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core, 0 runs inline)")
+    parser.add_argument("--chunk-size", type=int, default=1, help="instances sent to a worker at a time")
+    parser.add_argument("--timeout", type=float, help="seconds allowed per instance")
+    parser.add_argument("--ordered", action="store_true",
+                        help="write results in input order instead of as they finish")
+    parser.add_argument("--summary", action="store_true",
+                        help="only scalar result fields (cost, flow value, colors used...)")
+    parser.add_argument("--traceback", action="store_true", help="full tracebacks for failed instances")
+    args = parser.parse_args(argv)
+    if args.algorithm:
+        args.algorithm = algorithm_name(args.algorithm)
+
+    failed = 0
+
+    def write(record):
+        nonlocal failed
+        failed += record['status'] != 'done'
+        sys.stdout.write(json.dumps(record, allow_nan=False) + '\n')
+        sys.stdout.flush()
+
+    tasks = read_tasks(_input_lines(args.inputs), args.algorithm, on_error=write)
+    with BatchExecutor(args.workers, args.chunk_size, args.timeout) as executor:
+        for batch_result in executor.map(tasks, ordered=args.ordered):
+            try:
+                record = output_record(batch_result, args.summary, args.traceback)
+            except Exception as e:
+                record = {'id': batch_result.params.get('id'), 'algorithm': batch_result.name,
+                          'status': 'error', 'error': f"Result could not be written: {e}"}
+            write(record)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+import numpy as np
+
+# Compressed sparse row adjacency shared by the native graph engines. The
+# out-neighbours of vertex u are indices[indptr[u]:indptr[u + 1]], with the
+# matching edge weights in weights. Vertices are the integers 0..V-1, as
+# produced by graph_generator.
+
+
+class CSRGraph:
+    def __init__(self, indptr, indices, weights, directed=True):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.weights = np.asarray(weights, dtype=float)
+        self.directed = directed
+        self._lists = None
+
+    @property
+    def vertices(self):
+        return len(self.indptr) - 1
+
+    @property
+    def num_arcs(self):
+        """Stored arcs (twice the edge count for undirected graphs)"""
+        return len(self.indices)
+
+    @classmethod
+    def from_edges(cls, vertices, sources, targets, weights=None, directed=True):
+        """Build from edge arrays; undirected edges are stored in both directions"""
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        weights = np.ones(len(sources)) if weights is None else np.asarray(weights, dtype=float)
+        if not directed:
+            sources, targets = np.concatenate((sources, targets)), np.concatenate((targets, sources))
+            weights = np.concatenate((weights, weights))
+        order = np.argsort(sources, kind='stable')
+        indptr = np.zeros(vertices + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=vertices), out=indptr[1:])
+        return cls(indptr, targets[order], weights[order], directed)
+
+    @classmethod
+    def from_networkx(cls, graph, weight='weight'):
+        """Build from a networkx graph whose nodes are 0..V-1 (missing weights count as 1)"""
+        edges = np.array([(u, v, w) for u, v, w in graph.edges(data=weight, default=1)],
+                         dtype=float).reshape(-1, 3)
+        return cls.from_edges(graph.number_of_nodes(), edges[:, 0].astype(np.int64),
+                              edges[:, 1].astype(np.int64), edges[:, 2], graph.is_directed())
+
+    def to_undirected(self):
+        """Undirected graph with an edge wherever an arc runs in either
+        direction (opposite and parallel arcs merged, first weight kept)"""
+        if not self.directed:
+            return self
+        n = self.vertices
+        sources = np.repeat(np.arange(n), self.degrees())
+        low, high = np.minimum(sources, self.indices), np.maximum(sources, self.indices)
+        _, first = np.unique(low * n + high, return_index=True)
+        return CSRGraph.from_edges(n, low[first], high[first], self.weights[first], directed=False)
+
+    def lists(self):
+        """(indptr, indices, weights) as Python lists, for the heap-based engines"""
+        if self._lists is None:
+            self._lists = (self.indptr.tolist(), self.indices.tolist(), self.weights.tolist())
+        return self._lists
+
+    def degrees(self):
+        return np.diff(self.indptr)
@@ -1,66 +1,314 @@
-import tkinter as tk
-from tkinter import messagebox
+import heapq
 import numpy as np
 import networkx as nx
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from display_utils import display_graph_result
+from results import ShortestPathResult
+from graph_generator import generate_random_graph
+from csr_graph import CSRGraph
+
+def generate_dijkstra_graph(vertices, density=0.5, seed=None):
+    """Generate a connected random graph with positive integer weights"""
+    return generate_random_graph(vertices, density, weights=(1, 10), seed=seed).to_networkx()
+
+def dijkstra_arrays(csr, sources, targets=None):
+    """Binary-heap Dijkstra over a CSRGraph in a single pass.
+
+    ``sources`` may be one vertex or several (all at distance 0). With
+    ``targets`` the search stops once every target is settled; vertices not
+    settled by then are reported unreachable. Returns (distances,
+    predecessors, settled) where settled counts the vertices finalized.
+    """
+    if csr.num_arcs and csr.weights.min() < 0:
+        raise ValueError("Dijkstra's algorithm requires non-negative weights")
+    indptr, indices, weights = csr.lists()
+    n = csr.vertices
+    sources = [int(s) for s in np.atleast_1d(sources)]
+
+    dist = [float('inf')] * n
+    pred = [-1] * n
+    done = [False] * n
+    for s in sources:
+        dist[s] = 0.0
+    heap = [(0.0, s) for s in sources]
+    heapq.heapify(heap)
+    remaining = None if targets is None else set(int(t) for t in np.atleast_1d(targets))
+    settled = 0
+
+    while heap:
+        d, u = heapq.heappop(heap)
+        if done[u]:
+            continue
+        done[u] = True
+        settled += 1
+        if remaining is not None:
+            remaining.discard(u)
+            if not remaining:
+                break
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            nd = d + weights[k]
+            if nd < dist[v]:
+                dist[v] = nd
+                pred[v] = u
+                heapq.heappush(heap, (nd, v))
+
+    distances = np.array(dist)
+    predecessors = np.array(pred, dtype=np.int64)
+    if remaining is not None:
+        # Stopped early: tentative labels are not shortest distances yet
+        unsettled = ~np.array(done)
+        distances[unsettled] = np.inf
+        predecessors[unsettled] = -1
+    return distances, predecessors, settled
+
+def solve_dijkstra(graph, source=0, targets=None):
+    """Single-source (or multi-source) shortest paths on a non-negatively
+    weighted networkx graph or CSRGraph"""
+    csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_networkx(graph)
+    distances, predecessors, settled = dijkstra_arrays(csr, source, targets)
+    return ShortestPathResult(source, distances, predecessors, iterations=settled)
+
+class ShortestPathSession:
+    """Shortest paths from fixed sources, kept up to date under edge edits
+    (Ramalingam-Reps).
+
+    Lowering a weight or inserting an edge runs a Dijkstra search from the
+    edge's head that only goes as far as distances improve. Raising a
+    weight or deleting an edge of the shortest-path tree invalidates the
+    subtree below it: those vertices are re-seeded from their unaffected
+    in-neighbours and re-settled by a Dijkstra search confined to the
+    subtree. Edits off the tree cost O(1). Every edit returns the vertices
+    whose distance or predecessor changed.
+
+    ``graph`` may be a networkx graph (kept in sync with the edits), a
+    bellman_ford.Graph or a CSRGraph. Weights must be and stay
+    non-negative: a graph with a negative weight (as Bellman-Ford inputs
+    may have) raises ValueError. ``result``, a ShortestPathResult of the
+    same graph and source, is taken as the starting tree instead of solving.
+    """
+
+    def __init__(self, graph, source=0, result=None):
+        if isinstance(graph, CSRGraph):
+            csr = graph
+        elif hasattr(graph, 'edge_arrays'):
+            csr = CSRGraph.from_edges(graph.V, *graph.edge_arrays())
+        else:
+            csr = CSRGraph.from_networkx(graph)
+        if csr.num_arcs and csr.weights.min() < 0:
+            raise ValueError("Shortest-path sessions need non-negative weights; "
+                             "use solve_bellman_ford for graphs with negative weights")
+        self.graph = graph if isinstance(graph, nx.Graph) else None
+        self.source = source
+        self.directed = csr.directed
+        if result is not None:
+            distances, predecessors = result.distances, result.predecessors
+        else:
+            distances, predecessors, _ = dijkstra_arrays(csr, source)
+        self.dist = distances.tolist()
+        self.pred = predecessors.tolist()
+        # Mutable adjacency in both directions; parallel arcs keep the lightest
+        n = csr.vertices
+        self.out = [{} for _ in range(n)]
+        self.into = [{} for _ in range(n)]
+        indptr, indices, weights = csr.lists()
+        for u in range(n):
+            out = self.out[u]
+            for k in range(indptr[u], indptr[u + 1]):
+                v, w = indices[k], weights[k]
+                if w < out.get(v, float('inf')):
+                    out[v] = w
+                    self.into[v][u] = w
+
+    @property
+    def vertices(self):
+        return len(self.dist)
+
+    def set_weight(self, u, v, weight):
+        """Insert edge (u, v) or change its weight; returns the changed vertices"""
+        if weight < 0:
+            raise ValueError("Dijkstra's algorithm requires non-negative weights")
+        return self._edit(u, v, weight)
+
+    def remove_edge(self, u, v):
+        """Delete edge (u, v); returns the changed vertices"""
+        if v not in self.out[u]:
+            raise ValueError(f"No edge {u}->{v}")
+        return self._edit(u, v, None)
+
+    def update(self, changes):
+        """Apply ``{(u, v): weight}`` edits (None deletes); returns the changed vertices"""
+        changed = set()
+        for (u, v), weight in changes.items():
+            if weight is None:
+                changed |= set(self.remove_edge(u, v))
+            else:
+                changed |= set(self.set_weight(u, v, weight))
+        return sorted(changed)
+
+    def result(self):
+        return ShortestPathResult(self.source, np.array(self.dist),
+                                  np.array(self.pred, dtype=np.int64))
+
+    def _edit(self, u, v, weight):
+        for vertex in (u, v):
+            if not 0 <= vertex < self.vertices:
+                raise ValueError(f"Vertex {vertex} is not in the graph")
+        changed = self._set_arc(u, v, weight)
+        if not self.directed:
+            changed |= self._set_arc(v, u, weight)
+        if self.graph is not None:
+            if weight is None:
+                self.graph.remove_edge(u, v)
+            else:
+                self.graph.add_edge(u, v, weight=weight)
+        return sorted(changed)
+
+    def _set_arc(self, u, v, weight):
+        old = self.out[u].get(v)
+        if weight is None:
+            self.out[u].pop(v, None)
+            self.into[v].pop(u, None)
+        else:
+            self.out[u][v] = weight
+            self.into[v][u] = weight
+        if self.pred[v] == u and (weight is None or weight > old):
+            return self._raise(v)
+        if weight is not None and self.dist[u] + weight < self.dist[v]:
+            return self._lower([(self.dist[u] + weight, v, u)])
+        return set()
+
+    def _lower(self, heap):
+        """Settle the vertices whose distance improves, starting from ``heap``"""
+        dist, pred, out = self.dist, self.pred, self.out
+        changed = set()
+        while heap:
+            d, x, p = heapq.heappop(heap)
+            if d >= dist[x]:
+                continue
+            dist[x] = d
+            pred[x] = p
+            changed.add(x)
+            for y, w in out[x].items():
+                if d + w < dist[y]:
+                    heapq.heappush(heap, (d + w, y, x))
+        return changed
+
+    def _raise(self, root):
+        """Recompute the shortest-path subtree hanging below ``root``"""
+        dist, pred, out, into = self.dist, self.pred, self.out, self.into
+        affected = {root}
+        stack = [root]
+        while stack:
+            x = stack.pop()
+            for y in out[x]:
+                if pred[y] == x and y not in affected:
+                    affected.add(y)
+                    stack.append(y)
+        old = {a: (dist[a], pred[a]) for a in affected}
+        for a in affected:
+            dist[a] = float('inf')
+            pred[a] = -1
+
+        # Best way into each affected vertex from outside the subtree
+        heap = []
+        for a in affected:
+            best, parent = float('inf'), -1
+            for p, w in into[a].items():
+                if p not in affected and dist[p] + w < best:
+                    best, parent = dist[p] + w, p
+            if parent >= 0:
+                heap.append((best, a, parent))
+        heapq.heapify(heap)
+        # Vertices outside the subtree cannot improve: their distances
+        # did not depend on it and none of them went up
+        while heap:
+            d, x, p = heapq.heappop(heap)
+            if d >= dist[x]:
+                continue
+            dist[x] = d
+            pred[x] = p
+            for y, w in out[x].items():
+                if y in affected and d + w < dist[y]:
+                    heapq.heappush(heap, (d + w, y, x))
+        return {a for a in affected if (dist[a], pred[a]) != old[a]}
+
+def display_dijkstra(frame, graph, result):
+    from display_utils import display_graph_result, subplots
+    from layout import get_layout
+
+    source = result.source
+
+    # Figure of this result window, reused across runs
+    fig, (ax1, ax2) = subplots(frame, 1, 2, figsize=(12, 5))
+
+    # Plot original graph
+    pos = get_layout(graph)
+    nx.draw(graph, pos, with_labels=True, ax=ax1)
+    edge_labels = nx.get_edge_attributes(graph, 'weight')
+    nx.draw_networkx_edge_labels(graph, pos, edge_labels=edge_labels, ax=ax1)
+    ax1.set_title("Original Graph")
+
+    # Plot shortest paths
+    nx.draw(graph, pos, with_labels=True, ax=ax2, edge_color='gray', width=1)
+    nx.draw_networkx_edges(graph, pos, ax=ax2,
+                         edgelist=result.tree_edges(),
+                         edge_color='r', width=2)
+    nx.draw_networkx_edge_labels(graph, pos, edge_labels=edge_labels, ax=ax2)
+    ax2.set_title(f"Shortest Paths from Source {source}")
+
+    # Prepare result text
+    result_text = f"Dijkstra's Shortest Paths from vertex {source}\n\n"
+    for target in range(len(result.distances)):
+        if target != source and np.isfinite(result.distances[target]):
+            path = ' → '.join(str(node) for node in result.path_to(target))
+            result_text += f"To vertex {target}: Distance = {result.distances[target]:g}, Path = {path}\n"
+
+    # Display the result
+    display_graph_result(frame, fig, result_text)
+
+def edit_dijkstra(frame, graph, result, source=0):
+    """Display a result with an edge editor below it"""
+    import tkinter as tk
+    from tkinter import messagebox
+    from display_utils import clear_result
+
+    # Edge edits repair the shortest-path tree locally instead of re-solving
+    edit_frame = tk.Frame(frame)
+    edit_frame.pack(pady=5)
+    changed_label = tk.Label(frame, text="", font=("Arial", 11))
+    changed_label.pack()
+    result_frame = tk.Frame(frame)
+    result_frame.pack()
+    tk.Label(edit_frame, text="Edge (u v):").pack(side=tk.LEFT)
+    edge_entry = tk.Entry(edit_frame, width=8)
+    edge_entry.pack(side=tk.LEFT, padx=5)
+    tk.Label(edit_frame, text="Weight (empty removes):").pack(side=tk.LEFT)
+    weight_entry = tk.Entry(edit_frame, width=6)
+    weight_entry.pack(side=tk.LEFT, padx=5)
+    sessions = []
+
+    def update_edge():
+        try:
+            u, v = map(int, edge_entry.get().split())
+            weight = weight_entry.get().strip()
+            if not sessions:
+                # Created on the first edit, starting from the tree already found
+                sessions.append(ShortestPathSession(graph, source, result=result))
+            changed = sessions[0].update({(u, v): float(weight) if weight else None})
+            changed_label.config(text="Changed vertices: " + (", ".join(map(str, changed)) or "none"))
+            clear_result(result_frame)
+            display_dijkstra(result_frame, graph, sessions[0].result())
+        except Exception as e:
+            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+
+    tk.Button(edit_frame, text="Update", command=update_edge).pack(side=tk.LEFT)
+    display_dijkstra(result_frame, graph, result)
 
 def run_dijkstra(frame, vertices, source=0):
+    from tkinter import messagebox
     try:
-        # Generate a random weighted graph
-        graph = nx.erdos_renyi_graph(vertices, 0.5)
-        
-        # Add random positive weights to edges
-        for (u, v) in graph.edges():
-            graph[u][v]['weight'] = np.random.randint(1, 10)
-        
-        # Ensure the graph is connected
-        while not nx.is_connected(graph):
-            v1, v2 = np.random.randint(0, vertices, 2)
-            if not graph.has_edge(v1, v2):
-                graph.add_edge(v1, v2, weight=np.random.randint(1, 10))
-        
-        # Calculate shortest paths using Dijkstra's algorithm
-        shortest_paths = nx.single_source_dijkstra_path(graph, source)
-        path_lengths = nx.single_source_dijkstra_path_length(graph, source)
-        
-        # Create a new figure
-        plt.clf()
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
-        
-        # Plot original graph
-        pos = nx.spring_layout(graph)
-        nx.draw(graph, pos, with_labels=True, ax=ax1)
-        edge_labels = nx.get_edge_attributes(graph, 'weight')
-        nx.draw_networkx_edge_labels(graph, pos, edge_labels=edge_labels, ax=ax1)
-        ax1.set_title("Original Graph")
-        
-        # Create a new graph for shortest paths
-        shortest_path_graph = nx.Graph()
-        for target in shortest_paths:
-            path = shortest_paths[target]
-            for i in range(len(path)-1):
-                shortest_path_graph.add_edge(path[i], path[i+1])
-        
-        # Plot shortest paths
-        nx.draw(graph, pos, with_labels=True, ax=ax2, edge_color='gray', width=1)
-        nx.draw_networkx_edges(graph, pos, ax=ax2, 
-                             edgelist=shortest_path_graph.edges(), 
-                             edge_color='r', width=2)
-        nx.draw_networkx_edge_labels(graph, pos, edge_labels=edge_labels, ax=ax2)
-        ax2.set_title(f"Shortest Paths from Source {source}")
-        
-        # Prepare result text
-        result_text = f"Dijkstra's Shortest Paths from vertex {source}\n\n"
-        for target in sorted(path_lengths.keys()):
-            if target != source:
-                path = ' → '.join(str(node) for node in shortest_paths[target])
-                result_text += f"To vertex {target}: Distance = {path_lengths[target]}, Path = {path}\n"
-        
-        # Display the result
-        display_graph_result(frame, fig, result_text)
-        
+        graph = generate_dijkstra_graph(vertices)
+        edit_dijkstra(frame, graph, solve_dijkstra(graph, source), source)
+
     except Exception as e:
         messagebox.showerror("Error", f"An error occurred: {str(e)}")
-        print(f"Error in Dijkstra's algorithm: {str(e)}") 
\ No newline at end of file
+        print(f"Error in Dijkstra's algorithm: {str(e)}")
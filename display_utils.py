@@ -1,18 +1,180 @@
 import tkinter as tk
+from collections import OrderedDict
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
+# Figures are created outside pyplot, which would otherwise keep every one
+# of them alive for the whole session. Each result window owns at most one
+# figure and canvas, reused by later results in the same window and
+# released when the window is destroyed. A frame of None means headless
+# use (benchmarks): figures are then rendered off-screen only. Blitting is
+# used for the matrix tooltip only; graph results are redrawn in full.
+
+
+class _PoolEntry:
+    def __init__(self, window):
+        self.window = window
+        self.figure = None
+        self.canvas = None
+
+
+class FigurePool:
+    """Figures and canvases of the open result windows.
+
+    At most ``max_figures`` windows keep a figure: a new window takes over
+    the figure of the oldest one, which keeps its text but loses its plot.
+    Result windows are only closed by the pool when ``max_windows`` is set
+    (the oldest ones first); by default every window stays open.
+    """
+
+    def __init__(self, max_windows=None, max_figures=5):
+        self.max_windows = max_windows
+        self.max_figures = max_figures
+        self.entries = OrderedDict()   # window path -> _PoolEntry, oldest first
+
+    def _entry(self, frame):
+        window = frame.winfo_toplevel()
+        key = str(window)
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = self.entries[key] = _PoolEntry(window)
+            window.bind('<Destroy>', lambda event: self._on_destroy(event, key), add='+')
+        self.entries.move_to_end(key)
+        return entry
+
+    def _on_destroy(self, event, key):
+        # <Destroy> is also delivered for every child of the window
+        entry = self.entries.get(key)
+        if entry is not None and event.widget is entry.window:
+            self.release(key)
+
+    def figure(self, frame, figsize=None):
+        """Cleared figure for a result window, reusing the window's figure"""
+        if frame is None:
+            return Figure(figsize=figsize)
+        entry = self._entry(frame)
+        if entry.figure is None:
+            entry.figure = self._recycle(entry)
+        if entry.figure is None:
+            entry.figure = Figure(figsize=figsize)
+        else:
+            entry.figure.clear()
+            if figsize is not None:
+                entry.figure.set_size_inches(figsize)
+        self._enforce_caps()
+        return entry.figure
+
+    def _recycle(self, entry):
+        """Figure taken from the oldest window once max_figures windows have one"""
+        with_figures = [other for other in self.entries.values()
+                        if other.figure is not None and other is not entry]
+        if len(with_figures) < self.max_figures:
+            return None
+        oldest = with_figures[0]
+        figure = oldest.figure
+        self._destroy_canvas(oldest)
+        oldest.figure = None
+        return figure
+
+    def subplots(self, frame, *args, figsize=None, **kwargs):
+        """Pooled counterpart of ``plt.subplots``"""
+        fig = self.figure(frame, figsize)
+        return fig, fig.subplots(*args, **kwargs)
+
+    def show(self, frame, fig):
+        """Draw ``fig`` in ``frame``, reusing the window's canvas when it is still shown"""
+        entry = self._entry(frame)
+        canvas = entry.canvas
+        if canvas is not None and canvas.figure is fig and canvas.get_tk_widget().winfo_exists():
+            canvas.draw_idle()
+            return canvas
+        self._destroy_canvas(entry)
+        entry.figure = fig
+        entry.canvas = FigureCanvasTkAgg(fig, master=frame)
+        entry.canvas.draw()
+        entry.canvas.get_tk_widget().pack()
+        return entry.canvas
+
+    def clear_frame(self, frame):
+        """Destroy a frame's widgets, the window's canvas among them, so the
+        next result shown in it is laid out like the first one"""
+        entry = self._entry(frame)
+        for child in frame.winfo_children():
+            child.destroy()
+        if entry.canvas is not None and not entry.canvas.get_tk_widget().winfo_exists():
+            entry.canvas = None
+
+    def _destroy_canvas(self, entry):
+        if entry.canvas is not None:
+            try:
+                entry.canvas.get_tk_widget().destroy()
+            except tk.TclError:
+                pass
+            entry.canvas = None
+
+    def release_figure(self, key):
+        entry = self.entries.get(key)
+        if entry is None or entry.figure is None:
+            return
+        self._destroy_canvas(entry)
+        entry.figure.clear()
+        entry.figure = None
+
+    def release(self, key):
+        """Forget a window and free its figure and canvas"""
+        self.release_figure(key)
+        self.entries.pop(key, None)
+
+    def _enforce_caps(self):
+        while self.max_windows is not None and len(self.entries) > self.max_windows:
+            key, entry = next(iter(self.entries.items()))
+            self.release(key)
+            try:
+                entry.window.destroy()
+            except tk.TclError:
+                pass
+        with_figures = [key for key, entry in self.entries.items() if entry.figure is not None]
+        for key in with_figures[:max(0, len(with_figures) - self.max_figures)]:
+            self.release_figure(key)
+
+    def clear(self):
+        for key in list(self.entries):
+            self.release(key)
+
+
+figure_pool = FigurePool()
+
+
+def subplots(frame, *args, **kwargs):
+    return figure_pool.subplots(frame, *args, **kwargs)
+
+
+def clear_result(frame):
+    """Empty a result frame before displaying an updated result in it"""
+    try:
+        figure_pool.clear_frame(frame)
+    except tk.TclError:
+        pass
+
+
 def display_graph_result(frame, fig, result):
+    if frame is None:
+        if fig is not None:
+            FigureCanvasAgg(fig).draw()
+        return
     try:
         if frame.winfo_exists():
             result_label = tk.Label(frame, text=result, font=("Arial", 12), wraplength=700)
             result_label.pack(pady=10)
-            canvas = FigureCanvasTkAgg(fig, master=frame)
-            canvas.draw()
-            canvas.get_tk_widget().pack()
+            if fig is not None:
+                figure_pool.show(frame, fig)
     except tk.TclError:
         print("Window was closed before displaying results")
 
 def display_matrix_result(frame, matrix, supply, demand, result):
+    if frame is None:
+        return
     try:
         if frame.winfo_exists():
             result_label = tk.Label(frame, text=result, font=("Arial", 12), wraplength=700)
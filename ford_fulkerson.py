@@ -1,71 +1,531 @@
-import tkinter as tk
-from tkinter import messagebox
+from collections import deque
 import numpy as np
 import networkx as nx
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from display_utils import display_graph_result
+from results import FlowResult
+from graph_generator import generate_random_graph
 
-def run_ford_fulkerson(frame, vertices):
+def generate_flow_network(vertices, density=0.4, seed=None):
+    """Generate a random DAG flow network where the sink is reachable from the source"""
+    # Every vertex is reachable from the source (0), including the sink
+    return generate_random_graph(vertices, density, acyclic=True, weights=None,
+                                 capacities=(1, 15), seed=seed).to_networkx()
+
+class ResidualGraph:
+    """Residual network kept in flat arrays.
+
+    Edge e of the input has the forward arc 2e (residual capacity starting
+    at its capacity) and the reverse arc 2e + 1 (starting at 0), so the
+    reverse of arc a is a ^ 1 and the flow on e is the residual of 2e + 1.
+    Arcs leaving vertex u are adj[indptr[u]:indptr[u + 1]].
+    """
+
+    def __init__(self, vertices, sources, targets, capacities):
+        self.vertices = vertices
+        self.sources = np.asarray(sources, dtype=np.int64)
+        self.targets = np.asarray(targets, dtype=np.int64)
+        self.capacities = np.asarray(capacities)
+        m = len(self.sources)
+        tails = np.empty(2 * m, dtype=np.int64)
+        heads = np.empty(2 * m, dtype=np.int64)
+        tails[0::2], tails[1::2] = self.sources, self.targets
+        heads[0::2], heads[1::2] = self.targets, self.sources
+        indptr = np.zeros(vertices + 1, dtype=np.int64)
+        np.cumsum(np.bincount(tails, minlength=vertices), out=indptr[1:])
+        residual = np.zeros(2 * m, dtype=self.capacities.dtype)
+        residual[0::2] = self.capacities
+        # Infinite capacities become one more than all finite ones together:
+        # a flow that large can only come from an unbounded path
+        infinite = np.isinf(self.capacities)
+        self.bound = self.capacities[~infinite].sum() if m else 0
+        self.infinite = np.flatnonzero(infinite).tolist()
+        if self.infinite:
+            residual[0::2][infinite] = self.bound + 1
+
+        # Python lists: the engines walk them one arc at a time
+        self.indptr = indptr.tolist()
+        self.adj = np.argsort(tails, kind='stable').tolist()
+        self.head = heads.tolist()
+        self.residual = residual.tolist()
+
+    @classmethod
+    def from_networkx(cls, graph, capacity='capacity'):
+        """Arcs of a networkx graph (nodes 0..V-1); undirected edges give one arc per direction"""
+        edges = list(graph.edges(data=capacity, default=np.inf))
+        sources = [u for u, _, _ in edges]
+        targets = [v for _, v, _ in edges]
+        capacities = [c for _, _, c in edges]
+        if not graph.is_directed():
+            sources, targets = sources + targets, targets + sources
+            capacities = capacities + capacities
+        return cls(graph.number_of_nodes(), sources, targets, np.array(capacities) if edges else [])
+
+    def edge_flows(self):
+        return np.array(self.residual[1::2], dtype=self.capacities.dtype)
+
+    def reachable(self, start):
+        """Vertices reachable from start through arcs with residual capacity"""
+        seen = [False] * self.vertices
+        seen[start] = True
+        stack = [start]
+        indptr, adj, head, residual = self.indptr, self.adj, self.head, self.residual
+        while stack:
+            u = stack.pop()
+            for k in range(indptr[u], indptr[u + 1]):
+                a = adj[k]
+                v = head[a]
+                if residual[a] > 0 and not seen[v]:
+                    seen[v] = True
+                    stack.append(v)
+        return np.array(seen)
+
+    def _levels(self, source, sink=None):
+        """BFS distances from source in the residual graph (-1 if unreachable)"""
+        level = [-1] * self.vertices
+        level[source] = 0
+        queue = deque([source])
+        indptr, adj, head, residual = self.indptr, self.adj, self.head, self.residual
+        while queue:
+            u = queue.popleft()
+            if u == sink:
+                break
+            for k in range(indptr[u], indptr[u + 1]):
+                a = adj[k]
+                v = head[a]
+                if residual[a] > 0 and level[v] < 0:
+                    level[v] = level[u] + 1
+                    queue.append(v)
+        return level
+
+def edmonds_karp(g, source, sink, limit=float('inf')):
+    """Shortest augmenting paths, stopping once ``limit`` units have been
+    sent; returns (added flow, augmentations)"""
+    indptr, adj, head, residual = g.indptr, g.adj, g.head, g.residual
+    total = 0
+    augmentations = 0
+    while total < limit:
+        parent_arc = [-1] * g.vertices
+        parent_arc[source] = -2
+        queue = deque([source])
+        while queue and parent_arc[sink] == -1:
+            u = queue.popleft()
+            for k in range(indptr[u], indptr[u + 1]):
+                a = adj[k]
+                v = head[a]
+                if residual[a] > 0 and parent_arc[v] == -1:
+                    parent_arc[v] = a
+                    queue.append(v)
+        if parent_arc[sink] == -1:
+            return total, augmentations
+
+        push = limit - total
+        v = sink
+        while v != source:
+            a = parent_arc[v]
+            push = min(push, residual[a])
+            v = head[a ^ 1]
+        v = sink
+        while v != source:
+            a = parent_arc[v]
+            residual[a] -= push
+            residual[a ^ 1] += push
+            v = head[a ^ 1]
+        total += push
+        augmentations += 1
+    return total, augmentations
+
+def dinic(g, source, sink):
+    """Dinic's algorithm: blocking flows on BFS level graphs; returns (added flow, phases)"""
+    indptr, adj, head, residual = g.indptr, g.adj, g.head, g.residual
+    total = 0
+    phases = 0
+    while True:
+        level = g._levels(source)
+        if level[sink] < 0:
+            return total, phases
+        phases += 1
+
+        # Blocking flow by depth-first search with current-arc pointers
+        current = indptr[:-1]
+        path = []
+        u = source
+        while True:
+            if u == sink:
+                push = min(residual[a] for a in path)
+                for a in path:
+                    residual[a] -= push
+                    residual[a ^ 1] += push
+                total += push
+                # Resume from the tail of the first saturated arc
+                cut = next(i for i, a in enumerate(path) if residual[a] == 0)
+                u = head[path[cut] ^ 1]
+                del path[cut:]
+                continue
+            end = indptr[u + 1]
+            k = current[u]
+            next_level = level[u] + 1
+            while k < end:
+                a = adj[k]
+                if residual[a] > 0 and level[head[a]] == next_level:
+                    break
+                k += 1
+            current[u] = k
+            if k < end:
+                path.append(a)
+                u = head[a]
+            elif u == source:
+                break
+            else:
+                # Dead end: retreat and skip the arc that led here
+                a = path.pop()
+                u = head[a ^ 1]
+                current[u] += 1
+
+def push_relabel(g, source, sink):
+    """Highest-label push-relabel with gap and global-relabel heuristics.
+
+    Returns (added flow, relabels). Excess that cannot reach the sink is
+    sent back to the source, so the result is a flow, not just a preflow.
+    """
+    n = g.vertices
+    indptr, adj, head, residual = g.indptr, g.adj, g.head, g.residual
+    height = [0] * n
+    excess = [0] * n
+    buckets = [[] for _ in range(2 * n + 1)]
+    count = [0] * (2 * n + 1)
+
+    def global_relabel():
+        # Exact distances to the sink, or n + distance to the source
+        for v in range(n):
+            height[v] = 2 * n
+        for start, base in ((sink, 0), (source, n)):
+            height[start] = base
+            queue = deque([start])
+            while queue:
+                u = queue.popleft()
+                for k in range(indptr[u], indptr[u + 1]):
+                    a = adj[k]
+                    v = head[a]
+                    if residual[a ^ 1] > 0 and height[v] == 2 * n and v != sink and v != source:
+                        height[v] = height[u] + 1
+                        queue.append(v)
+        for bucket in buckets:
+            bucket.clear()
+        for h in range(2 * n + 1):
+            count[h] = 0
+        for v in range(n):
+            count[height[v]] += 1
+            if excess[v] > 0 and v != source and v != sink:
+                buckets[height[v]].append(v)
+
+    # Saturate every arc leaving the source
+    for k in range(indptr[source], indptr[source + 1]):
+        a = adj[k]
+        c = residual[a]
+        if c > 0:
+            residual[a] = 0
+            residual[a ^ 1] += c
+            excess[head[a]] += c
+            excess[source] -= c
+    global_relabel()
+    current = indptr[:-1]
+    relabels = since_global = 0
+    top = 2 * n
+
+    while top >= 0:
+        if not buckets[top]:
+            top -= 1
+            continue
+        u = buckets[top].pop()
+        if height[u] != top or excess[u] <= 0:
+            continue
+        # Discharge u
+        while excess[u] > 0:
+            k = current[u]
+            if k == indptr[u + 1]:
+                # Relabel to one above the lowest admissible neighbour
+                old = height[u]
+                new = 2 * n
+                for k in range(indptr[u], indptr[u + 1]):
+                    a = adj[k]
+                    if residual[a] > 0 and height[head[a]] + 1 < new:
+                        new = height[head[a]] + 1
+                count[old] -= 1
+                height[u] = new
+                count[new] += 1
+                current[u] = indptr[u]
+                relabels += 1
+                since_global += 1
+                if count[old] == 0 and old < n:
+                    # Gap: nothing between old and n can reach the sink any more
+                    for v in range(n):
+                        if old < height[v] < n:
+                            count[height[v]] -= 1
+                            height[v] = n + 1
+                            count[n + 1] += 1
+                continue
+            a = adj[k]
+            v = head[a]
+            if residual[a] > 0 and height[u] == height[v] + 1:
+                push = min(excess[u], residual[a])
+                residual[a] -= push
+                residual[a ^ 1] += push
+                if excess[v] <= 0 and v != source and v != sink:
+                    buckets[height[v]].append(v)
+                    top = max(top, height[v])
+                excess[u] -= push
+                excess[v] += push
+            else:
+                current[u] = k + 1
+        if since_global >= n:
+            global_relabel()
+            current = indptr[:-1]
+            since_global = 0
+            top = 2 * n
+
+    return excess[sink], relabels
+
+MAX_FLOW_METHODS = {
+    "edmonds_karp": edmonds_karp,
+    "dinic": dinic,
+    "push_relabel": push_relabel,
+}
+
+def flow_result(g, source, sink, flow_value, iterations=0):
+    """FlowResult of a residual graph whose flow is maximum"""
+    flows = g.edge_flows()
+    flow_dict = {u: {} for u in range(g.vertices)}
+    for u, v, f in zip(g.sources.tolist(), g.targets.tolist(), flows.tolist()):
+        flow_dict[u][v] = flow_dict[u].get(v, 0) + f
+    return FlowResult(source, sink, flow_value, flow_dict, iterations,
+                      edge_flows=flows, source_side=g.reachable(source))
+
+def max_flow(g, source, sink, method="dinic"):
+    """Maximum flow on a ResidualGraph with the chosen engine"""
+    try:
+        engine = MAX_FLOW_METHODS[method]
+    except KeyError:
+        raise ValueError(f"Unknown max-flow method: {method}")
+    if source == sink:
+        raise ValueError("Source and sink must differ")
+    flow_value, iterations = engine(g, source, sink)
+    if flow_value > g.bound:
+        raise ValueError("Infinite capacity path, the maximum flow is unbounded")
+    return flow_result(g, source, sink, flow_value, iterations)
+
+def solve_ford_fulkerson(graph, source, sink, method="dinic"):
+    """Maximum flow from source to sink, with the minimum cut"""
+    return max_flow(ResidualGraph.from_networkx(graph), source, sink, method)
+
+class MaxFlowSession:
+    """Maximum flow kept up to date while arc capacities are edited.
+
+    The residual graph and its flow survive between solves. Raising a
+    capacity only opens new augmenting paths, which the next ``solve``
+    pushes on top of the current flow. Lowering it below the arc's flow
+    leaves a surplus at its tail and a shortage at its head; the surplus is
+    first rerouted to the head through the residual graph, and whatever is
+    left is cancelled back to the source and from the sink, so only the
+    flow around the edited arc is touched.
+
+    ``result``, a FlowResult of the same graph and terminals (e.g. solved
+    in a worker process), is taken as the starting flow instead of solving.
+    """
+
+    def __init__(self, graph, source, sink, method="dinic", capacity='capacity', result=None):
+        self.graph = graph
+        self.source = source
+        self.sink = sink
+        self.method = method
+        self.capacity = capacity
+        self.residual = ResidualGraph.from_networkx(graph, capacity)
+        # Edge indices per (u, v); undirected edges have one per direction
+        self.edges = {}
+        for e, (u, v) in enumerate(zip(self.residual.sources.tolist(), self.residual.targets.tolist())):
+            self.edges.setdefault((u, v), []).append(e)
+            if not graph.is_directed():
+                self.edges.setdefault((v, u), []).append(e)
+        self.flow_value = 0
+        if result is not None and result.edge_flows is not None:
+            # Start from a maximum flow already found for this graph
+            self._set_flows(result.edge_flows)
+            self.flow_value = result.flow_value
+            self.result = result
+        else:
+            self.result = self.solve()
+
+    def _set_flows(self, flows):
+        g = self.residual
+        if len(flows) != len(g.sources):
+            raise ValueError("The result does not match the graph's edges")
+        for e, flow in enumerate(flows.tolist()):
+            g.residual[2 * e] -= flow
+            g.residual[2 * e + 1] = flow
+
+    def set_capacity(self, u, v, capacity):
+        """Change the capacity of edge (u, v); the flow is repaired at once
+        if it no longer fits, and grows on the next ``solve``"""
+        if not 0 <= capacity < float('inf'):
+            raise ValueError(f"Capacity must be finite and non-negative, got {capacity}")
+        try:
+            indices = self.edges[u, v]
+        except KeyError:
+            raise ValueError(f"No edge {u}->{v}")
+        g = self.residual
+        if g.capacities.dtype.kind != 'f' and capacity != int(capacity):
+            g.capacities = g.capacities.astype(float)
+        for e in indices:
+            old = g.capacities[e]
+            if np.isinf(old):
+                raise ValueError(f"Edge {u}->{v} has infinite capacity")
+            g.capacities[e] = capacity
+            delta = capacity - old
+            g.bound += delta
+            if delta > 0:
+                # Infinite arcs must stay above every finite flow
+                for i in g.infinite:
+                    g.residual[2 * i] += delta
+            flow = g.residual[2 * e + 1]
+            if flow <= capacity:
+                g.residual[2 * e] = capacity - flow
+            else:
+                g.residual[2 * e] = 0
+                g.residual[2 * e + 1] = capacity
+                self._repair(g.sources[e], g.targets[e], flow - capacity)
+                self.flow_value = self._sink_inflow()
+        if self.graph.has_edge(u, v):
+            self.graph[u][v][self.capacity] = capacity
+
+    def _repair(self, tail, head, surplus):
+        """Restore conservation after ``surplus`` units were cut from tail->head"""
+        g = self.residual
+        tail, head = int(tail), int(head)
+        terminals = (self.source, self.sink)
+        # Reroute around the edited arc when possible
+        rerouted, _ = edmonds_karp(g, tail, head, surplus)
+        surplus -= rerouted
+        if surplus <= 0:
+            return
+        # Otherwise cancel flow: the tail's surplus goes back to a terminal
+        # (normally the source) and the head's shortage is taken from one
+        # (normally the sink)
+        if tail not in terminals:
+            sent, _ = edmonds_karp(g, tail, self.source, surplus)
+            edmonds_karp(g, tail, self.sink, surplus - sent)
+        if head not in terminals:
+            taken, _ = edmonds_karp(g, self.sink, head, surplus)
+            edmonds_karp(g, self.source, head, surplus - taken)
+
+    def _sink_inflow(self):
+        """Net flow into the sink"""
+        g = self.residual
+        # Odd arcs at the sink are reverses of incoming edges and hold their flow
+        return sum(g.residual[a] if a & 1 else -g.residual[a ^ 1]
+                   for a in g.adj[g.indptr[self.sink]:g.indptr[self.sink + 1]])
+
+    def update(self, capacities):
+        """Apply ``{(u, v): capacity}`` edits and re-solve"""
+        for (u, v), capacity in capacities.items():
+            self.set_capacity(u, v, capacity)
+        return self.solve()
+
+    def solve(self):
+        """Grow the current flow to a maximum one"""
+        try:
+            engine = MAX_FLOW_METHODS[self.method]
+        except KeyError:
+            raise ValueError(f"Unknown max-flow method: {self.method}")
+        if self.source == self.sink:
+            raise ValueError("Source and sink must differ")
+        added, iterations = engine(self.residual, self.source, self.sink)
+        self.flow_value += added
+        if self.flow_value > self.residual.bound:
+            raise ValueError("Infinite capacity path, the maximum flow is unbounded")
+        self.result = flow_result(self.residual, self.source, self.sink, self.flow_value, iterations)
+        return self.result
+
+def display_ford_fulkerson(frame, graph, result):
+    from display_utils import display_graph_result, subplots
+    from layout import get_layout
+
+    flow_dict = result.flow_dict
+
+    # Create visualization (reusing the result window's figure)
+    fig, (ax1, ax2) = subplots(frame, 1, 2, figsize=(12, 5))
+
+    # Plot original graph with capacities
+    pos = get_layout(graph)
+    nx.draw(graph, pos, with_labels=True, ax=ax1, node_color='lightblue', arrows=True)
+    edge_labels = nx.get_edge_attributes(graph, 'capacity')
+    nx.draw_networkx_edge_labels(graph, pos, edge_labels=edge_labels, ax=ax1)
+    ax1.set_title("Original Network (Capacities)")
+
+    # Plot flow graph, source side of the minimum cut in green and cut edges dashed
+    cut_edges = result.cut_edges()
+    node_colors = ['lightgreen' if result.source_side is not None and result.source_side[node]
+                   else 'lightblue' for node in graph.nodes()]
+    nx.draw(graph, pos, with_labels=True, ax=ax2, node_color=node_colors, arrows=True)
+    nx.draw_networkx_edges(graph, pos, edgelist=cut_edges, ax=ax2, edge_color='r',
+                           style='dashed', width=2)
+    edge_labels = {(u, v): f"{flow_dict[u][v]}/{graph[u][v]['capacity']}"
+                  for u, v in graph.edges()}
+    nx.draw_networkx_edge_labels(graph, pos, edge_labels=edge_labels, ax=ax2)
+    ax2.set_title("Maximum Flow Network (Flow/Capacity)")
+
+    # Prepare result text
+    result_text = f"Ford-Fulkerson Maximum Flow\n\n"
+    result_text += f"Maximum Flow Value: {result.flow_value}\n"
+    result_text += "Minimum Cut: " + ", ".join(f"{u}->{v}" for u, v in cut_edges) + "\n\n"
+    result_text += "Flow Details:\n"
+    for u in sorted(flow_dict.keys()):
+        for v in sorted(flow_dict[u].keys()):
+            if flow_dict[u][v] > 0:
+                result_text += f"Edge {u}->{v}: Flow = {flow_dict[u][v]}, Capacity = {graph[u][v]['capacity']}\n"
+
+    # Display the result
+    display_graph_result(frame, fig, result_text)
+
+def edit_ford_fulkerson(frame, graph, result, source, sink, method="dinic"):
+    """Display a result with a capacity editor below it"""
+    import tkinter as tk
+    from tkinter import messagebox
+    from display_utils import clear_result
+
+    # Capacity edits re-solve from the current flow instead of from scratch
+    edit_frame = tk.Frame(frame)
+    edit_frame.pack(pady=5)
+    result_frame = tk.Frame(frame)
+    result_frame.pack()
+    tk.Label(edit_frame, text="Edge (u v):").pack(side=tk.LEFT)
+    edge_entry = tk.Entry(edit_frame, width=8)
+    edge_entry.pack(side=tk.LEFT, padx=5)
+    tk.Label(edit_frame, text="Capacity:").pack(side=tk.LEFT)
+    capacity_entry = tk.Entry(edit_frame, width=6)
+    capacity_entry.pack(side=tk.LEFT, padx=5)
+    sessions = []
+
+    def update_capacity():
+        try:
+            u, v = map(int, edge_entry.get().split())
+            capacity = float(capacity_entry.get())
+            if not sessions:
+                # Created on the first edit, starting from the flow already found
+                sessions.append(MaxFlowSession(graph, source, sink, method, result=result))
+            updated = sessions[0].update({(u, v): capacity})
+            clear_result(result_frame)
+            display_ford_fulkerson(result_frame, graph, updated)
+        except Exception as e:
+            messagebox.showerror("Error", f"An error occurred: {str(e)}")
+
+    tk.Button(edit_frame, text="Update", command=update_capacity).pack(side=tk.LEFT)
+    display_ford_fulkerson(result_frame, graph, result)
+
+def run_ford_fulkerson(frame, vertices, method="dinic"):
+    from tkinter import messagebox
     try:
-        # Generate a random flow network
-        graph = nx.DiGraph()
-        
-        # Add nodes
-        graph.add_nodes_from(range(vertices))
-        
-        # Add random edges with capacities
-        for i in range(vertices):
-            for j in range(i+1, vertices):
-                if np.random.random() < 0.4:  # 40% chance of edge
-                    graph.add_edge(i, j, capacity=np.random.randint(1, 15))
-        
-        # Ensure source (0) and sink (vertices-1) are connected
-        if not nx.has_path(graph, 0, vertices-1):
-            path = nx.shortest_path(graph.to_undirected(), 0, vertices-1)
-            for i in range(len(path)-1):
-                if not graph.has_edge(path[i], path[i+1]):
-                    graph.add_edge(path[i], path[i+1], capacity=np.random.randint(1, 15))
-        
-        # Calculate maximum flow
-        flow_value, flow_dict = nx.maximum_flow(graph, 0, vertices-1)
-        
-        # Create visualization
-        plt.clf()
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
-        
-        # Plot original graph with capacities
-        pos = nx.spring_layout(graph)
-        nx.draw(graph, pos, with_labels=True, ax=ax1, node_color='lightblue', arrows=True)
-        edge_labels = nx.get_edge_attributes(graph, 'capacity')
-        nx.draw_networkx_edge_labels(graph, pos, edge_labels=edge_labels, ax=ax1)
-        ax1.set_title("Original Network (Capacities)")
-        
-        # Create flow graph
-        flow_graph = nx.DiGraph(graph)
-        for u in flow_dict:
-            for v, flow in flow_dict[u].items():
-                flow_graph[u][v]['flow'] = flow
-        
-        # Plot flow graph
-        nx.draw(flow_graph, pos, with_labels=True, ax=ax2, node_color='lightblue', arrows=True)
-        edge_labels = {(u, v): f"{flow_dict[u][v]}/{graph[u][v]['capacity']}"
-                      for u, v in graph.edges()}
-        nx.draw_networkx_edge_labels(flow_graph, pos, edge_labels=edge_labels, ax=ax2)
-        ax2.set_title("Maximum Flow Network (Flow/Capacity)")
-        
-        # Prepare result text
-        result_text = f"Ford-Fulkerson Maximum Flow\n\n"
-        result_text += f"Maximum Flow Value: {flow_value}\n\n"
-        result_text += "Flow Details:\n"
-        for u in sorted(flow_dict.keys()):
-            for v in sorted(flow_dict[u].keys()):
-                if flow_dict[u][v] > 0:
-                    result_text += f"Edge {u}->{v}: Flow = {flow_dict[u][v]}, Capacity = {graph[u][v]['capacity']}\n"
-        
-        # Display the result
-        display_graph_result(frame, fig, result_text)
-        
+        graph = generate_flow_network(vertices)
+        result = solve_ford_fulkerson(graph, 0, vertices-1, method)
+        edit_ford_fulkerson(frame, graph, result, 0, vertices-1, method)
+
     except Exception as e:
         messagebox.showerror("Error", f"An error occurred: {str(e)}")
-        print(f"Error in Ford-Fulkerson algorithm: {str(e)}") 
\ No newline at end of file
+        print(f"Error in Ford-Fulkerson algorithm: {str(e)}")
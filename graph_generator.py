@@ -0,0 +1,175 @@
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple, Union
+import numpy as np
+
+# Random graph generation shared by the graph algorithms (Dijkstra, Kruskal,
+# Bellman-Ford, Ford-Fulkerson and Welsh-Powell). Edges are sampled directly
+# as NumPy arrays, so large graphs never go through per-edge Python loops.
+
+# A value distribution is either an integer range [low, high) or a callable
+# taking (rng, size) and returning an array of values.
+Distribution = Union[Tuple[int, int], Callable[[np.random.Generator, int], np.ndarray]]
+
+
+@dataclass
+class EdgeList:
+    vertices: int
+    sources: np.ndarray
+    targets: np.ndarray
+    weights: Optional[np.ndarray] = None
+    capacities: Optional[np.ndarray] = None
+    directed: bool = False
+
+    def __len__(self):
+        return len(self.sources)
+
+    def to_networkx(self):
+        """Build the equivalent networkx Graph / DiGraph"""
+        import networkx as nx
+
+        graph = nx.DiGraph() if self.directed else nx.Graph()
+        graph.add_nodes_from(range(self.vertices))
+        attributes = {}
+        if self.weights is not None:
+            attributes['weight'] = self.weights.tolist()
+        if self.capacities is not None:
+            attributes['capacity'] = self.capacities.tolist()
+        names = list(attributes)
+        columns = [attributes[name] for name in names]
+        graph.add_edges_from(
+            (u, v, dict(zip(names, values)))
+            for u, v, *values in zip(self.sources.tolist(), self.targets.tolist(), *columns)
+        )
+        return graph
+
+
+def _draw(distribution: Optional[Distribution], rng, size):
+    if distribution is None:
+        return None
+    if callable(distribution):
+        return np.asarray(distribution(rng, size))
+    low, high = distribution
+    return rng.integers(low, high, size=size)
+
+
+def bernoulli_indices(total, p, rng):
+    """Indices in [0, total) each kept with probability p, using geometric skips"""
+    if total <= 0 or p <= 0:
+        return np.empty(0, dtype=np.int64)
+    if p >= 1:
+        return np.arange(total, dtype=np.int64)
+
+    chunks = []
+    position = -1
+    while True:
+        # Draw a little more than the expected number of remaining hits
+        expected = (total - 1 - position) * p
+        size = int(expected + 4 * np.sqrt(expected) + 16)
+        hits = position + np.cumsum(rng.geometric(p, size=size))
+        if hits[-1] >= total:
+            chunks.append(hits[hits < total])
+            break
+        chunks.append(hits)
+        position = hits[-1]
+    return np.concatenate(chunks)
+
+
+def _pair_from_index(index, vertices, directed):
+    """Map linear pair indices back to (u, v) vertex pairs without self-loops"""
+    if directed:
+        u = index // (vertices - 1)
+        v = index % (vertices - 1)
+        v += v >= u
+        return u, v
+
+    # Undirected pairs enumerate the lower triangle: index = i(i-1)/2 + j, j < i
+    i = ((1 + np.sqrt(1 + 8 * index.astype(float))) / 2).astype(np.int64)
+    i -= i * (i - 1) // 2 > index
+    i += (i + 1) * i // 2 <= index
+    j = index - i * (i - 1) // 2
+    return j, i
+
+
+def find_roots(vertices, sources, targets):
+    """Vectorized union-find: the component root (smallest vertex) of every vertex"""
+    parent = np.arange(vertices)
+    while True:
+        pu, pv = parent[sources], parent[targets]
+        low, high = np.minimum(pu, pv), np.maximum(pu, pv)
+        merge = low != high
+        if not merge.any():
+            return parent
+        # high is always a root here, so hooking it keeps a valid forest
+        np.minimum.at(parent, high[merge], low[merge])
+        # Path compression until every vertex points at its root
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+
+def _component_links(vertices, sources, targets, rng):
+    """Random edges joining the components into a single one"""
+    roots = find_roots(vertices, sources, targets)
+    # One random member per component
+    shuffled = rng.permutation(vertices)
+    _, first = np.unique(roots[shuffled], return_index=True)
+    members = rng.permutation(shuffled[first])
+    if len(members) < 2:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+    # Each component attaches to a random earlier one, forming a random tree
+    earlier = (rng.random(len(members) - 1) * np.arange(1, len(members))).astype(np.int64)
+    return members[earlier], members[1:]
+
+
+def _arborescence(vertices, acyclic, rng):
+    """Random spanning tree with every vertex reachable from vertex 0"""
+    if acyclic:
+        order = np.arange(vertices)
+    else:
+        order = np.concatenate(([0], rng.permutation(np.arange(1, vertices))))
+    earlier = (rng.random(vertices - 1) * np.arange(1, vertices)).astype(np.int64)
+    return order[earlier], order[1:]
+
+
+def generate_random_graph(vertices: int, density: float, directed: bool = False,
+                          acyclic: bool = False, connected: bool = True,
+                          weights: Optional[Distribution] = (1, 10),
+                          capacities: Optional[Distribution] = None,
+                          seed=None) -> EdgeList:
+    """Sample a G(n, p) style random graph as edge arrays.
+
+    Undirected graphs are made connected by linking their components;
+    directed graphs get a random spanning arborescence so every vertex is
+    reachable from vertex 0. ``acyclic`` only creates edges u -> v with
+    u < v (a DAG, as used for flow networks).
+    """
+    rng = np.random.default_rng(seed)
+    if vertices < 2:
+        empty = np.empty(0, dtype=np.int64)
+        return EdgeList(max(vertices, 0), empty, empty, _draw(weights, rng, 0),
+                        _draw(capacities, rng, 0), directed or acyclic)
+
+    pairs_directed = directed and not acyclic
+    total = vertices * (vertices - 1) if pairs_directed else vertices * (vertices - 1) // 2
+    sources, targets = _pair_from_index(bernoulli_indices(total, density, rng),
+                                        vertices, pairs_directed)
+
+    if connected:
+        if directed or acyclic:
+            extra_u, extra_v = _arborescence(vertices, acyclic, rng)
+            sources = np.concatenate((sources, extra_u))
+            targets = np.concatenate((targets, extra_v))
+            # Tree edges may repeat sampled ones
+            keys = np.unique(sources * vertices + targets)
+            sources, targets = keys // vertices, keys % vertices
+        else:
+            extra_u, extra_v = _component_links(vertices, sources, targets, rng)
+            sources = np.concatenate((sources, extra_u))
+            targets = np.concatenate((targets, extra_v))
+
+    count = len(sources)
+    return EdgeList(vertices, sources, targets, _draw(weights, rng, count),
+                    _draw(capacities, rng, count), directed or acyclic)
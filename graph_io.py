@@ -0,0 +1,473 @@
+import csv
+import hashlib
+import io
+import json
+import os
+import shutil
+import numpy as np
+
+from csr_graph import CSRGraph
+from graph_generator import EdgeList
+
+# Graphs read from files for the graph algorithms. Three formats are
+# understood:
+#
+#   edgelist   one edge per line, "u v [weight]" separated by spaces, tabs,
+#              commas or semicolons (CSV with an optional header row)
+#   adjacency  a dense matrix, as text rows or a .npy file; every non-zero
+#              finite entry is an edge
+#   mtx        Matrix Market coordinate files (1-based, "symmetric" means
+#              undirected)
+#
+# Text is parsed in blocks of whole lines with numpy's C reader, so only
+# arrays are ever built, never one Python object per edge. The parsed graph
+# is stored once under CACHE_DIR as .npy CSR arrays (indptr / indices /
+# weights) and reopened as memory maps when the same file is loaded again.
+# An entry is dropped once its file changes, and the least recently used
+# entries are removed when the cache grows past CACHE_LIMIT bytes.
+
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'project_tkinter', 'graphs')
+CACHE_LIMIT = 2 * 2 ** 30
+BLOCK_SIZE = 16 * 2 ** 20     # bytes of text parsed at a time
+FORMATS = ("edgelist", "adjacency", "mtx")
+_COMMENTS = ('#', '%')
+_HEADER_NAMES = {'source', 'target', 'src', 'dst', 'from', 'to', 'u', 'v', 'node1', 'node2',
+                 'weight', 'capacity', 'cost'}
+
+
+def detect_format(path):
+    name = path.lower()
+    if name.endswith('.mtx'):
+        return "mtx"
+    if name.endswith('.npy'):
+        return "adjacency"
+    return "edgelist"
+
+
+def text_blocks(f, block_size=BLOCK_SIZE):
+    """Chunks of a binary file that end on line boundaries"""
+    carry = b''
+    while True:
+        data = f.read(block_size)
+        if not data:
+            if carry.strip():
+                yield carry
+            return
+        data = carry + data
+        cut = data.rfind(b'\n')
+        if cut < 0:
+            carry = data
+            continue
+        yield data[:cut + 1]
+        carry = data[cut + 1:]
+
+
+def first_data_lines(path, count=2):
+    lines = []
+    with open(path, 'rb') as f:
+        for raw in f:
+            line = raw.decode('utf-8', 'replace').strip()
+            if line and not line.startswith(_COMMENTS):
+                lines.append(line)
+                if len(lines) == count:
+                    break
+    return lines
+
+
+def detect_delimiter(line):
+    for delimiter in (',', ';', '\t'):
+        if delimiter in line:
+            return delimiter
+    return None
+
+
+def split_fields(line, delimiter):
+    return [field.strip() for field in line.split(delimiter)]
+
+
+def is_numeric(fields):
+    try:
+        [float(field) for field in fields]
+        return True
+    except ValueError:
+        return False
+
+
+def parse_block(block, delimiter, columns, total_columns=None, first_column=0):
+    """Columns first_column.. of a text block as a (rows, columns) float array"""
+    # Comment scanning and column selection roughly halve loadtxt's speed,
+    # so they are only asked for when the block needs them
+    comments = [c for c in _COMMENTS if c.encode() in block] or None
+    usecols = (range(first_column, first_column + columns)
+               if total_columns != columns or first_column else None)
+    return np.loadtxt(io.BytesIO(block), delimiter=delimiter, comments=comments,
+                      usecols=usecols, ndmin=2, dtype=float)
+
+
+def read_edge_list(path, block_size=BLOCK_SIZE):
+    """(vertices, sources, targets, weights or None, labels or None) of an edge list.
+
+    Integer vertex ids are used as they are; any other ids are numbered in
+    order of appearance and returned as ``labels``.
+    """
+    lines = first_data_lines(path)
+    if not lines:
+        empty = np.empty(0, dtype=np.int64)
+        return 0, empty, empty, None, None
+    delimiter = detect_delimiter(lines[0])
+    fields = split_fields(lines[0], delimiter)
+    header = not is_numeric(fields) and (
+        (len(lines) > 1 and is_numeric(split_fields(lines[1], delimiter)))
+        or fields[0].lower() in _HEADER_NAMES)
+    if header and len(lines) > 1:
+        fields = split_fields(lines[1], delimiter)
+    total_columns = len(fields)
+    columns = min(total_columns, 3)
+    if columns < 2:
+        raise ValueError(f"{path}: expected 'u v [weight]' lines")
+    if not is_numeric(fields[:2]):
+        return _read_named_edge_list(path, delimiter, header, columns)
+
+    chunks = []
+    with open(path, 'rb') as f:
+        if header:
+            # Skip to the line after the header row
+            for raw in f:
+                line = raw.strip()
+                if line and not line.startswith((b'#', b'%')):
+                    break
+        for block in text_blocks(f, block_size):
+            try:
+                rows = parse_block(block, delimiter, columns, total_columns)
+            except ValueError as e:
+                raise ValueError(f"{path}: {e}")
+            chunks.append(rows)
+    rows = np.concatenate(chunks) if chunks else np.empty((0, columns))
+    sources, targets = rows[:, 0], rows[:, 1]
+    if len(rows) and ((sources % 1).any() or (targets % 1).any() or min(sources.min(), targets.min()) < 0):
+        raise ValueError(f"{path}: vertex ids must be non-negative integers")
+    sources, targets = sources.astype(np.int64), targets.astype(np.int64)
+    vertices = int(max(sources.max(), targets.max())) + 1 if len(rows) else 0
+    weights = rows[:, 2].copy() if columns == 3 else None
+    return vertices, sources, targets, weights, None
+
+
+def _read_named_edge_list(path, delimiter, header, columns):
+    """Edge list with non-numeric vertex names (parsed with the csv module)"""
+    ids = {}
+    chunks = []
+    with open(path, newline='') as f:
+        rows = (row for row in csv.reader(f, delimiter=delimiter or ' ', skipinitialspace=True)
+                if row and not row[0].lstrip().startswith(_COMMENTS))
+        if header:
+            next(rows, None)
+        while True:
+            block = [row for _, row in zip(range(65536), rows)]
+            if not block:
+                break
+            pairs = np.array([[ids.setdefault(row[0].strip(), len(ids)),
+                               ids.setdefault(row[1].strip(), len(ids))] for row in block],
+                             dtype=np.int64)
+            weights = (np.array([float(row[2]) for row in block]) if columns == 3
+                       else np.empty(0))
+            chunks.append((pairs, weights))
+    pairs = np.concatenate([p for p, _ in chunks]) if chunks else np.empty((0, 2), dtype=np.int64)
+    weights = np.concatenate([w for _, w in chunks]) if columns == 3 and chunks else None
+    labels = np.array(list(ids), dtype=str)
+    return len(ids), pairs[:, 0], pairs[:, 1], weights, labels
+
+
+def _adjacency_rows(path, block_size):
+    """Blocks of consecutive rows of a dense matrix, with their first row index"""
+    if path.lower().endswith('.npy'):
+        matrix = np.load(path, mmap_mode='r')
+        if matrix.ndim != 2:
+            raise ValueError(f"{path}: expected a 2-D matrix")
+        step = max(1, block_size // (8 * max(matrix.shape[1], 1)))
+        for start in range(0, matrix.shape[0], step):
+            yield start, np.asarray(matrix[start:start + step], dtype=float)
+        return
+    lines = first_data_lines(path, 1)
+    if not lines:
+        return
+    delimiter = detect_delimiter(lines[0])
+    columns = len(split_fields(lines[0], delimiter))
+    start = 0
+    with open(path, 'rb') as f:
+        for block in text_blocks(f, block_size):
+            rows = parse_block(block, delimiter, columns, columns)
+            yield start, rows
+            start += len(rows)
+
+
+def read_adjacency(path, directed=True, block_size=BLOCK_SIZE):
+    """Edges of a dense adjacency matrix; undirected graphs read the upper triangle"""
+    sources, targets, weights = [], [], []
+    size = None
+    rows_seen = 0
+    for start, rows in _adjacency_rows(path, block_size):
+        size = rows.shape[1] if size is None else size
+        if rows.shape[1] != size:
+            raise ValueError(f"{path}: rows of different lengths")
+        present = (rows != 0) & np.isfinite(rows)
+        if not directed:
+            present &= np.arange(size) >= np.arange(start, start + len(rows))[:, None]
+        r, c = np.nonzero(present)
+        sources.append(r + start)
+        targets.append(c)
+        weights.append(rows[r, c])
+        rows_seen = start + len(rows)
+    if size is None:
+        empty = np.empty(0, dtype=np.int64)
+        return 0, empty, empty, np.empty(0), None
+    if rows_seen != size:
+        raise ValueError(f"{path}: adjacency matrix is {rows_seen}x{size}, not square")
+    return (size, np.concatenate(sources).astype(np.int64), np.concatenate(targets).astype(np.int64),
+            np.concatenate(weights), None)
+
+
+def read_matrix_market(path, block_size=BLOCK_SIZE):
+    """Edges of a Matrix Market coordinate file; returns (..., directed)"""
+    with open(path, 'rb') as f:
+        banner = f.readline().decode('ascii', 'replace').lower().split()
+        if len(banner) != 5 or banner[0] != '%%matrixmarket' or banner[1] != 'matrix':
+            raise ValueError(f"{path}: not a Matrix Market matrix file")
+        _, _, layout, field, symmetry = banner
+        if layout != 'coordinate':
+            raise ValueError(f"{path}: only coordinate Matrix Market files are supported "
+                             f"(load dense matrices as 'adjacency')")
+        if field not in ('real', 'integer', 'pattern') or symmetry not in ('general', 'symmetric'):
+            raise ValueError(f"{path}: unsupported Matrix Market type '{field} {symmetry}'")
+        for raw in f:
+            line = raw.strip()
+            if line and not line.startswith(b'%'):
+                rows, cols, entries = (int(x) for x in line.split()[:3])
+                break
+        else:
+            raise ValueError(f"{path}: missing size line")
+        if rows != cols:
+            raise ValueError(f"{path}: adjacency matrix must be square, got {rows}x{cols}")
+        columns = 2 if field == 'pattern' else 3
+        chunks = [parse_block(block, None, columns, columns) for block in text_blocks(f, block_size)]
+    data = np.concatenate(chunks) if chunks else np.empty((0, columns))
+    if len(data) != entries:
+        raise ValueError(f"{path}: expected {entries} entries, found {len(data)}")
+    sources = data[:, 0].astype(np.int64) - 1
+    targets = data[:, 1].astype(np.int64) - 1
+    weights = data[:, 2].copy() if columns == 3 else None
+    return rows, sources, targets, weights, None, symmetry == 'general'
+
+
+def file_stamp(path):
+    """Absolute path, size and modification time of a file"""
+    stat = os.stat(path)
+    return [os.path.abspath(path), stat.st_size, stat.st_mtime_ns]
+
+
+def _directory_size(directory):
+    return sum(entry.stat().st_size for entry in os.scandir(directory) if entry.is_file())
+
+
+def evict_cache(cache_dir, limit=CACHE_LIMIT, keep=None):
+    """Trim a cache directory of entries with a meta.json.
+
+    Entries made from an older version of the file ``keep`` was made from
+    are removed, then the least recently used ones until the rest take at
+    most ``limit`` bytes; ``keep`` itself is never removed.
+    """
+    if not os.path.isdir(cache_dir):
+        return
+    stamp = None
+    if keep is not None and os.path.exists(os.path.join(keep, 'meta.json')):
+        with open(os.path.join(keep, 'meta.json')) as f:
+            stamp = json.load(f).get('stamp')
+    entries = []
+    for entry in os.scandir(cache_dir):
+        meta_path = os.path.join(entry.path, 'meta.json')
+        # Entries without meta.json may still be being written
+        if not entry.is_dir() or not os.path.exists(meta_path):
+            continue
+        if keep is not None and os.path.samefile(entry.path, keep):
+            continue
+        if stamp is not None:
+            with open(meta_path) as f:
+                old = json.load(f).get('stamp')
+            if old is not None and old[0] == stamp[0] and old != stamp:
+                shutil.rmtree(entry.path, ignore_errors=True)
+                continue
+        entries.append((os.path.getmtime(meta_path), _directory_size(entry.path), entry.path))
+    total = sum(size for _, size, _ in entries)
+    if keep is not None:
+        total += _directory_size(keep)
+    for _, size, path in sorted(entries):
+        if total <= limit:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+
+
+def cache_key(path, fmt, directed):
+    """Key of a parsed file: its path, size and modification time plus the options"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps(file_stamp(path) + [fmt, directed]).encode())
+    return digest.hexdigest()
+
+
+class GraphStore:
+    """A parsed graph kept as memory-mapped CSR arrays (arcs as listed in the file)"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, 'meta.json')) as f:
+            self.meta = json.load(f)
+        self.indptr = self._load('indptr')
+        self.indices = self._load('indices')
+        self.weights = self._load('weights') if self.meta['weighted'] else None
+        self.labels = self._load('labels') if self.meta['labeled'] else None
+
+    def _load(self, name):
+        return np.load(os.path.join(self.directory, f'{name}.npy'), mmap_mode='r')
+
+    @property
+    def vertices(self):
+        return self.meta['vertices']
+
+    @property
+    def directed(self):
+        return self.meta['directed']
+
+    def edge_list(self):
+        """The edges as an EdgeList (weights double as capacities)"""
+        sources = np.repeat(np.arange(self.vertices), np.diff(self.indptr))
+        return EdgeList(self.vertices, sources, self.indices, self.weights, self.weights, self.directed)
+
+    def csr(self):
+        """CSRGraph of the graph; directed graphs use the stored arrays without copying"""
+        weights = self.weights if self.weights is not None else np.ones(len(self.indices))
+        if self.directed:
+            return CSRGraph(self.indptr, self.indices, weights, True)
+        sources = np.repeat(np.arange(self.vertices), np.diff(self.indptr))
+        return CSRGraph.from_edges(self.vertices, sources, self.indices, weights, False)
+
+
+def _write_store(directory, key, source, fmt, vertices, sources, targets, weights, labels, directed):
+    os.makedirs(directory, exist_ok=True)
+    meta_path = os.path.join(directory, 'meta.json')
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+    order = np.argsort(sources, kind='stable')
+    indptr = np.zeros(vertices + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=vertices), out=indptr[1:])
+    np.save(os.path.join(directory, 'indptr.npy'), indptr)
+    np.save(os.path.join(directory, 'indices.npy'), targets[order])
+    if weights is not None:
+        np.save(os.path.join(directory, 'weights.npy'), weights[order])
+    if labels is not None:
+        np.save(os.path.join(directory, 'labels.npy'), labels)
+    # Written last: a store without meta.json is incomplete
+    with open(meta_path, 'w') as f:
+        json.dump({'key': key, 'source': os.path.abspath(source), 'stamp': file_stamp(source),
+                   'format': fmt, 'vertices': vertices, 'edges': len(targets), 'directed': directed,
+                   'weighted': weights is not None, 'labeled': labels is not None}, f)
+
+
+def parse_graph(path, fmt=None, directed=None):
+    """(vertices, sources, targets, weights, labels, directed) of a graph file.
+
+    ``directed`` defaults to True, except for symmetric Matrix Market
+    files. Self-loops are dropped (matrix diagonals rarely mean edges).
+    """
+    fmt = fmt or detect_format(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown graph format: {fmt} (expected one of {', '.join(FORMATS)})")
+    if fmt == "mtx":
+        *parsed, file_directed = read_matrix_market(path)
+        directed = file_directed if directed is None else directed
+    elif fmt == "adjacency":
+        directed = True if directed is None else directed
+        parsed = read_adjacency(path, directed)
+    else:
+        directed = True if directed is None else directed
+        parsed = read_edge_list(path)
+    vertices, sources, targets, weights, labels = parsed
+    loops = sources == targets
+    if loops.any():
+        sources, targets = sources[~loops], targets[~loops]
+        weights = weights[~loops] if weights is not None else None
+    return vertices, sources, targets, weights, labels, directed
+
+
+def open_graph(path, fmt=None, directed=None, cache_dir=None, cache_limit=CACHE_LIMIT):
+    """GraphStore of a graph file, parsed on first use and then reopened
+    from ``cache_dir`` (CACHE_DIR by default) while the file is unchanged.
+    The cache is trimmed to ``cache_limit`` bytes after each new entry."""
+    fmt = fmt or detect_format(path)
+    key = cache_key(path, fmt, directed)
+    cache_dir = cache_dir or CACHE_DIR
+    directory = os.path.join(cache_dir, key)
+    meta_path = os.path.join(directory, 'meta.json')
+    if os.path.exists(meta_path):
+        store = GraphStore(directory)
+        if store.meta.get('key') == key:
+            # The meta.json time orders the cache entries by last use
+            os.utime(meta_path)
+            return store
+    _write_store(directory, key, path, fmt, *parse_graph(path, fmt, directed))
+    evict_cache(cache_dir, cache_limit, keep=directory)
+    return GraphStore(directory)
+
+
+def load_graph(path, fmt=None, directed=None, cache=True, cache_dir=None):
+    """EdgeList of a graph file; weights double as capacities"""
+    if cache:
+        return open_graph(path, fmt, directed, cache_dir).edge_list()
+    vertices, sources, targets, weights, _, directed = parse_graph(path, fmt, directed)
+    return EdgeList(vertices, sources, targets, weights, weights, directed)
+
+
+def merge_parallel(vertices, sources, targets, values, directed, how="min"):
+    """One edge per vertex pair (in either order when undirected); the
+    values of parallel edges are combined by how ("min" or "sum")"""
+    low, high = sources, targets
+    if not directed:
+        low, high = np.minimum(sources, targets), np.maximum(sources, targets)
+    keys, inverse = np.unique(low * np.int64(vertices) + high, return_inverse=True)
+    if how == "sum":
+        merged = np.zeros(len(keys), dtype=np.result_type(values, np.int64))
+        np.add.at(merged, inverse, values)
+    else:
+        merged = np.full(len(keys), np.inf)
+        np.minimum.at(merged, inverse, values)
+        merged = merged.astype(values.dtype)
+    return keys // vertices, keys % vertices, merged
+
+
+def graph_instance(name, edges):
+    """Solver arguments of a graph algorithm for a loaded EdgeList.
+
+    networkx keeps one edge per vertex pair, so parallel edges are merged
+    first: the lightest one counts for shortest paths and spanning trees,
+    and capacities add up for maximum flow.
+    """
+    if name == "Bellman-Ford":
+        from bellman_ford import Graph
+        g = Graph(edges.vertices)
+        weights = edges.weights if edges.weights is not None else np.ones(len(edges))
+        g.add_edges_from_arrays(edges.sources, edges.targets, weights)
+        return (g,)
+    if name == "Ford-Fulkerson":
+        # Unweighted files: every edge carries one unit
+        capacities = edges.capacities if edges.capacities is not None else np.ones(len(edges), dtype=np.int64)
+        sources, targets, capacities = merge_parallel(edges.vertices, edges.sources, edges.targets,
+                                                      np.asarray(capacities), edges.directed, "sum")
+        return (EdgeList(edges.vertices, sources, targets, None, capacities, edges.directed).to_networkx(),)
+    if name in ("Dijkstra", "All-Pairs", "Welsh-Powell", "Kruskal"):
+        # Coloring and spanning trees are undirected, whatever the file's direction
+        directed = edges.directed and name in ("Dijkstra", "All-Pairs")
+        weights = edges.weights if edges.weights is not None else np.ones(len(edges), dtype=np.int64)
+        sources, targets, weights = merge_parallel(edges.vertices, edges.sources, edges.targets,
+                                                   np.asarray(weights), directed)
+        if edges.weights is None:
+            weights = None
+        return (EdgeList(edges.vertices, sources, targets, weights, None, directed).to_networkx(),)
+    raise ValueError(f"{name} does not take a graph file")
@@ -0,0 +1,368 @@
+import numpy as np
+from transportation import SparseMatrix
+
+# Initial basic feasible solutions for the transportation methods. Each
+# function takes (supply, demand, costs) and returns the allocation matrix;
+# the North-West Corner, Least Cost, Stepping-Stone and Potential Method
+# modules build on them. When the costs are a SparseMatrix of allowed
+# routes the allocation is a SparseMatrix too, and only those routes are
+# ever used.
+
+
+def _greedy_fill(rows, cols, supply_left, demand_left, allocate, chunk_size=65536):
+    """Fill the cells in the given order with as much as their row and column allow.
+
+    Chunks of the order are pre-filtered against exhausted rows/columns with
+    array operations, so closed cells cost almost nothing to skip.
+    """
+    remaining = min(supply_left.sum(), demand_left.sum())
+    for start in range(0, len(rows), chunk_size):
+        if remaining <= 0:
+            break
+        chunk_rows, chunk_cols = rows[start:start + chunk_size], cols[start:start + chunk_size]
+        open_cells = (supply_left[chunk_rows] > 0) & (demand_left[chunk_cols] > 0)
+        for i, j in zip(chunk_rows[open_cells].tolist(), chunk_cols[open_cells].tolist()):
+            quantity = min(supply_left[i], demand_left[j])
+            if quantity <= 0:
+                continue
+            allocate(i, j, quantity)
+            supply_left[i] -= quantity
+            demand_left[j] -= quantity
+            remaining -= quantity
+
+
+def _repair_feasibility(supply_left, demand_left, costs, flows):
+    """Route the supply a greedy pass left over along augmenting paths of allowed routes"""
+    m = len(supply_left)
+    indptr, lane_cols = costs.indptr.tolist(), costs.cols.tolist()
+    column_cells = [dict() for _ in range(len(demand_left))]
+    for (i, j), flow in flows.items():
+        column_cells[j][i] = flow
+
+    while np.any(supply_left > 0) and np.any(demand_left > 0):
+        # Breadth-first search over rows (nodes 0..m-1) and columns (m..m+n-1):
+        # rows reach columns by any allowed route, columns reach rows by
+        # routes that carry flow
+        previous = {i: None for i in np.flatnonzero(supply_left > 0).tolist()}
+        frontier = list(previous)
+        end = None
+        for node in frontier:
+            if node < m:
+                neighbors = (m + j for j in lane_cols[indptr[node]:indptr[node + 1]])
+            else:
+                neighbors = iter(column_cells[node - m])
+            for neighbor in neighbors:
+                if neighbor not in previous:
+                    previous[neighbor] = node
+                    frontier.append(neighbor)
+                    if neighbor >= m and demand_left[neighbor - m] > 0:
+                        end = neighbor
+                        break
+            if end is not None:
+                break
+        if end is None:
+            raise ValueError("The allowed routes cannot carry the supply to the demand")
+
+        path = [end]
+        while previous[path[-1]] is not None:
+            path.append(previous[path[-1]])
+        path.reverse()
+        # Path alternates row -> column (gains) and column -> row (loses)
+        quantity = min(supply_left[path[0]], demand_left[end - m])
+        for k in range(1, len(path) - 1, 2):
+            quantity = min(quantity, column_cells[path[k] - m][path[k + 1]])
+
+        for k in range(len(path) - 1):
+            a, b = path[k], path[k + 1]
+            i, j = (a, b - m) if a < m else (b, a - m)
+            flow = flows.get((i, j), 0) + (quantity if a < m else -quantity)
+            if flow > 0:
+                flows[(i, j)] = column_cells[j][i] = flow
+            else:
+                flows.pop((i, j), None)
+                column_cells[j].pop(i, None)
+        supply_left[path[0]] -= quantity
+        demand_left[end - m] -= quantity
+
+
+def _sparse_allocation(shape, flows):
+    if flows:
+        (rows, cols), values = zip(*flows.keys()), list(flows.values())
+    else:
+        rows, cols, values = [], [], []
+    return SparseMatrix.from_coo(shape, rows, cols, values, fill=0)
+
+
+def _fill_sparse(supply, demand, costs, order):
+    """Greedy fill over the allowed routes in ``order``, then repair what is left"""
+    supply_left = np.array(supply, copy=True)
+    demand_left = np.array(demand, copy=True)
+    flows = {}
+
+    def allocate(i, j, quantity):
+        flows[(i, j)] = quantity
+
+    _greedy_fill(costs.rows[order], costs.cols[order], supply_left, demand_left, allocate)
+    _repair_feasibility(supply_left, demand_left, costs, flows)
+    return _sparse_allocation(costs.shape, flows)
+
+
+def repair_allocation(flows, supply, demand, costs):
+    """Feasible allocation close to ``flows`` (a {(i, j): flow} dict of a
+    previous solution) for new supply and demand amounts.
+
+    Negative flows are dropped, rows and then columns that ship more than
+    their amount give back their most expensive flow first, and whatever
+    supply is left is placed greedily by cost on the rows and columns still
+    open. Flows that still fit are kept as they are.
+    """
+    m, n = len(supply), len(demand)
+    sparse = isinstance(costs, SparseMatrix)
+    flows = {cell: flow for cell, flow in flows.items() if flow > 0}
+
+    for axis, amounts in ((0, supply), (1, demand)):
+        lines = {}
+        for cell, flow in flows.items():
+            lines.setdefault(cell[axis], []).append(cell)
+        for line, cells in lines.items():
+            excess = sum(flows[c] for c in cells) - amounts[line]
+            if excess <= 0:
+                continue
+            line_costs = (costs.lookup(*zip(*cells)) if sparse
+                          else [costs[i, j] for i, j in cells])
+            for k in np.argsort(line_costs)[::-1].tolist():
+                cell = cells[k]
+                cut = min(excess, flows[cell])
+                flows[cell] -= cut
+                if flows[cell] <= 0:
+                    del flows[cell]
+                excess -= cut
+                if excess <= 0:
+                    break
+
+    shipped_rows = np.zeros(m)
+    shipped_cols = np.zeros(n)
+    if flows:
+        rows, cols = (np.array(axis) for axis in zip(*flows))
+        values = np.array(list(flows.values()), dtype=float)
+        shipped_rows = np.bincount(rows, weights=values, minlength=m)
+        shipped_cols = np.bincount(cols, weights=values, minlength=n)
+    supply_left = np.maximum(np.asarray(supply, dtype=float) - shipped_rows, 0)
+    demand_left = np.maximum(np.asarray(demand, dtype=float) - shipped_cols, 0)
+
+    def allocate(i, j, quantity):
+        flows[(i, j)] = flows.get((i, j), 0) + quantity
+
+    if sparse:
+        open_lanes = np.flatnonzero((supply_left[costs.rows] > 0) & (demand_left[costs.cols] > 0))
+        order = open_lanes[np.argsort(costs.data[open_lanes], kind='stable')]
+        _greedy_fill(costs.rows[order], costs.cols[order], supply_left, demand_left, allocate)
+        _repair_feasibility(supply_left, demand_left, costs, flows)
+        return _sparse_allocation(costs.shape, flows)
+
+    # Least cost on the block of rows and columns that are still open
+    open_rows, open_cols = np.flatnonzero(supply_left > 0), np.flatnonzero(demand_left > 0)
+    if len(open_rows) and len(open_cols):
+        block = np.asarray(costs)[np.ix_(open_rows, open_cols)]
+        order = np.argsort(block, axis=None, kind='stable')
+        _greedy_fill(open_rows[order // len(open_cols)], open_cols[order % len(open_cols)],
+                     supply_left, demand_left, allocate)
+    solution = np.zeros((m, n))
+    for (i, j), flow in flows.items():
+        solution[i, j] = flow
+    return solution
+
+
+def north_west_corner_allocation(supply, demand, costs=None):
+    """Allocate greedily from the top-left cell, ignoring costs"""
+    if isinstance(costs, SparseMatrix):
+        # Allowed routes are stored row-major, which is the North-West Corner order
+        return _fill_sparse(supply, demand, costs, np.arange(costs.nnz))
+
+    supply_left = np.array(supply, copy=True)
+    demand_left = np.array(demand, copy=True)
+    solution = np.zeros((len(supply), len(demand)))
+
+    i, j = 0, 0
+    while i < len(supply) and j < len(demand):
+        quantity = min(supply_left[i], demand_left[j])
+        solution[i, j] = quantity
+        supply_left[i] -= quantity
+        demand_left[j] -= quantity
+
+        if supply_left[i] == 0:
+            i += 1
+        if demand_left[j] == 0:
+            j += 1
+
+    return solution
+
+
+def least_cost_allocation(supply, demand, costs):
+    """Allocate to the cheapest remaining cell first.
+
+    Cells are visited once in cost order (ties in row-major order), so the
+    whole method is one sort plus a scan.
+    """
+    if isinstance(costs, SparseMatrix):
+        return _fill_sparse(supply, demand, costs, np.argsort(costs.data, kind='stable'))
+
+    costs = np.asarray(costs)
+    m, n = costs.shape
+    supply_left = np.array(supply, copy=True)
+    demand_left = np.array(demand, copy=True)
+    solution = np.zeros((m, n))
+
+    def allocate(i, j, quantity):
+        solution[i, j] = quantity
+
+    rows, cols = np.divmod(np.argsort(costs, axis=None, kind='stable'), n)
+    _greedy_fill(rows, cols, supply_left, demand_left, allocate)
+    return solution
+
+
+class _PenaltyLines:
+    """Vogel penalties of one side (rows or columns) of the cost matrix.
+
+    Each line keeps its cells sorted by cost (line k holds positions
+    indptr[k]..indptr[k + 1] of the flat arrays) and two forward-only
+    pointers to its cheapest and second cheapest open cells, so penalties
+    are only recomputed for lines whose top two cells were just closed.
+    """
+
+    def __init__(self, indptr, targets, line_costs):
+        self.indptr = np.asarray(indptr).tolist()
+        self.targets = targets
+        self.line_costs = line_costs
+        count = len(self.indptr) - 1
+        self.first_pos = self.indptr[:-1]
+        self.second_pos = [pos + 1 for pos in self.first_pos]
+        self.first = np.full(count, -1)
+        self.second = np.full(count, -1)
+        self.penalty = np.full(count, -np.inf)
+
+    @classmethod
+    def from_dense(cls, costs):
+        order = np.argsort(costs, axis=1, kind='stable')
+        count, size = costs.shape
+        return cls(np.arange(0, count * size + 1, size), order.ravel(),
+                   np.take_along_axis(costs, order, axis=1).ravel())
+
+    @classmethod
+    def from_lanes(cls, count, lines, targets, lane_costs):
+        order = np.lexsort((lane_costs, lines))
+        return cls(np.searchsorted(lines[order], np.arange(count + 1)),
+                   targets[order], lane_costs[order])
+
+    def _advance(self, line, pos, other_open):
+        end = self.indptr[line + 1]
+        targets = self.targets
+        while pos < end and not other_open[targets[pos]]:
+            pos += 1
+        return pos
+
+    def refresh(self, line, other_open):
+        first_pos = self._advance(line, self.first_pos[line], other_open)
+        second_pos = self._advance(line, max(self.second_pos[line], first_pos + 1), other_open)
+        self.first_pos[line], self.second_pos[line] = first_pos, second_pos
+
+        end = self.indptr[line + 1]
+        if first_pos >= end:
+            self.close(line)
+            return
+        self.first[line] = self.targets[first_pos]
+        if second_pos >= end:
+            self.second[line] = -1
+            self.penalty[line] = self.line_costs[first_pos]
+        else:
+            self.second[line] = self.targets[second_pos]
+            self.penalty[line] = self.line_costs[second_pos] - self.line_costs[first_pos]
+
+    def close(self, line):
+        self.first[line] = self.second[line] = -1
+        self.penalty[line] = -np.inf
+
+    def affected_by(self, other_line):
+        """Open lines whose cheapest or second cheapest cell lies on other_line"""
+        return np.flatnonzero((self.first == other_line) | (self.second == other_line))
+
+
+def vogel_allocation(supply, demand, costs):
+    """Vogel's Approximation Method.
+
+    Repeatedly picks the row or column with the largest penalty (difference
+    between its two cheapest open cells) and fills its cheapest open cell.
+    """
+    sparse = isinstance(costs, SparseMatrix)
+    supply_left = np.array(supply, copy=True)
+    demand_left = np.array(demand, copy=True)
+    m, n = len(supply_left), len(demand_left)
+    if sparse:
+        flows = {}
+        lane_costs = costs.data.astype(float)
+        rows = _PenaltyLines.from_lanes(m, costs.rows, costs.cols, lane_costs)
+        cols = _PenaltyLines.from_lanes(n, costs.cols, costs.rows, lane_costs)
+    else:
+        costs = np.asarray(costs, dtype=float)
+        solution = np.zeros((m, n))
+        rows = _PenaltyLines.from_dense(costs)
+        cols = _PenaltyLines.from_dense(costs.T)
+
+    row_open = (supply_left > 0).tolist()
+    col_open = (demand_left > 0).tolist()
+    for i in range(m):
+        if row_open[i]:
+            rows.refresh(i, col_open)
+    for j in range(n):
+        if col_open[j]:
+            cols.refresh(j, row_open)
+
+    while True:
+        best_row = int(np.argmax(rows.penalty))
+        best_col = int(np.argmax(cols.penalty))
+        if rows.penalty[best_row] == -np.inf or cols.penalty[best_col] == -np.inf:
+            break
+        if rows.penalty[best_row] >= cols.penalty[best_col]:
+            i, j = best_row, int(rows.first[best_row])
+        else:
+            i, j = int(cols.first[best_col]), best_col
+
+        quantity = min(supply_left[i], demand_left[j])
+        if sparse:
+            flows[(i, j)] = quantity
+        else:
+            solution[i, j] = quantity
+        supply_left[i] -= quantity
+        demand_left[j] -= quantity
+
+        if supply_left[i] == 0:
+            row_open[i] = False
+            rows.close(i)
+            for j2 in cols.affected_by(i).tolist():
+                cols.refresh(j2, row_open)
+        if demand_left[j] == 0:
+            col_open[j] = False
+            cols.close(j)
+            for i2 in rows.affected_by(j).tolist():
+                rows.refresh(i2, col_open)
+
+    if sparse:
+        _repair_feasibility(supply_left, demand_left, costs, flows)
+        return _sparse_allocation(costs.shape, flows)
+    return solution
+
+
+INITIAL_METHODS = {
+    "north_west_corner": north_west_corner_allocation,
+    "least_cost": least_cost_allocation,
+    "vogel": vogel_allocation,
+}
+
+
+def initial_allocation(method, supply, demand, costs):
+    """Initial basic feasible solution by method name (see INITIAL_METHODS)"""
+    try:
+        build = INITIAL_METHODS[method]
+    except KeyError:
+        raise ValueError(f"Unknown initial solution method: {method}")
+    return build(supply, demand, costs)
@@ -1,46 +1,197 @@
-import tkinter as tk
-from tkinter import messagebox
 import numpy as np
 import networkx as nx
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from display_utils import display_graph_result
+from results import MSTResult
+from graph_generator import generate_random_graph, find_roots
+from csr_graph import CSRGraph
+
+def generate_kruskal_graph(vertices, density=0.5, seed=None):
+    """Generate a random graph with positive integer weights"""
+    return generate_random_graph(vertices, density, connected=False,
+                                 weights=(1, 10), seed=seed).to_networkx()
+
+PRIM_DENSITY = 0.3          # edge density above which Prim is used
+BORUVKA_MIN_EDGES = 1000000  # edge count above which Boruvka is used
+
+def _find(parent, x):
+    """Root of x, halving the path on the way"""
+    while parent[x] != x:
+        parent[x] = parent[parent[x]]
+        x = parent[x]
+    return x
+
+def kruskal_arrays(vertices, sources, targets, weights, chunk_size=65536):
+    """Kruskal over edge arrays with an array union-find (path halving, union by rank).
+
+    Edges are visited in argsort order, chunk by chunk, and the scan stops
+    as soon as the forest is complete. Returns the indices of the chosen edges.
+    """
+    order = np.argsort(weights, kind='stable')
+    # A spanning forest has V - (number of components) edges
+    needed = vertices - len(np.unique(find_roots(vertices, sources, targets)))
+    parent = list(range(vertices))
+    rank = [0] * vertices
+    chosen = []
+
+    for start in range(0, len(order), chunk_size):
+        if len(chosen) == needed:
+            break
+        block = order[start:start + chunk_size]
+        for k, u, v in zip(block.tolist(), sources[block].tolist(), targets[block].tolist()):
+            ru, rv = _find(parent, u), _find(parent, v)
+            if ru == rv:
+                continue
+            if rank[ru] < rank[rv]:
+                ru, rv = rv, ru
+            parent[rv] = ru
+            if rank[ru] == rank[rv]:
+                rank[ru] += 1
+            chosen.append(k)
+            if len(chosen) == needed:
+                break
+    return np.array(chosen, dtype=np.int64)
+
+def boruvka_arrays(vertices, sources, targets, weights):
+    """Boruvka's algorithm with every round done in array operations.
+
+    Each component picks its lightest outgoing edge (ties broken by sorted
+    position, so no cycle can form), the picked edges merge components, and
+    edges inside a component are dropped. Returns (chosen edge indices, rounds).
+    """
+    order = np.argsort(weights, kind='stable')
+    # Edges in sorted order: an edge's position is its rank
+    cu, cv = sources[order], targets[order]
+    ranks = np.flatnonzero(cu != cv)
+    cu, cv = cu[ranks], cv[ranks]
+    none = len(order)
+    chosen = []
+    rounds = 0
+
+    while len(ranks):
+        rounds += 1
+        best = np.full(vertices, none, dtype=np.int64)
+        np.minimum.at(best, cu, ranks)
+        np.minimum.at(best, cv, ranks)
+        picked = np.unique(best[best < none])
+        chosen.append(order[picked])
+
+        # Merge the components joined by the picked edges; a component is
+        # labelled by its smallest vertex
+        at = np.searchsorted(ranks, picked)
+        roots = find_roots(vertices, cu[at], cv[at])
+        cu, cv = roots[cu], roots[cv]
+        keep = cu != cv
+        ranks, cu, cv = ranks[keep], cu[keep], cv[keep]
+
+    chosen = np.concatenate(chosen) if chosen else np.empty(0, dtype=np.int64)
+    return chosen, rounds
+
+def prim_arrays(vertices, sources, targets, weights):
+    """Prim's algorithm for dense graphs, keeping the tentative keys in an array.
+
+    With E close to V^2 an argmin over the key array per step (O(V^2) in
+    total, vectorized) is cheaper than heap operations on every edge.
+    Returns the indices of the chosen edges.
+    """
+    csr = CSRGraph.from_edges(vertices, sources, targets, np.arange(len(weights)), directed=False)
+    edge_ids = csr.weights.astype(np.int64)
+    arc_weights = np.asarray(weights, dtype=float)[edge_ids]
+    unreached = np.finfo(float).max
+    key = np.full(vertices, unreached)
+    via = np.full(vertices, -1, dtype=np.int64)   # edge connecting each vertex to the tree
+    done = np.zeros(vertices, dtype=bool)
+    chosen = []
+
+    for _ in range(vertices):
+        u = int(np.argmin(key))
+        if via[u] >= 0:
+            chosen.append(via[u])
+        # Done vertices get +inf, so unreached ones (a new tree) come first
+        key[u] = np.inf
+        done[u] = True
+        arcs = slice(csr.indptr[u], csr.indptr[u + 1])
+        neighbours, w = csr.indices[arcs], arc_weights[arcs]
+        better = ~done[neighbours] & (w < key[neighbours])
+        if better.any():
+            neighbours, w, ids = neighbours[better], w[better], edge_ids[arcs][better]
+            np.minimum.at(key, neighbours, w)
+            winner = key[neighbours] == w
+            via[neighbours[winner]] = ids[winner]
+    return np.array(chosen, dtype=np.int64)
+
+def minimum_spanning_forest(vertices, sources, targets, weights, method="auto"):
+    """Minimum spanning forest of an undirected graph given as edge arrays.
+
+    ``method`` is "kruskal", "boruvka", "prim" or "auto" (Prim for dense
+    graphs, Boruvka for very large ones, Kruskal otherwise).
+    """
+    sources = np.asarray(sources, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    weights = np.asarray(weights)
+    if method == "auto":
+        density = 2 * len(weights) / max(1, vertices * (vertices - 1))
+        if density >= PRIM_DENSITY:
+            method = "prim"
+        elif len(weights) >= BORUVKA_MIN_EDGES:
+            method = "boruvka"
+        else:
+            method = "kruskal"
+
+    iterations = 0
+    if method == "kruskal":
+        chosen = kruskal_arrays(vertices, sources, targets, weights)
+    elif method == "boruvka":
+        chosen, iterations = boruvka_arrays(vertices, sources, targets, weights)
+    elif method == "prim":
+        chosen = prim_arrays(vertices, sources, targets, weights)
+    else:
+        raise ValueError(f"Unknown MST method: {method}")
+
+    chosen_weights = weights[chosen]
+    edges = list(zip(sources[chosen].tolist(), targets[chosen].tolist(), chosen_weights.tolist()))
+    return MSTResult(edges, chosen_weights.sum().item() if len(chosen) else 0, iterations or len(chosen))
+
+def solve_kruskal(graph, method="auto"):
+    """Minimum spanning tree (forest) of a networkx graph"""
+    edges = list(graph.edges(data='weight', default=1))
+    sources = np.array([u for u, _, _ in edges], dtype=np.int64)
+    targets = np.array([v for _, v, _ in edges], dtype=np.int64)
+    weights = np.array([w for _, _, w in edges]) if edges else np.empty(0)
+    return minimum_spanning_forest(graph.number_of_nodes(), sources, targets, weights, method)
+
+def display_kruskal(frame, graph, result):
+    from display_utils import display_graph_result, subplots
+    from layout import get_layout
+
+    mst = nx.Graph()
+    mst.add_nodes_from(graph.nodes())
+    mst.add_weighted_edges_from(result.edges)
+
+    # Figure of this result window, reused across runs
+    fig, (ax1, ax2) = subplots(frame, 1, 2, figsize=(12, 5))
+
+    # Plot original graph
+    pos = get_layout(graph)
+    nx.draw(graph, pos, with_labels=True, ax=ax1)
+    edge_labels = nx.get_edge_attributes(graph, 'weight')
+    nx.draw_networkx_edge_labels(graph, pos, edge_labels=edge_labels, ax=ax1)
+    ax1.set_title("Original Graph")
+
+    # Plot MST
+    nx.draw(mst, pos, with_labels=True, ax=ax2, edge_color='r', width=2)
+    mst_edge_labels = nx.get_edge_attributes(mst, 'weight')
+    nx.draw_networkx_edge_labels(mst, pos, edge_labels=mst_edge_labels, ax=ax2)
+    ax2.set_title("Minimum Spanning Tree")
+
+    # Show the graph in the GUI
+    display_graph_result(frame, fig, f"Kruskal's MST\nTotal Weight: {result.total_weight}")
 
 def run_kruskal(frame, vertices):
+    from tkinter import messagebox
     try:
-        # Generate a random weighted graph
-        graph = nx.erdos_renyi_graph(vertices, 0.5)
-        
-        # Add random weights to edges
-        for (u, v) in graph.edges():
-            graph[u][v]['weight'] = np.random.randint(1, 10)
-        
-        # Find minimum spanning tree using Kruskal's algorithm
-        mst = nx.minimum_spanning_tree(graph)
-        
-        # Create a new figure
-        plt.clf()  # Clear any existing figures
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
-        
-        # Plot original graph
-        pos = nx.spring_layout(graph)
-        nx.draw(graph, pos, with_labels=True, ax=ax1)
-        edge_labels = nx.get_edge_attributes(graph, 'weight')
-        nx.draw_networkx_edge_labels(graph, pos, edge_labels=edge_labels, ax=ax1)
-        ax1.set_title("Original Graph")
-        
-        # Plot MST
-        nx.draw(mst, pos, with_labels=True, ax=ax2, edge_color='r', width=2)
-        mst_edge_labels = nx.get_edge_attributes(mst, 'weight')
-        nx.draw_networkx_edge_labels(mst, pos, edge_labels=mst_edge_labels, ax=ax2)
-        ax2.set_title("Minimum Spanning Tree")
-        
-        # Calculate total MST weight
-        total_weight = sum(mst[u][v]['weight'] for u, v in mst.edges())
-        
-        # Show the graph in the GUI
-        display_graph_result(frame, fig, f"Kruskal's MST\nTotal Weight: {total_weight}")
-        
+        graph = generate_kruskal_graph(vertices)
+        result = solve_kruskal(graph)
+        display_kruskal(frame, graph, result)
+
     except Exception as e:
         messagebox.showerror("Error", f"An error occurred: {str(e)}")
-        print(f"Error in Kruskal's algorithm: {str(e)}") 
\ No newline at end of file
+        print(f"Error in Kruskal's algorithm: {str(e)}")
@@ -0,0 +1,183 @@
+import hashlib
+from collections import OrderedDict
+import numpy as np
+import networkx as nx
+
+# Node positions for the graph visualizations. Layouts are cached by the
+# structure of the graph (LRU), a graph that only changed slightly (most of
+# its nodes and edges shared) starts from the positions of a cached one, and large graphs use a vectorized
+# force layout whose repulsion is approximated on a grid.
+
+SPRING_LAYOUT_LIMIT = 500  # larger graphs use force_layout instead of nx.spring_layout
+
+
+def graph_hash(graph):
+    """Structural hash of a graph: its nodes and (undirected) edges"""
+    nodes = sorted(graph.nodes())
+    index = {node: k for k, node in enumerate(nodes)}
+    edges = np.array([sorted((index[u], index[v])) for u, v in graph.edges()],
+                     dtype=np.int64).reshape(-1, 2)
+    edges = edges[np.lexsort((edges[:, 1], edges[:, 0]))]
+    digest = hashlib.blake2b(repr(nodes).encode(), digest_size=16)
+    digest.update(edges.tobytes())
+    return digest.hexdigest()
+
+
+def edge_keys(graph):
+    """Sorted hashes of a graph's (undirected) edges, to measure the overlap of two graphs"""
+    return np.unique(np.fromiter((hash(frozenset((u, v))) for u, v in graph.edges()),
+                                 dtype=np.int64, count=graph.number_of_edges()))
+
+
+class LayoutCache:
+    """Least-recently-used store of layouts keyed by (graph_hash, method)"""
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()   # key -> (positions, edge_keys or None)
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, pos, edges=None):
+        self.entries[key] = (pos, edges)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def closest(self, nodes, edges, method=None, min_overlap=0.8):
+        """Most recent layout of the same method sharing at least
+        ``min_overlap`` of its nodes and of its edges with the given graph.
+
+        Node labels alone say little (every generated graph is labeled
+        0..V-1), so the edges must match too.
+        """
+        nodes = set(nodes)
+        for key, (pos, cached_edges) in reversed(self.entries.items()):
+            if cached_edges is None or (method is not None and key[1] != method):
+                continue
+            shared = len(nodes.intersection(pos))
+            if not shared or shared < min_overlap * max(len(nodes), len(pos)):
+                continue
+            shared = len(np.intersect1d(edges, cached_edges, assume_unique=True))
+            if shared >= min_overlap * max(len(edges), len(cached_edges)):
+                return pos
+        return None
+
+    def clear(self):
+        self.entries.clear()
+
+
+default_cache = LayoutCache()
+
+
+def _rescale(positions):
+    """Center on the origin and scale into [-1, 1], like networkx layouts"""
+    positions = positions - positions.mean(axis=0)
+    extent = np.abs(positions).max()
+    return positions / extent if extent > 0 else positions
+
+
+def force_layout(vertices, sources, targets, initial=None, iterations=50,
+                 temperature=0.1, seed=None, chunk_size=4096):
+    """Fruchterman-Reingold layout with grid-approximated repulsion.
+
+    Nodes are binned into a grid of about vertices/64 cells and every node is
+    pushed away from each cell's center of mass instead of from every other
+    node, so an iteration costs O(V * cells + E) array work.
+    """
+    rng = np.random.default_rng(seed)
+    sources = np.asarray(sources, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    if initial is None:
+        positions = rng.random((vertices, 2))
+    else:
+        positions = np.array(initial, dtype=float)
+    if vertices < 2:
+        return positions
+
+    k = 1.0 / np.sqrt(vertices)
+    side = max(1, int(np.sqrt(vertices) / 8))
+    cooling = temperature / (iterations + 1)
+
+    for _ in range(iterations):
+        low = positions.min(axis=0)
+        span = np.maximum(positions.max(axis=0) - low, 1e-9)
+        cell_xy = np.minimum(((positions - low) / span * side).astype(np.int64), side - 1)
+        cells = cell_xy[:, 0] * side + cell_xy[:, 1]
+        mass = np.bincount(cells, minlength=side * side).astype(float)
+        occupied = mass > 0
+        centers = np.stack([np.bincount(cells, weights=positions[:, d], minlength=side * side)
+                            for d in range(2)], axis=1)[occupied] / mass[occupied, None]
+        mass = mass[occupied]
+
+        # Repulsion from every cell's center of mass, in chunks of nodes
+        displacement = np.zeros_like(positions)
+        for start in range(0, vertices, chunk_size):
+            delta = positions[start:start + chunk_size, None, :] - centers[None, :, :]
+            distance2 = np.maximum((delta ** 2).sum(axis=2), 1e-6)
+            displacement[start:start + chunk_size] = (
+                delta * (mass * k * k / distance2)[:, :, None]).sum(axis=1)
+
+        # Attraction along the edges
+        delta = positions[sources] - positions[targets]
+        pull = delta * (np.sqrt((delta ** 2).sum(axis=1)) / k)[:, None]
+        for d in range(2):
+            displacement[:, d] -= np.bincount(sources, weights=pull[:, d], minlength=vertices)
+            displacement[:, d] += np.bincount(targets, weights=pull[:, d], minlength=vertices)
+
+        # Move each node at most `temperature`
+        length = np.maximum(np.sqrt((displacement ** 2).sum(axis=1)), 1e-9)
+        positions += displacement * (np.minimum(length, temperature) / length)[:, None]
+        temperature -= cooling
+
+    return positions
+
+
+def compute_layout(graph, method="auto", initial=None, seed=None):
+    """Positions {node: (x, y)} for a networkx graph, optionally warm-started from ``initial``"""
+    nodes = list(graph.nodes())
+    if method == "auto":
+        method = "spring" if len(nodes) <= SPRING_LAYOUT_LIMIT else "force"
+
+    if method == "spring":
+        if initial:
+            # Warm start: only new nodes need to settle, so fewer iterations
+            return nx.spring_layout(graph, pos=initial, iterations=15, seed=seed)
+        return nx.spring_layout(graph, seed=seed)
+    if method == "spectral":
+        return nx.spectral_layout(graph)
+    if method != "force":
+        raise ValueError(f"Unknown layout method: {method}")
+
+    index = {node: k for k, node in enumerate(nodes)}
+    edges = np.array([(index[u], index[v]) for u, v in graph.edges()], dtype=np.int64).reshape(-1, 2)
+    start = None
+    iterations, temperature = 50, 0.1
+    if initial:
+        rng = np.random.default_rng(seed)
+        start = rng.random((len(nodes), 2)) * 2 - 1
+        for node, k in index.items():
+            if node in initial:
+                start[k] = initial[node]
+        start = (start + 1) / 2
+        iterations, temperature = 15, 0.02
+    positions = _rescale(force_layout(len(nodes), edges[:, 0], edges[:, 1], start,
+                                      iterations, temperature, seed))
+    return dict(zip(nodes, positions))
+
+
+def get_layout(graph, method="auto", cache=default_cache):
+    """Cached layout of a graph; a graph with nearly the same nodes and
+    edges as a cached one (same method) starts from its positions"""
+    key = (graph_hash(graph), method)
+    pos = cache.get(key)
+    if pos is None:
+        edges = edge_keys(graph)
+        pos = compute_layout(graph, method, initial=cache.closest(graph.nodes(), edges, method))
+        cache.put(key, pos, edges)
+    return pos
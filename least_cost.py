@@ -1,72 +1,44 @@
-import tkinter as tk
-from tkinter import messagebox
 import numpy as np
-import matplotlib.pyplot as plt
-from display_utils import display_graph_result, display_matrix_result
+from results import TransportationResult
+from transportation import generate_transportation_problem, total_cost, as_costs
+from initial_solutions import least_cost_allocation
 
-def run_least_cost_method(frame, vertices, supply=None, demand=None):
-    try:
-        if supply is None or demand is None:
-            # Generate random supply and demand if not provided
-            supply = np.random.randint(10, 50, size=vertices)
-            demand = np.random.randint(10, 50, size=vertices)
-            # Adjust to make balanced
-            diff = sum(supply) - sum(demand)
-            if diff > 0:
-                demand[-1] += diff
-            elif diff < 0:
-                supply[-1] -= diff
+def solve_least_cost(supply, demand, costs):
+    """Build an allocation with the Least Cost method"""
+    costs = as_costs(costs)
+    solution = least_cost_allocation(supply, demand, costs)
+    return TransportationResult(solution, total_cost(solution, costs))
+
+def display_least_cost(frame, supply, demand, costs, result):
+    from display_utils import display_graph_result, display_matrix_result, subplots
+    from matrix_renderer import draw_matrix
 
-        # Generate random costs
-        costs = np.random.randint(1, 20, size=(len(supply), len(demand)))
-        
-        # Initialize solution matrix
-        solution = np.zeros((len(supply), len(demand)))
-        supply_left = supply.copy()
-        demand_left = demand.copy()
-        
-        # Implement Least Cost method
-        while np.any(supply_left > 0) and np.any(demand_left > 0):
-            # Find cell with minimum cost among remaining cells
-            valid_mask = (supply_left.reshape(-1, 1) > 0) & (demand_left > 0)
-            costs_masked = np.where(valid_mask, costs, np.inf)
-            i, j = np.unravel_index(np.argmin(costs_masked), costs.shape)
-            
-            # Allocate maximum possible quantity to minimum cost cell
-            quantity = min(supply_left[i], demand_left[j])
-            solution[i, j] = quantity
-            supply_left[i] -= quantity
-            demand_left[j] -= quantity
+    solution = result.allocation
 
-        # Calculate total cost
-        total_cost = np.sum(solution * costs)
+    # Create visualization (reusing the result window's figure)
+    fig, ax = subplots(frame, figsize=(8, 6))
 
-        # Create visualization
-        plt.clf()
-        fig, ax = plt.subplots(figsize=(8, 6))
-        
-        # Plot solution matrix
-        im = ax.imshow(solution, cmap='YlOrRd')
-        
-        # Add text annotations
-        for i in range(len(supply)):
-            for j in range(len(demand)):
-                text = ax.text(j, i, f'{solution[i, j]:.0f}\n({costs[i, j]})',
-                             ha='center', va='center')
-        
-        ax.set_title('Least Cost Method Solution\n(Allocation\nCost)')
-        plt.colorbar(im)
+    # Plot solution matrix; cells are annotated only when few enough are in view
+    renderer = draw_matrix(ax, solution, costs, 'Least Cost Method Solution\n(Allocation\nCost)')
+    fig.colorbar(renderer.image)
 
-        # Prepare result text
-        result_text = "Least Cost Method Solution\n\n"
-        result_text += f"Total Cost: {total_cost}\n\n"
-        result_text += "Supply: " + ", ".join(map(str, supply)) + "\n"
-        result_text += "Demand: " + ", ".join(map(str, demand)) + "\n"
+    # Prepare result text
+    result_text = "Least Cost Method Solution\n\n"
+    result_text += f"Total Cost: {result.total_cost}\n\n"
+    result_text += "Supply: " + ", ".join(map(str, supply)) + "\n"
+    result_text += "Demand: " + ", ".join(map(str, demand)) + "\n"
 
-        # Display the result
-        display_matrix_result(frame, solution, supply, demand, result_text)
-        display_graph_result(frame, fig, result_text)
+    # Display the result
+    display_matrix_result(frame, solution, supply, demand, result_text)
+    display_graph_result(frame, fig, result_text)
+
+def run_least_cost_method(frame, vertices, supply=None, demand=None):
+    from tkinter import messagebox
+    try:
+        supply, demand, costs = generate_transportation_problem(vertices, supply, demand)
+        result = solve_least_cost(supply, demand, costs)
+        display_least_cost(frame, supply, demand, costs, result)
 
     except Exception as e:
         messagebox.showerror("Error", f"An error occurred: {str(e)}")
-        print(f"Error in Least Cost method: {str(e)}") 
\ No newline at end of file
+        print(f"Error in Least Cost method: {str(e)}")
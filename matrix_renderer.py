@@ -0,0 +1,206 @@
+import math
+import numpy as np
+from transportation import SparseMatrix
+
+# Level-of-detail heatmap for allocation / cost matrices of any size. Only
+# the visible part of the matrix is drawn, downsampled to at most
+# max_pixels per side, and cell annotations are only created when few
+# enough cells (or non-zero cells) are in view. Hovering shows a tooltip
+# for the cell under the mouse instead. Pan and zoom re-render the view, so
+# drawing cost stays bounded whatever the matrix size.
+
+
+class MatrixRenderer:
+    def __init__(self, ax, values, costs=None, fmt='{:.0f}', cmap='YlOrRd',
+                 annotate_limit=400, max_pixels=400):
+        self.ax = ax
+        self.values = values if isinstance(values, SparseMatrix) else np.asarray(values)
+        self.costs = costs
+        self.fmt = fmt
+        self.annotate_limit = annotate_limit
+        self.max_pixels = max_pixels
+        self.shape = self.values.shape
+        self.texts = []
+        self._hovered = None
+        self._background = None
+
+        m, n = self.shape
+        image, extent = self._image((0, m, 0, n))
+        low, high = self._value_range()
+        self.image = ax.imshow(image, cmap=cmap, extent=extent, vmin=low, vmax=high,
+                               interpolation='nearest')
+        ax.set_xlim(-0.5, n - 0.5)
+        ax.set_ylim(m - 0.5, -0.5)
+        self._annotate((0, m, 0, n))
+
+        self.tooltip = ax.annotate('', xy=(0, 0), xytext=(12, 12), textcoords='offset points',
+                                   bbox=dict(boxstyle='round', fc='lightyellow', alpha=0.9),
+                                   visible=False, zorder=10, animated=True)
+        # Plain functions are held strongly by the callback registries
+        ax.callbacks.connect('xlim_changed', lambda _: self.refresh())
+        ax.callbacks.connect('ylim_changed', lambda _: self.refresh())
+        ax.figure.canvas.mpl_connect('motion_notify_event', lambda event: self._hover(event))
+        ax.figure.canvas.mpl_connect('draw_event', lambda event: self._on_draw(event))
+
+    def _value_range(self):
+        if isinstance(self.values, SparseMatrix):
+            data = self.values.data[np.isfinite(self.values.data)]
+            fill = [self.values.fill] if np.isfinite(self.values.fill) else []
+            data = np.concatenate((data, fill))
+        else:
+            data = self.values[np.isfinite(self.values)]
+        if data.size == 0:
+            return 0, 1
+        return data.min(), data.max()
+
+    def _view(self):
+        """Visible (row_start, row_stop, col_start, col_stop)"""
+        m, n = self.shape
+        x0, x1 = sorted(self.ax.get_xlim())
+        y0, y1 = sorted(self.ax.get_ylim())
+        c0, c1 = max(0, math.floor(x0 + 0.5)), min(n, math.ceil(x1 + 0.5))
+        r0, r1 = max(0, math.floor(y0 + 0.5)), min(m, math.ceil(y1 + 0.5))
+        return r0, max(r0, r1), c0, max(c0, c1)
+
+    def _entries(self, view):
+        """(rows, cols, values) of the stored cells of a sparse matrix inside view"""
+        r0, r1, c0, c1 = view
+        values = self.values
+        start, stop = values.indptr[r0], values.indptr[r1]
+        rows, cols = values.rows[start:stop], values.cols[start:stop]
+        inside = (cols >= c0) & (cols < c1)
+        return rows[inside], cols[inside], values.data[start:stop][inside]
+
+    def _image(self, view):
+        """Max-pooled image of the view, at most max_pixels per side, with its extent"""
+        r0, r1, c0, c1 = view
+        rows, cols = r1 - r0, c1 - c0
+        factor = max(1, math.ceil(max(rows, cols, 1) / self.max_pixels))
+        height, width = max(1, math.ceil(rows / factor)), max(1, math.ceil(cols / factor))
+
+        if isinstance(self.values, SparseMatrix):
+            image = np.full((height, width), -np.inf)
+            r, c, data = self._entries(view)
+            np.maximum.at(image, ((r - r0) // factor, (c - c0) // factor), data)
+            if np.isfinite(self.values.fill):
+                # Cells not stored hold the fill value (0 for allocations)
+                image = np.maximum(image, self.values.fill)
+            image[~np.isfinite(image)] = np.nan
+        else:
+            block = self.values[r0:r1, c0:c1].astype(float)
+            if factor > 1:
+                padded = np.full((height * factor, width * factor), -np.inf)
+                padded[:rows, :cols] = np.where(np.isfinite(block), block, -np.inf)
+                image = padded.reshape(height, factor, width, factor).max(axis=(1, 3))
+                image[~np.isfinite(image)] = np.nan
+            else:
+                image = block if block.size else np.full((1, 1), np.nan)
+
+        extent = (c0 - 0.5, c0 - 0.5 + width * factor, r0 - 0.5 + height * factor, r0 - 0.5)
+        return image, extent
+
+    def _cell_text(self, i, j, value):
+        text = self.fmt.format(value)
+        if self.costs is not None:
+            text += f'\n({self._cost(i, j):g})'
+        return text
+
+    def _cost(self, i, j):
+        return self.costs[i, j]
+
+    def _value(self, i, j):
+        return self.values[i, j]
+
+    def _annotate(self, view):
+        r0, r1, c0, c1 = view
+        if (r1 - r0) * (c1 - c0) <= self.annotate_limit:
+            # Few cells in view: annotate all of them
+            if isinstance(self.values, SparseMatrix):
+                rows, cols = np.mgrid[r0:r1, c0:c1]
+                rows, cols = rows.ravel(), cols.ravel()
+                data = self.values.lookup(rows, cols)
+            else:
+                rows, cols = np.mgrid[r0:r1, c0:c1]
+                rows, cols = rows.ravel(), cols.ravel()
+                data = self.values[rows, cols]
+        else:
+            # Otherwise only the non-zero (basic) cells, if there are few enough
+            if isinstance(self.values, SparseMatrix):
+                rows, cols, data = self._entries(view)
+            else:
+                block = self.values[r0:r1, c0:c1]
+                rows, cols = np.nonzero(block)
+                data = block[rows, cols]
+                rows, cols = rows + r0, cols + c0
+            keep = (data != 0) & np.isfinite(data)
+            rows, cols, data = rows[keep], cols[keep], data[keep]
+            if len(data) > self.annotate_limit:
+                return
+
+        for i, j, value in zip(rows.tolist(), cols.tolist(), data.tolist()):
+            if np.isfinite(value):
+                self.texts.append(self.ax.text(j, i, self._cell_text(i, j, value),
+                                               ha='center', va='center'))
+
+    def refresh(self):
+        """Re-render the visible part of the matrix (called on pan/zoom)"""
+        for text in self.texts:
+            text.remove()
+        self.texts = []
+        self._background = None
+        view = self._view()
+        image, extent = self._image(view)
+        self.image.set_data(image)
+        self.image.set_extent(extent)
+        self._annotate(view)
+
+    def _on_draw(self, event):
+        # The tooltip is animated: keep the figure without it for blitting
+        canvas = event.canvas
+        if getattr(canvas, 'supports_blit', False):
+            self._background = canvas.copy_from_bbox(self.ax.figure.bbox)
+        else:
+            self._background = None
+        if self.tooltip.get_visible():
+            self.ax.draw_artist(self.tooltip)
+
+    def _hover(self, event):
+        if event.inaxes is not self.ax or event.xdata is None:
+            cell = None
+        else:
+            cell = (int(round(event.ydata)), int(round(event.xdata)))
+            m, n = self.shape
+            if not (0 <= cell[0] < m and 0 <= cell[1] < n):
+                cell = None
+        if cell == self._hovered:
+            return
+        self._hovered = cell
+
+        if cell is None:
+            self.tooltip.set_visible(False)
+        else:
+            i, j = cell
+            text = f'Cell ({i}, {j})\nValue: {self.fmt.format(self._value(i, j))}'
+            if self.costs is not None:
+                text += f'\nCost: {self._cost(i, j):g}'
+            self.tooltip.xy = (j, i)
+            self.tooltip.set_text(text)
+            self.tooltip.set_visible(True)
+
+        # Only the tooltip changed: blit it over the saved background
+        canvas = self.ax.figure.canvas
+        if self._background is None:
+            canvas.draw_idle()
+            return
+        canvas.restore_region(self._background)
+        if cell is not None:
+            self.ax.draw_artist(self.tooltip)
+        canvas.blit(self.ax.figure.bbox)
+
+
+def draw_matrix(ax, values, costs=None, title=None, **options):
+    """Draw a matrix heatmap on ax; keep the returned renderer's image for a colorbar"""
+    renderer = MatrixRenderer(ax, values, costs, **options)
+    if title:
+        ax.set_title(title)
+    return renderer
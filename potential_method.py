@@ -1,161 +1,188 @@
-import tkinter as tk
-from tkinter import messagebox
 import numpy as np
-import matplotlib.pyplot as plt
-from display_utils import display_graph_result, display_matrix_result
+from results import TransportationResult
+from transportation import generate_transportation_problem, total_cost, TransportationBasis, SparseMatrix, as_costs
+from initial_solutions import initial_allocation, repair_allocation
 
-def run_potential_method(frame, vertices, supply=None, demand=None):
+def calculate_potentials(solution, costs):
+    """Calculate row (u) and column (v) potentials"""
+    costs = as_costs(costs)
+    allowed = costs if isinstance(costs, SparseMatrix) else None
+    basis = TransportationBasis.from_allocation(solution, allowed)
+    return basis.potentials(costs)
+
+def calculate_reduced_costs(u, v, costs):
+    """Calculate reduced costs for non-basic variables (only on allowed routes if sparse)"""
+    if isinstance(costs, SparseMatrix):
+        return costs.with_data(costs.data - (u[costs.rows] + v[costs.cols]))
+    return costs - (u.reshape(-1, 1) + v)
+
+def update_potentials(basis, u, v, costs, moved):
+    """Shift the potentials of a subtree re-hung by a pivot"""
+    m = basis.m
+    moved = np.asarray(moved)
+    rows, cols = moved[moved < m], moved[moved >= m] - m
+    inner = int(moved[0])
+    outer = basis.parent[inner]
+    if inner < m:
+        shift = costs[inner, outer - m] - v[outer - m] - u[inner]
+    else:
+        shift = -(costs[outer, inner - m] - u[outer] - v[inner - m])
+    u[rows] += shift
+    v[cols] -= shift
+
+def optimize_basis(basis, costs, max_iterations=None, tolerance=1e-10, block_size=None):
+    """Pivot a basis to optimality with the MODI method; return (u, v, iterations).
+
+    Reduced costs are priced one block at a time (rows of a dense matrix,
+    stored routes of a SparseMatrix): the first block with a negative reduced
+    cost supplies the entering cell, and the basis is optimal once a full
+    sweep over all blocks finds none.
+    """
+    costs = as_costs(costs)
+    m, n = costs.shape
+    if isinstance(costs, SparseMatrix):
+        # Only the allowed routes are ever priced
+        lane_rows, lane_cols, lane_costs = costs.rows, costs.cols, costs.data
+        size = block_size or 10000
+        blocks = [(start, min(start + size, costs.nnz)) for start in range(0, costs.nnz, size)]
+
+        def price(start, stop):
+            reduced_costs = lane_costs[start:stop] - (u[lane_rows[start:stop]] + v[lane_cols[start:stop]])
+            k = int(np.argmin(reduced_costs))
+            return reduced_costs[k], int(lane_rows[start + k]), int(lane_cols[start + k])
+    else:
+        size = block_size or max(1, min(m, 50000 // max(n, 1)))
+        blocks = [(start, min(start + size, m)) for start in range(0, m, size)]
+
+        def price(start, stop):
+            reduced_costs = calculate_reduced_costs(u[start:stop], v, costs[start:stop])
+            i, j = divmod(int(np.argmin(reduced_costs)), n)
+            return reduced_costs[i, j], start + i, j
+
+    # Potentials from one traversal of the basis tree
+    u, v = basis.potentials(costs)
+    iteration = 0
+    block = 0
+    clean_blocks = 0
+
+    while clean_blocks < len(blocks):
+        if max_iterations is not None and iteration >= max_iterations:
+            break
+
+        reduced_cost, i, j = price(*blocks[block])
+        if reduced_cost >= -tolerance:
+            clean_blocks += 1
+            block = (block + 1) % len(blocks)
+            continue
+        clean_blocks = 0
+
+        # Move flow around the closed loop through the basis tree
+        _, _, moved = basis.pivot(i, j)
+        update_potentials(basis, u, v, costs, moved)
+        iteration += 1
+
+    return u, v, iteration
+
+def warm_start_basis(previous, supply, demand, costs):
+    """Starting basis for new amounts and costs from a previous result.
+
+    The previous basic cells (still allowed ones) are re-spanned and their
+    flows recomputed for the new supply and demand. While those stay
+    non-negative the basis is used as it is, so only cost changes need
+    pivots; otherwise the flows are repaired into a feasible allocation
+    near the old one (see ``repair_allocation``).
+    """
+    costs = as_costs(costs)
+    sparse = isinstance(costs, SparseMatrix)
+    m, n = costs.shape
+    if previous.basis is not None:
+        cells = np.asarray(previous.basis, dtype=np.int64).reshape(-1, 2)
+    elif isinstance(previous.allocation, SparseMatrix):
+        positive = previous.allocation.data > 0
+        cells = np.column_stack((previous.allocation.rows[positive], previous.allocation.cols[positive]))
+    else:
+        cells = np.argwhere(np.asarray(previous.allocation) > 0)
+    keep = (cells[:, 0] < m) & (cells[:, 1] < n)
+    cells = cells[keep]
+    if sparse:
+        cells = cells[np.isfinite(costs.lookup(cells[:, 0], cells[:, 1]))]
+
+    allowed = costs if sparse else None
+    basis = TransportationBasis.from_cells(m, n, map(tuple, cells.tolist()), allowed)
+    basis.tree_flows(supply, demand)
+    rows = np.zeros(m)
+    cols = np.zeros(n)
+    for (i, j), flow in basis.flows.items():
+        rows[i] += flow
+        cols[j] += flow
+    if (min(basis.flows.values(), default=0) >= 0 and np.allclose(rows, supply)
+            and np.allclose(cols, demand)):
+        return basis
+    solution = repair_allocation(basis.flows, supply, demand, costs)
+    return TransportationBasis.from_allocation(solution, allowed)
+
+def solve_potential_method(supply, demand, costs, max_iterations=None, initial="vogel",
+                           warm_start=None):
+    """Optimize an initial allocation (Vogel's by default) with the potential (MODI) method.
+
+    With ``warm_start``, a previous TransportationResult for the same
+    network, pivoting starts from its basis instead (see warm_start_basis).
+    """
+    costs = as_costs(costs)
+    sparse = isinstance(costs, SparseMatrix)
+
+    if warm_start is not None:
+        basis = warm_start_basis(warm_start, supply, demand, costs)
+    else:
+        # Vogel's approximation starts much closer to optimal than North-West Corner
+        solution = initial_allocation(initial, supply, demand, costs)
+        basis = TransportationBasis.from_allocation(solution, costs if sparse else None)
+
+    u, v, iteration = optimize_basis(basis, costs, max_iterations)
+
+    solution = basis.allocation(sparse)
+    return TransportationResult(solution, total_cost(solution, costs), iteration, u, v,
+                                basis=np.array(list(basis.flows), dtype=np.int64).reshape(-1, 2))
+
+def display_potential_method(frame, supply, demand, costs, result):
+    from display_utils import display_graph_result, display_matrix_result, subplots
+    from matrix_renderer import draw_matrix
+
+    solution = result.allocation
+
+    # Create visualization (reusing the result window's figure)
+    fig, (ax1, ax2) = subplots(frame, 1, 2, figsize=(15, 6))
+
+    # Plot solution matrix with allocation and cost annotations
+    allocation = draw_matrix(ax1, solution, costs, 'Allocation Matrix')
+    fig.colorbar(allocation.image, ax=ax1)
+
+    # Plot reduced costs
+    reduced_costs = calculate_reduced_costs(result.u, result.v, costs)
+    reduced = draw_matrix(ax2, reduced_costs, title='Reduced Costs Matrix', fmt='{:.2f}', cmap='RdYlBu')
+    fig.colorbar(reduced.image, ax=ax2)
+
+    # Prepare result text
+    result_text = "Potential Method (Méthode du Potentiel) Solution\n\n"
+    result_text += f"Total Cost: {result.total_cost}\n"
+    result_text += f"Iterations: {result.iterations}\n\n"
+    result_text += "Supply: " + ", ".join(map(str, supply)) + "\n"
+    result_text += "Demand: " + ", ".join(map(str, demand)) + "\n\n"
+    result_text += "Row Potentials (u): " + ", ".join(f"{x:.2f}" for x in result.u) + "\n"
+    result_text += "Column Potentials (v): " + ", ".join(f"{x:.2f}" for x in result.v) + "\n"
+
+    # Display the result
+    display_matrix_result(frame, solution, supply, demand, result_text)
+    display_graph_result(frame, fig, result_text)
+
+def run_potential_method(frame, vertices, supply=None, demand=None, warm_start=None):
+    from tkinter import messagebox
     try:
-        if supply is None or demand is None:
-            # Generate random supply and demand if not provided
-            supply = np.random.randint(10, 50, size=vertices)
-            demand = np.random.randint(10, 50, size=vertices)
-            # Adjust to make balanced
-            diff = sum(supply) - sum(demand)
-            if diff > 0:
-                demand[-1] += diff
-            elif diff < 0:
-                supply[-1] -= diff
-
-        # Generate random costs
-        costs = np.random.randint(1, 20, size=(len(supply), len(demand)))
-        
-        def get_initial_solution():
-            """Get initial feasible solution using North-West Corner method"""
-            solution = np.zeros((len(supply), len(demand)))
-            supply_left = supply.copy()
-            demand_left = demand.copy()
-            i, j = 0, 0
-            
-            while i < len(supply) and j < len(demand):
-                quantity = min(supply_left[i], demand_left[j])
-                solution[i, j] = quantity
-                supply_left[i] -= quantity
-                demand_left[j] -= quantity
-                
-                if supply_left[i] == 0:
-                    i += 1
-                if demand_left[j] == 0:
-                    j += 1
-                    
-            return solution
-
-        def calculate_potentials(solution, costs):
-            """Calculate row (u) and column (v) potentials"""
-            m, n = solution.shape
-            u = np.zeros(m)  # Row potentials
-            v = np.zeros(n)  # Column potentials
-            
-            # Create mask for basic variables (cells with allocation)
-            basic_mask = solution > 0
-            
-            # Set u[0] = 0 as reference
-            assigned = np.zeros(m + n)
-            assigned[0] = 1
-            
-            # Iteratively find potentials
-            while not np.all(assigned):
-                for i in range(m):
-                    for j in range(n):
-                        if basic_mask[i, j]:
-                            if assigned[i] and not assigned[m + j]:
-                                v[j] = costs[i, j] - u[i]
-                                assigned[m + j] = 1
-                            elif not assigned[i] and assigned[m + j]:
-                                u[i] = costs[i, j] - v[j]
-                                assigned[i] = 1
-                                
-            return u, v
-
-        def calculate_reduced_costs(u, v, costs):
-            """Calculate reduced costs for non-basic variables"""
-            return costs - (u.reshape(-1, 1) + v)
-
-        # Get initial solution
-        solution = get_initial_solution()
-        iteration = 0
-        max_iterations = 100
-        improvement_found = True
-        
-        while improvement_found and iteration < max_iterations:
-            # Calculate potentials
-            u, v = calculate_potentials(solution, costs)
-            
-            # Calculate reduced costs
-            reduced_costs = calculate_reduced_costs(u, v, costs)
-            
-            # Find entering variable (most negative reduced cost)
-            non_basic_mask = solution == 0
-            min_reduced_cost = np.inf
-            entering_cell = None
-            
-            for i in range(len(supply)):
-                for j in range(len(demand)):
-                    if non_basic_mask[i, j] and reduced_costs[i, j] < min_reduced_cost:
-                        min_reduced_cost = reduced_costs[i, j]
-                        entering_cell = (i, j)
-            
-            # If no negative reduced costs, solution is optimal
-            if min_reduced_cost >= -1e-10:  # Using small threshold for numerical stability
-                improvement_found = False
-                continue
-            
-            # Find feasible allocation for entering variable
-            i, j = entering_cell
-            max_allocation = min(supply[i] - np.sum(solution[i, :]),
-                               demand[j] - np.sum(solution[:, j]))
-            
-            if max_allocation > 0:
-                solution[i, j] = max_allocation
-            
-            iteration += 1
-
-        # Calculate total cost
-        total_cost = np.sum(solution * costs)
-        
-        # Calculate final potentials for display
-        final_u, final_v = calculate_potentials(solution, costs)
-        
-        # Create visualization
-        plt.clf()
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
-        
-        # Plot solution matrix
-        im1 = ax1.imshow(solution, cmap='YlOrRd')
-        ax1.set_title('Allocation Matrix')
-        plt.colorbar(im1, ax=ax1)
-        
-        # Add allocation and cost annotations
-        for i in range(len(supply)):
-            for j in range(len(demand)):
-                text = ax1.text(j, i, f'{solution[i, j]:.0f}\n({costs[i, j]})',
-                              ha='center', va='center')
-        
-        # Plot reduced costs
-        reduced_costs = calculate_reduced_costs(final_u, final_v, costs)
-        im2 = ax2.imshow(reduced_costs, cmap='RdYlBu')
-        ax2.set_title('Reduced Costs Matrix')
-        plt.colorbar(im2, ax=ax2)
-        
-        # Add reduced costs annotations
-        for i in range(len(supply)):
-            for j in range(len(demand)):
-                text = ax2.text(j, i, f'{reduced_costs[i, j]:.2f}',
-                              ha='center', va='center')
-
-        # Prepare result text
-        result_text = "Potential Method (Méthode du Potentiel) Solution\n\n"
-        result_text += f"Total Cost: {total_cost}\n"
-        result_text += f"Iterations: {iteration}\n\n"
-        result_text += "Supply: " + ", ".join(map(str, supply)) + "\n"
-        result_text += "Demand: " + ", ".join(map(str, demand)) + "\n\n"
-        result_text += "Row Potentials (u): " + ", ".join(f"{x:.2f}" for x in final_u) + "\n"
-        result_text += "Column Potentials (v): " + ", ".join(f"{x:.2f}" for x in final_v) + "\n"
-
-        # Display the result
-        display_matrix_result(frame, solution, supply, demand, result_text)
-        display_graph_result(frame, fig, result_text)
+        supply, demand, costs = generate_transportation_problem(vertices, supply, demand)
+        result = solve_potential_method(supply, demand, costs, warm_start=warm_start)
+        display_potential_method(frame, supply, demand, costs, result)
+        return result
 
     except Exception as e:
         messagebox.showerror("Error", f"An error occurred: {str(e)}")
-        print(f"Error in Potential Method: {str(e)}") 
\ No newline at end of file
+        print(f"Error in Potential Method: {str(e)}")
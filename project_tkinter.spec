@@ -1,12 +1,21 @@
 # -*- mode: python ; coding: utf-8 -*-
 
+# Only GUI.py is an entry script; the algorithm modules are imported lazily
+# through the algorithms registry, so they are listed as hidden imports.
+algorithm_modules = [
+    'algorithms', 'background', 'results', 'transportation', 'graph_generator',
+    'initial_solutions', 'display_utils', 'layout', 'matrix_renderer', 'csr_graph', 'all_pairs',
+    'graph_io', 'transportation_io', 'batch', 'cli',
+    'bellman_ford', 'dijkstra', 'kruskal', 'ford_fulkerson', 'welsh_powell',
+    'north_west_corner', 'least_cost', 'stepping_stone', 'potential_method',
+]
 
 a = Analysis(
-    ['GUI.py', 'bellman_ford.py', 'dijkstra.py', 'kruskal.py', 'least_cost.py', 'north_west_corner.py', 'potential_method.py', 'stepping_stone.py', 'welsh_powell.py', 'display_utils.py', 'tempCodeRunnerFile.py'],
+    ['GUI.py'],
     pathex=[],
     binaries=[],
     datas=[('img/*', 'img')],
-    hiddenimports=[],
+    hiddenimports=algorithm_modules,
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -16,19 +25,18 @@ a = Analysis(
 )
 pyz = PYZ(a.pure)
 
+# One-folder build: a one-file executable unpacks everything to a temporary
+# directory on every launch, which dominates startup time.
 exe = EXE(
     pyz,
     a.scripts,
-    a.binaries,
-    a.datas,
     [],
+    exclude_binaries=True,
     name='project_tkinter',
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
+    upx=False,
     console=True,
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -36,3 +44,12 @@ exe = EXE(
     codesign_identity=None,
     entitlements_file=None,
 )
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='project_tkinter',
+)
@@ -0,0 +1,112 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+# Result types returned by the headless solvers. None of them depend on
+# tkinter or matplotlib so they can be produced in batch jobs and only
+# rendered by the run_* adapters when a GUI is present.
+
+
+@dataclass
+class ShortestPathResult:
+    source: int                    # or a list of vertices for multi-source searches
+    distances: np.ndarray          # float array, inf for unreachable vertices
+    predecessors: np.ndarray       # int array, -1 for the source / unreachable
+    has_negative_cycle: bool = False
+    iterations: int = 0
+
+    def path_to(self, target: int) -> List[int]:
+        """Return the vertex sequence from the source to target (empty if unreachable)"""
+        if not np.isfinite(self.distances[target]):
+            return []
+        path = []
+        current = target
+        while current != -1:
+            path.append(int(current))
+            current = self.predecessors[current]
+        path.reverse()
+        return path
+
+    def tree_edges(self) -> List[Tuple[int, int]]:
+        """Return the (predecessor, vertex) edges of the shortest-path tree"""
+        vertices = np.flatnonzero(self.predecessors >= 0)
+        return [(int(self.predecessors[v]), int(v)) for v in vertices]
+
+
+def trace_path(predecessors, source, target):
+    """Vertex sequence from source to target along a predecessor array.
+
+    A simple path has at most one step per vertex, so a walk that does not
+    reach the source within that many steps (predecessors left cycling by
+    a negative cycle) raises ValueError instead of running forever.
+    """
+    path = [int(target)]
+    while path[-1] != source:
+        previous = int(predecessors[path[-1]])
+        if previous < 0 or len(path) >= len(predecessors):
+            raise ValueError(f"No shortest path from {source} to {target}: "
+                             f"the graph has a negative cycle")
+        path.append(previous)
+    path.reverse()
+    return path
+
+
+@dataclass
+class AllPairsResult:
+    distances: np.ndarray          # (V, V) float array, inf for unreachable pairs
+    predecessors: np.ndarray       # row s: predecessors on the paths from s, -1 for none
+    has_negative_cycle: bool = False
+    method: str = ""
+    iterations: int = 0
+
+    def path(self, source: int, target: int) -> List[int]:
+        """Return the vertex sequence from source to target (empty if unreachable)"""
+        if not np.isfinite(self.distances[source, target]):
+            return []
+        return trace_path(self.predecessors[source], source, target)
+
+
+@dataclass
+class MSTResult:
+    edges: List[Tuple[int, int, float]]
+    total_weight: float
+    iterations: int = 0
+
+
+@dataclass
+class FlowResult:
+    source: int
+    sink: int
+    flow_value: float
+    flow_dict: Dict[int, Dict[int, float]]
+    iterations: int = 0
+    edge_flows: Optional[np.ndarray] = None   # flow per input edge, in edge order
+    source_side: Optional[np.ndarray] = None  # bool per vertex: source side of a minimum cut
+
+    def cut_edges(self) -> List[Tuple[int, int]]:
+        """Edges from the source side to the sink side of the minimum cut"""
+        if self.source_side is None:
+            return []
+        return [(u, v) for u, targets in self.flow_dict.items() if self.source_side[u]
+                for v in targets if not self.source_side[v]]
+
+
+@dataclass
+class ColoringResult:
+    colors: np.ndarray             # color index per vertex
+    num_colors: int
+    iterations: int = 0
+
+    @property
+    def coloring(self) -> Dict[int, int]:
+        return {v: int(c) for v, c in enumerate(self.colors)}
+
+
+@dataclass
+class TransportationResult:
+    allocation: np.ndarray
+    total_cost: float
+    iterations: int = 0
+    u: Optional[np.ndarray] = None  # row potentials
+    v: Optional[np.ndarray] = None  # column potentials
+    basis: Optional[np.ndarray] = None  # (k, 2) basic cells, to warm-start a later solve
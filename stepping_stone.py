@@ -1,107 +1,113 @@
-import tkinter as tk
-from tkinter import messagebox
 import numpy as np
-import matplotlib.pyplot as plt
-from display_utils import display_graph_result, display_matrix_result
+from results import TransportationResult
+from transportation import generate_transportation_problem, total_cost, TransportationBasis, SparseMatrix, as_costs
+from initial_solutions import initial_allocation
+
+def loop_cost(basis, costs, i, j):
+    """Cost change per unit moved around the stepping-stone loop of empty cell (i, j)"""
+    loop = basis.cycle(i, j)
+    return sum(costs[c] if k % 2 == 0 else -costs[c] for k, c in enumerate(loop))
+
+def _cells(costs):
+    """Candidate cells in evaluation order: every cell, or only the allowed routes"""
+    if isinstance(costs, SparseMatrix):
+        return zip(costs.rows.tolist(), costs.cols.tolist())
+    m, n = costs.shape
+    return ((i, j) for i in range(m) for j in range(n))
+
+def evaluate_empty_cells(basis, costs):
+    """Loop cost of every empty cell, searching each loop through the basis.
+
+    Returns a matrix for dense costs and one value per allowed route for
+    sparse ones; basic cells evaluate to 0.
+    """
+    evaluations = []
+    for i, j in _cells(costs):
+        if (i, j) in basis.flows:
+            evaluations.append(0.0)
+        else:
+            evaluations.append(loop_cost(basis, costs, i, j))
+    return np.array(evaluations).reshape(-1 if isinstance(costs, SparseMatrix) else costs.shape)
+
+def evaluate_empty_cells_batched(basis, costs):
+    """Loop cost of every cell in one pass.
+
+    The signed cost sum along the basis path from row i to column j is the
+    same for every cell of row i / column j up to the common root, so the
+    loop costs are c[i, j] minus one row term and one column term, both
+    accumulated by a single traversal of the basis tree.
+    """
+    u, v = basis.potentials(costs)
+    if isinstance(costs, SparseMatrix):
+        return costs.data - (u[costs.rows] + v[costs.cols])
+    return costs - (u.reshape(-1, 1) + v)
+
+def solve_stepping_stone(supply, demand, costs, max_iterations=None, batched=None, tolerance=1e-10,
+                         initial="least_cost"):
+    """Improve an initial allocation (Least Cost by default) with the Stepping Stone method"""
+    costs = as_costs(costs)
+    sparse = isinstance(costs, SparseMatrix)
+    if batched is None:
+        # Explicit loop search is O(cells*(m+n)) per iteration
+        batched = (costs.nnz if sparse else costs.size) > 400
+    evaluate = evaluate_empty_cells_batched if batched else evaluate_empty_cells
+
+    # Get initial solution (Least Cost method by default)
+    solution = initial_allocation(initial, supply, demand, costs)
+    basis = TransportationBasis.from_allocation(solution, costs if sparse else None)
+    cost = total_cost(basis.allocation(sparse), costs)
+
+    # Implement Stepping Stone method
+    iteration = 0
+    while max_iterations is None or iteration < max_iterations:
+        evaluations = evaluate(basis, costs)
+        entering = np.argmin(evaluations)
+        delta = evaluations.flat[entering]
+        if delta >= -tolerance:
+            break
+
+        # Move as much as the loop allows; row and column totals are unchanged
+        if sparse:
+            i, j = costs.rows[entering], costs.cols[entering]
+        else:
+            i, j = np.unravel_index(entering, costs.shape)
+        theta, _, _ = basis.pivot(int(i), int(j))
+        cost += theta * delta
+        iteration += 1
+
+    return TransportationResult(basis.allocation(sparse), cost, iteration)
+
+def display_stepping_stone(frame, supply, demand, costs, result):
+    from display_utils import display_graph_result, display_matrix_result, subplots
+    from matrix_renderer import draw_matrix
+
+    solution = result.allocation
+
+    # Create visualization (reusing the result window's figure)
+    fig, ax = subplots(frame, figsize=(8, 6))
+
+    # Plot solution matrix; cells are annotated only when few enough are in view
+    renderer = draw_matrix(ax, solution, costs, 'Stepping Stone Method Solution\n(Allocation\nCost)')
+    fig.colorbar(renderer.image)
+
+    # Prepare result text
+    result_text = "Stepping Stone Method Solution\n\n"
+    result_text += f"Total Cost: {result.total_cost}\n"
+    result_text += f"Iterations: {result.iterations}\n\n"
+    result_text += "Supply: " + ", ".join(map(str, supply)) + "\n"
+    result_text += "Demand: " + ", ".join(map(str, demand)) + "\n"
+
+    # Display the result
+    display_matrix_result(frame, solution, supply, demand, result_text)
+    display_graph_result(frame, fig, result_text)
 
 def run_stepping_stone_method(frame, vertices, supply=None, demand=None):
+    from tkinter import messagebox
     try:
-        if supply is None or demand is None:
-            # Generate random supply and demand if not provided
-            supply = np.random.randint(10, 50, size=vertices)
-            demand = np.random.randint(10, 50, size=vertices)
-            # Adjust to make balanced
-            diff = sum(supply) - sum(demand)
-            if diff > 0:
-                demand[-1] += diff
-            elif diff < 0:
-                supply[-1] -= diff
-
-        # Generate random costs
-        costs = np.random.randint(1, 20, size=(len(supply), len(demand)))
-        
-        # Get initial solution using Least Cost method
-        solution = np.zeros((len(supply), len(demand)))
-        supply_left = supply.copy()
-        demand_left = demand.copy()
-        
-        # Initialize with Least Cost method
-        while np.any(supply_left > 0) and np.any(demand_left > 0):
-            valid_mask = (supply_left.reshape(-1, 1) > 0) & (demand_left > 0)
-            costs_masked = np.where(valid_mask, costs, np.inf)
-            i, j = np.unravel_index(np.argmin(costs_masked), costs.shape)
-            quantity = min(supply_left[i], demand_left[j])
-            solution[i, j] = quantity
-            supply_left[i] -= quantity
-            demand_left[j] -= quantity
-
-        # Implement Stepping Stone method
-        max_iterations = 100
-        iteration = 0
-        improvement_found = True
-
-        while improvement_found and iteration < max_iterations:
-            improvement_found = False
-            best_improvement = 0
-            best_move = None
-
-            # Find empty cells
-            empty_cells = np.where(solution == 0)
-            
-            # Evaluate each empty cell
-            for k in range(len(empty_cells[0])):
-                i, j = empty_cells[0][k], empty_cells[1][k]
-                
-                # Simple evaluation of cost improvement
-                row_allocated = np.sum(solution[i, :])
-                col_allocated = np.sum(solution[:, j])
-                
-                if row_allocated < supply[i] and col_allocated < demand[j]:
-                    potential_improvement = costs[i, j]
-                    if potential_improvement < best_improvement:
-                        best_improvement = potential_improvement
-                        best_move = (i, j)
-
-            # Apply the best move if found
-            if best_move is not None:
-                i, j = best_move
-                max_quantity = min(supply[i] - np.sum(solution[i, :]),
-                                 demand[j] - np.sum(solution[:, j]))
-                solution[i, j] = max_quantity
-                improvement_found = True
-
-            iteration += 1
-
-        # Calculate total cost
-        total_cost = np.sum(solution * costs)
-
-        # Create visualization
-        plt.clf()
-        fig, ax = plt.subplots(figsize=(8, 6))
-        
-        # Plot solution matrix
-        im = ax.imshow(solution, cmap='YlOrRd')
-        
-        # Add text annotations
-        for i in range(len(supply)):
-            for j in range(len(demand)):
-                text = ax.text(j, i, f'{solution[i, j]:.0f}\n({costs[i, j]})',
-                             ha='center', va='center')
-        
-        ax.set_title('Stepping Stone Method Solution\n(Allocation\nCost)')
-        plt.colorbar(im)
-
-        # Prepare result text
-        result_text = "Stepping Stone Method Solution\n\n"
-        result_text += f"Total Cost: {total_cost}\n"
-        result_text += f"Iterations: {iteration}\n\n"
-        result_text += "Supply: " + ", ".join(map(str, supply)) + "\n"
-        result_text += "Demand: " + ", ".join(map(str, demand)) + "\n"
-
-        # Display the result
-        display_matrix_result(frame, solution, supply, demand, result_text)
-        display_graph_result(frame, fig, result_text)
+        supply, demand, costs = generate_transportation_problem(vertices, supply, demand)
+        result = solve_stepping_stone(supply, demand, costs)
+        display_stepping_stone(frame, supply, demand, costs, result)
 
     except Exception as e:
         messagebox.showerror("Error", f"An error occurred: {str(e)}")
-        print(f"Error in Stepping Stone method: {str(e)}") 
\ No newline at end of file
+        print(f"Error in Stepping Stone method: {str(e)}")
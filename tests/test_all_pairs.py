@@ -0,0 +1,87 @@
+import os
+
+import networkx as nx
+import numpy as np
+import pytest
+
+import all_pairs
+from algorithms import generate_instance, solve_instance
+from all_pairs import compute_all_pairs, evict_cache
+from batch import run_task
+from benchmark import check_all_pairs
+from cli import parse_task, result_fields
+from results import AllPairsResult
+
+
+def _graph(seed):
+    graph = nx.gnp_random_graph(30, 0.2, seed=seed, directed=True)
+    for u, v in graph.edges():
+        graph[u][v]['weight'] = (u * 7 + v) % 5 + 1
+    return graph
+
+
+def test_temporary_store_is_removed(monkeypatch, tmp_path):
+    monkeypatch.setattr(all_pairs, 'CACHE_DIR', str(tmp_path / 'cache'))
+    graph = _graph(0)
+    store = compute_all_pairs(graph)
+    expected = nx.single_source_dijkstra_path_length(graph, 0)
+    assert all(np.isclose(store.distance(0, v), d) for v, d in expected.items())
+    directory = store.directory
+    assert os.path.exists(directory)
+    store.close()
+    assert not os.path.exists(directory)
+    assert not os.path.exists(tmp_path / 'cache')
+
+
+def test_cache_evicts_least_recently_used(monkeypatch, tmp_path):
+    cache_dir = tmp_path / 'cache'
+    monkeypatch.setattr(all_pairs, 'CACHE_DIR', str(cache_dir))
+    first = compute_all_pairs(_graph(1), cache=True)
+    second = compute_all_pairs(_graph(2), cache=True)
+    size = sum(f.stat().st_size for f in os.scandir(first.directory))
+    os.utime(os.path.join(first.directory, 'meta.json'), (0, 0))
+    os.utime(os.path.join(second.directory, 'meta.json'), (1, 1))
+
+    # A cache hit makes the first store the most recently used one
+    assert compute_all_pairs(_graph(1), cache=True).directory == first.directory
+    third = compute_all_pairs(_graph(3), cache=True, cache_limit=int(2.5 * size))
+    assert os.path.exists(first.directory)
+    assert not os.path.exists(second.directory)
+    assert os.path.exists(third.directory)
+
+    evict_cache(str(cache_dir), limit=0, keep=third.directory)
+    assert os.listdir(cache_dir) == [os.path.basename(third.directory)]
+
+
+def test_path_stops_on_cycling_predecessors():
+    # Predecessors left cycling 1 -> 2 -> 1 by a negative cycle
+    result = AllPairsResult(np.zeros((3, 3)), np.array([[-1, 2, 1]] * 3), True)
+    with pytest.raises(ValueError, match="negative cycle"):
+        result.path(0, 1)
+
+
+def test_store_path_stops_on_negative_cycle():
+    graph = nx.DiGraph()
+    graph.add_weighted_edges_from([(0, 1, 1), (1, 2, -3), (2, 1, 1), (2, 3, 1)])
+    store = compute_all_pairs(graph, method="floyd_warshall")
+    assert store.has_negative_cycle
+    with pytest.raises(ValueError):
+        store.path(0, 3)
+    store.close()
+
+
+def test_registry_all_pairs_matches_networkx():
+    params = {'vertices': 25, 'seed': 3}
+    instance = generate_instance("All-Pairs", params)
+    result = solve_instance("All-Pairs", instance, params)
+    check_all_pairs(*instance, result)
+
+
+def test_all_pairs_from_the_command_line():
+    task = parse_task({"algorithm": "all_pairs", "edges": [[0, 1, 2], [1, 2, 3], [0, 2, 9]],
+                       "method": "dijkstra"})
+    fields = result_fields(run_task(task.name, task.params, task.instance))
+    assert fields['method'] == "dijkstra"
+    assert fields['distances'][0] == [0, 2, 5]
+    # Edges are directed for all-pairs: nothing leads back to 0
+    assert fields['distances'][2][0] is None
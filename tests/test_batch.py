@@ -0,0 +1,69 @@
+from itertools import count, islice
+
+from batch import BatchExecutor, BatchTask, run_batch, run_task
+from graph_generator import generate_random_graph
+from transportation import generate_transportation_problem
+
+
+def _tasks():
+    supply, demand, costs = generate_transportation_problem(120, seed=1)
+    edges = generate_random_graph(300, 0.1, seed=2)      # arrays large enough to be shared
+    return [BatchTask("Potential Method", {}, (supply, demand, costs.astype(float))),
+            BatchTask("Dijkstra", {'source': 3}, edges),
+            BatchTask("Kruskal", {}, edges),
+            BatchTask("Welsh-Powell", {'vertices': 30, 'seed': 4}),
+            BatchTask("Ford-Fulkerson", {'vertices': 20, 'seed': 5})]
+
+
+def _summary(result):
+    for name in ('total_cost', 'total_weight', 'flow_value', 'num_colors'):
+        if hasattr(result, name):
+            return getattr(result, name)
+    return result.distances.tolist()
+
+
+def test_pool_results_match_inline_runs():
+    tasks = _tasks()
+    results = run_batch(tasks, max_workers=2, chunk_size=2)
+    assert [r.index for r in results] == list(range(len(tasks)))
+    assert all(r.ok for r in results), [r.error for r in results]
+    for task, result in zip(tasks, results):
+        assert _summary(result.result) == _summary(run_task(task.name, task.params, task.instance))
+
+
+def test_inline_executor_matches_the_pool():
+    tasks = _tasks()
+    with BatchExecutor(max_workers=0) as executor:
+        inline = executor.run(tasks)
+    pooled = run_batch(tasks, max_workers=2)
+    assert [_summary(r.result) for r in inline] == [_summary(r.result) for r in pooled]
+
+
+def test_unordered_map_yields_every_task_once():
+    tasks = [("Kruskal", {'vertices': 10 + i, 'seed': i}) for i in range(8)]
+    with BatchExecutor(max_workers=2, chunk_size=1) as executor:
+        indices = [r.index for r in executor.map(tasks, ordered=False)]
+    assert sorted(indices) == list(range(8))
+
+
+def test_failures_are_reported_per_task():
+    tasks = [("Dijkstra", {'vertices': 5, 'source': 99}), ("Kruskal", {'vertices': 5, 'seed': 0})]
+    first, second = run_batch(tasks, max_workers=1)
+    assert first.status == "error" and first.error
+    assert second.ok
+
+
+def test_timeout_stops_only_the_slow_task():
+    tasks = [("All-Pairs", {'vertices': 2000, 'method': 'floyd_warshall', 'seed': 0}),
+             ("Kruskal", {'vertices': 10, 'seed': 0})]
+    slow, fast = run_batch(tasks, max_workers=1, chunk_size=2, timeout=0.5)
+    assert slow.status == "timeout"
+    assert fast.ok
+
+
+def test_endless_task_stream_can_be_stopped():
+    tasks = (BatchTask("Kruskal", {'vertices': 8, 'seed': i}) for i in count())
+    with BatchExecutor(max_workers=2) as executor:
+        first = list(islice(executor.map(tasks), 5))
+        assert [r.index for r in first] == list(range(5))
+    assert executor.workers == []
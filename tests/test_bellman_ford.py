@@ -0,0 +1,61 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from bellman_ford import Graph, generate_bellman_ford_graph, solve_bellman_ford
+
+
+def _with_negative_edges(seed):
+    g = generate_bellman_ford_graph(30, seed=seed)
+    rng = np.random.default_rng(seed)
+    # Negative edges that go "forward" cannot close a cycle with each other
+    us = np.array([u for u in rng.permutation(29) if not g.graph.has_edge(u, u + 1)][:10])
+    g.add_edges_from_arrays(us, us + 1, -rng.integers(1, 5, size=len(us)).astype(float))
+    return g
+
+
+@pytest.mark.parametrize("method", ["vectorized", "queue", "auto"])
+def test_engines_match_networkx(method):
+    g = generate_bellman_ford_graph(40, seed=1)
+    result = solve_bellman_ford(g, 0, method)
+    expected = nx.single_source_bellman_ford_path_length(g.graph, 0)
+    assert not result.has_negative_cycle
+    for v in range(g.V):
+        assert result.distances[v] == pytest.approx(expected[v])
+
+
+@pytest.mark.parametrize("method", ["vectorized", "queue"])
+def test_engines_agree_with_negative_weights(method):
+    g = _with_negative_edges(3)
+    if nx.negative_edge_cycle(g.graph):
+        pytest.skip("random graph has a negative cycle")
+    result = solve_bellman_ford(g, 0, method)
+    expected = nx.single_source_bellman_ford_path_length(g.graph, 0)
+    assert np.allclose([result.distances[v] for v in expected], list(expected.values()))
+    for v in expected:
+        path = result.path_to(v)
+        assert sum(g.graph[a][b]['weight'] for a, b in zip(path, path[1:])) == pytest.approx(expected[v])
+
+
+@pytest.mark.parametrize("method", ["vectorized", "queue"])
+def test_engines_detect_negative_cycles(method):
+    g = Graph(4)
+    g.add_edges_from_arrays(np.array([0, 1, 2, 2]), np.array([1, 2, 1, 3]),
+                            np.array([1.0, -2.0, 1.0, 1.0]))
+    result = solve_bellman_ford(g, 0, method)
+    assert result.has_negative_cycle
+    assert not np.isfinite(result.distances).any()
+
+
+def test_early_exit_on_a_shallow_graph():
+    # A star settles in one pass, confirmed by a second that changes nothing
+    g = Graph(50)
+    g.add_edges_from_arrays(np.zeros(49, dtype=np.int64), np.arange(1, 50), np.arange(1, 50.0))
+    result = solve_bellman_ford(g, 0, "vectorized")
+    assert result.distances[49] == 49
+    assert result.iterations == 2
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        solve_bellman_ford(generate_bellman_ford_graph(5, seed=0), 0, "nope")
@@ -0,0 +1,23 @@
+import benchmark
+
+
+def test_warm_up_runs_before_timed_cases(monkeypatch):
+    calls = []
+    monkeypatch.setattr(benchmark, "warm_up", lambda name, render=True: calls.append(("warm", name)))
+    original = benchmark.benchmark_case
+
+    def case(name, size, *args, **kwargs):
+        calls.append(("case", name))
+        return original(name, size, *args, **kwargs)
+
+    monkeypatch.setattr(benchmark, "benchmark_case", case)
+    benchmark.run_benchmarks(["Dijkstra", "Kruskal"], sizes=(8,), render_limit=0)
+    assert calls == [("warm", "Dijkstra"), ("case", "Dijkstra"),
+                     ("warm", "Kruskal"), ("case", "Kruskal")]
+
+
+def test_warm_up_is_untimed_and_quiet():
+    assert benchmark.warm_up("Dijkstra", render=False) is None
+    report = benchmark.run_benchmarks(["Dijkstra"], sizes=(8,), render_limit=0)
+    assert [r["size"] for r in report["results"]] == [8]
+    assert report["results"][0]["check"] == "ok"
@@ -0,0 +1,33 @@
+import json
+
+from batch import BatchResult, run_task
+from cli import output_record, parse_task, read_tasks
+
+
+def _solve(line):
+    task = parse_task(json.loads(line))
+    return run_task(task.name, task.params, task.instance)
+
+
+def test_readme_transportation_example():
+    line = ('{"algorithm": "potential_method", "supply": [20, 30], "demand": [25, 25], '
+            '"costs": [[4, null], [5, 8]]}')
+    assert _solve(line).total_cost == 305
+
+
+def test_density_reaches_the_generator():
+    sparse = _solve('{"algorithm": "kruskal", "vertices": 30, "seed": 1, "density": 0.05}')
+    dense = _solve('{"algorithm": "kruskal", "vertices": 30, "seed": 1, "density": 0.9}')
+    assert sparse.edges != dense.edges
+
+
+def test_invalid_lines_are_reported():
+    errors = []
+    tasks = list(read_tasks(['{"algorithm": "nope", "vertices": 3}\n', 'not json\n',
+                             '{"algorithm": "dijkstra", "vertices": 5}\n'], on_error=errors.append))
+    assert [task.name for task in tasks] == ["Dijkstra"]
+    assert [(e['id'], e['status']) for e in errors] == [(1, 'invalid'), (2, 'invalid')]
+    result = BatchResult(0, "Dijkstra", tasks[0].params, "done",
+                         run_task("Dijkstra", tasks[0].params))
+    record = output_record(result, summary=True)
+    assert record['id'] == 3 and record['result']['reachable'] == 5
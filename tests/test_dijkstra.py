@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+import algorithms
+import dijkstra
+from bellman_ford import Graph
+from dijkstra import ShortestPathSession, generate_dijkstra_graph, solve_dijkstra
+
+
+def test_session_starts_from_a_given_result():
+    graph = generate_dijkstra_graph(40, seed=2)
+    result = solve_dijkstra(graph, 0)
+    session = ShortestPathSession(graph.copy(), 0, result=result)
+    u, v = result.tree_edges()[0]
+    session.update({(u, v): 50})
+    expected = graph.copy()
+    expected[u][v]['weight'] = 50
+    assert np.allclose(session.result().distances, solve_dijkstra(expected, 0).distances)
+
+
+def test_session_rejects_negative_weights():
+    g = Graph(3)
+    g.add_edges_from_arrays(np.array([0, 1]), np.array([1, 2]), np.array([4.0, -1.0]))
+    with pytest.raises(ValueError, match="non-negative"):
+        ShortestPathSession(g, 0)
+
+
+def test_gui_display_uses_the_edge_editor(monkeypatch):
+    graph = generate_dijkstra_graph(6, seed=1)
+    result = solve_dijkstra(graph, 2)
+    calls = []
+    monkeypatch.setattr(dijkstra, 'edit_dijkstra', lambda *args: calls.append(args))
+    algorithms.display_result("Dijkstra", None, (graph,), result, {'vertices': 6, 'source': 2})
+    assert calls == [(None, graph, result, 2)]
@@ -0,0 +1,84 @@
+from display_utils import FigurePool
+
+
+class FakeWindow:
+    """Stand-in for a Tk result window (no display is needed)"""
+
+    def __init__(self, name):
+        self.name = name
+        self.destroyed = False
+
+    def winfo_toplevel(self):
+        return self
+
+    def bind(self, *args, **kwargs):
+        pass
+
+    def destroy(self):
+        self.destroyed = True
+
+    def __str__(self):
+        return self.name
+
+
+def test_windows_are_kept_open_and_figures_recycled():
+    pool = FigurePool(max_figures=2)
+    windows = [FakeWindow(f".w{i}") for i in range(12)]
+    figures = [pool.figure(window) for window in windows]
+    assert not any(window.destroyed for window in windows)
+    # Only two figure objects exist, passed on from the oldest window
+    assert len({id(figure) for figure in figures}) == 2
+    assert [key for key, entry in pool.entries.items() if entry.figure is not None] == [".w10", ".w11"]
+
+
+def test_window_cap_is_opt_in():
+    pool = FigurePool(max_windows=2)
+    windows = [FakeWindow(f".w{i}") for i in range(3)]
+    for window in windows:
+        pool.figure(window)
+    assert [window.destroyed for window in windows] == [True, False, False]
+
+
+def test_same_window_reuses_its_figure():
+    pool = FigurePool()
+    window = FakeWindow(".w")
+    first = pool.figure(window, figsize=(4, 3))
+    first.subplots()
+    second = pool.figure(window, figsize=(6, 4))
+    assert second is first and not second.axes
+    assert tuple(second.get_size_inches()) == (6, 4)
+
+
+class FakeWidget:
+    def __init__(self, parent):
+        self.exists = True
+        parent.children.append(self)
+
+    def winfo_exists(self):
+        return self.exists
+
+    def destroy(self):
+        self.exists = False
+
+
+class FakeCanvas:
+    def __init__(self, widget):
+        self.widget = widget
+
+    def get_tk_widget(self):
+        return self.widget
+
+
+def test_clear_frame_removes_the_canvas_with_the_labels():
+    pool = FigurePool()
+    window = FakeWindow(".w")
+    window.children = []
+    window.winfo_children = lambda: list(window.children)
+    pool.figure(window)
+    label = FakeWidget(window)
+    pool.entries[".w"].canvas = FakeCanvas(FakeWidget(window))
+    pool.clear_frame(window)
+    assert not label.exists
+    # The next show() packs a new canvas after the new labels
+    assert pool.entries[".w"].canvas is None
+    assert pool.entries[".w"].figure is not None
@@ -0,0 +1,63 @@
+import networkx as nx
+import pytest
+
+import algorithms
+import ford_fulkerson
+from ford_fulkerson import MAX_FLOW_METHODS, MaxFlowSession, generate_flow_network, solve_ford_fulkerson
+
+
+def test_session_starts_from_a_given_result():
+    graph = generate_flow_network(30, seed=4)
+    sink = graph.number_of_nodes() - 1
+    result = solve_ford_fulkerson(graph, 0, sink)
+    session = MaxFlowSession(graph.copy(), 0, sink, result=result)
+    assert session.result is result
+
+    u, v = max(graph.edges(), key=lambda e: result.flow_dict[e[0]][e[1]])
+    updated = session.update({(u, v): 0})
+    expected = graph.copy()
+    expected[u][v]['capacity'] = 0
+    assert updated.flow_value == nx.maximum_flow_value(expected, 0, sink)
+
+
+def test_gui_display_uses_the_capacity_editor(monkeypatch):
+    graph = generate_flow_network(8, seed=1)
+    result = solve_ford_fulkerson(graph, 0, 7)
+    calls = []
+    monkeypatch.setattr(ford_fulkerson, 'edit_ford_fulkerson', lambda *args: calls.append(args))
+    algorithms.display_result("Ford-Fulkerson", None, (graph,), result, {'vertices': 8, 'method': 'dinic'})
+    assert calls == [(None, graph, result, 0, 7, 'dinic')]
+
+
+@pytest.mark.parametrize("method", sorted(MAX_FLOW_METHODS))
+@pytest.mark.parametrize("seed", range(3))
+def test_engines_match_networkx(method, seed):
+    graph = generate_flow_network(40, seed=seed)
+    sink = graph.number_of_nodes() - 1
+    result = solve_ford_fulkerson(graph, 0, sink, method)
+    assert result.flow_value == pytest.approx(nx.maximum_flow_value(graph, 0, sink))
+    balance = dict.fromkeys(graph.nodes(), 0)
+    for u, flows in result.flow_dict.items():
+        for v, flow in flows.items():
+            assert -1e-9 <= flow <= graph[u][v]['capacity'] + 1e-9
+            balance[u] -= flow
+            balance[v] += flow
+    assert all(abs(net) < 1e-9 for node, net in balance.items() if node not in (0, sink))
+
+
+@pytest.mark.parametrize("method", sorted(MAX_FLOW_METHODS))
+def test_minimum_cut_capacity_equals_the_flow(method):
+    graph = generate_flow_network(30, seed=7)
+    sink = graph.number_of_nodes() - 1
+    result = solve_ford_fulkerson(graph, 0, sink, method)
+    assert result.source_side[0] and not result.source_side[sink]
+    cut = sum(graph[u][v]['capacity'] for u, v in result.cut_edges())
+    assert cut == pytest.approx(result.flow_value)
+
+
+def test_source_equal_to_sink_and_unknown_method():
+    graph = generate_flow_network(5, seed=0)
+    with pytest.raises(ValueError):
+        solve_ford_fulkerson(graph, 0, 0)
+    with pytest.raises(ValueError):
+        solve_ford_fulkerson(graph, 0, 4, "nope")
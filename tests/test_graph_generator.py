@@ -0,0 +1,50 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from graph_generator import bernoulli_indices, generate_random_graph
+
+
+def test_seed_makes_graphs_reproducible():
+    a = generate_random_graph(50, 0.2, seed=7)
+    b = generate_random_graph(50, 0.2, seed=7)
+    assert np.array_equal(a.sources, b.sources) and np.array_equal(a.targets, b.targets)
+    assert np.array_equal(a.weights, b.weights)
+
+
+@pytest.mark.parametrize("vertices, density", [(2, 0.0), (30, 0.01), (200, 0.05), (40, 1.0)])
+def test_undirected_graphs_are_simple_and_connected(vertices, density):
+    edges = generate_random_graph(vertices, density, seed=1)
+    graph = edges.to_networkx()
+    assert graph.number_of_edges() == len(edges)   # no parallel edges or duplicates
+    assert nx.number_of_selfloops(graph) == 0
+    assert nx.is_connected(graph)
+
+
+def test_directed_graphs_reach_every_vertex_from_zero():
+    edges = generate_random_graph(100, 0.01, directed=True, seed=2)
+    graph = edges.to_networkx()
+    assert graph.number_of_edges() == len(edges)
+    assert len(nx.descendants(graph, 0)) == 99
+
+
+def test_acyclic_flow_networks():
+    edges = generate_random_graph(60, 0.1, acyclic=True, weights=None, capacities=(1, 20), seed=3)
+    assert edges.directed and edges.weights is None
+    assert (edges.sources < edges.targets).all()
+    assert ((edges.capacities >= 1) & (edges.capacities < 20)).all()
+    assert nx.is_directed_acyclic_graph(edges.to_networkx())
+
+
+def test_edge_count_follows_density():
+    vertices, density = 400, 0.05
+    edges = generate_random_graph(vertices, density, connected=False, seed=4)
+    expected = density * vertices * (vertices - 1) / 2
+    assert abs(len(edges) - expected) < 5 * np.sqrt(expected)
+
+
+def test_bernoulli_indices_are_sorted_unique_and_in_range():
+    indices = bernoulli_indices(10 ** 6, 0.001, np.random.default_rng(5))
+    assert (np.diff(indices) > 0).all()
+    assert indices.min() >= 0 and indices.max() < 10 ** 6
+    assert abs(len(indices) - 1000) < 200
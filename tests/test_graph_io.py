@@ -0,0 +1,96 @@
+import os
+import time
+
+import networkx as nx
+import pytest
+
+import graph_io
+from algorithms import generate_instance, solve_instance
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(graph_io, 'CACHE_DIR', str(tmp_path / 'cache'))
+
+
+def _write(tmp_path, text):
+    path = tmp_path / 'graph.txt'
+    path.write_text(text)
+    return str(path)
+
+
+def test_edge_list_file_colors_adjacent_vertices_differently(tmp_path):
+    path = _write(tmp_path, "0 1\n1 2\n2 3\n3 0\n0 2\n")
+    params = {'graph_file': path}
+    instance = generate_instance("Welsh-Powell", params)
+    result = solve_instance("Welsh-Powell", instance, params)
+    for u, v in [(0, 1), (1, 2), (2, 3), (3, 0), (0, 2)]:
+        assert result.colors[u] != result.colors[v]
+    assert result.num_colors == 3
+
+
+def test_kruskal_keeps_the_lightest_of_opposite_edges(tmp_path):
+    path = _write(tmp_path, "0 1 5\n1 0 2\n1 2 3\n")
+    params = {'graph_file': path}
+    result = solve_instance("Kruskal", generate_instance("Kruskal", params), params)
+    assert result.total_weight == 5
+
+
+def test_unweighted_flow_network_has_unit_capacities(tmp_path):
+    # Two edge-disjoint paths from 0 to 3
+    path = _write(tmp_path, "0 1\n0 2\n1 3\n2 3\n1 2\n")
+    params = {'graph_file': path}
+    instance = generate_instance("Ford-Fulkerson", params)
+    assert all(c == 1 for _, _, c in instance[0].edges(data='capacity'))
+    assert solve_instance("Ford-Fulkerson", instance, params).flow_value == 2
+
+
+def test_parallel_edges_keep_the_lightest_weight(tmp_path):
+    path = _write(tmp_path, "0 1 1\n0 1 10\n1 2 1\n")
+    params = {'graph_file': path, 'source': 0}
+    dijkstra = solve_instance("Dijkstra", generate_instance("Dijkstra", params), params)
+    bellman_ford = solve_instance("Bellman-Ford", generate_instance("Bellman-Ford", params), params)
+    assert list(dijkstra.distances) == [0, 1, 2]
+    assert list(bellman_ford.distances) == [0, 1, 2]
+
+
+def test_parallel_capacities_add_up(tmp_path):
+    path = _write(tmp_path, "0 1 3\n0 1 4\n1 2 10\n")
+    params = {'graph_file': path}
+    instance = generate_instance("Ford-Fulkerson", params)
+    assert instance[0][0][1]['capacity'] == 7
+    assert solve_instance("Ford-Fulkerson", instance, params).flow_value == 7
+
+
+def _entries():
+    return sorted(os.listdir(graph_io.CACHE_DIR))
+
+
+def test_changed_file_replaces_its_cache_entry(tmp_path):
+    path = _write(tmp_path, "0 1 1\n1 2 1\n")
+    graph_io.open_graph(path)
+    first = _entries()
+    path = _write(tmp_path, "0 1 1\n1 2 1\n2 3 1\n")
+    os.utime(path, ns=(1, 1))
+    store = graph_io.open_graph(path)
+    assert store.vertices == 4
+    assert len(_entries()) == 1 and _entries() != first
+
+
+def test_cache_keeps_the_most_recently_used_entries(tmp_path):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f'g{i}.txt'
+        path.write_text(f"0 1 {i + 1}\n")
+        paths.append(str(path))
+    stores = [graph_io.open_graph(path) for path in paths[:2]]
+    # Reopen the first file so the second is the least recently used
+    time.sleep(0.01)
+    graph_io.open_graph(paths[0])
+    time.sleep(0.01)
+    size = graph_io._directory_size(stores[0].directory)
+    stores.append(graph_io.open_graph(paths[2], cache_limit=2 * size))
+    remaining = _entries()
+    assert os.path.basename(stores[1].directory) not in remaining
+    assert os.path.basename(stores[0].directory) in remaining
+    assert os.path.basename(stores[2].directory) in remaining
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from initial_solutions import (INITIAL_METHODS, initial_allocation, least_cost_allocation,
+                               north_west_corner_allocation, vogel_allocation)
+from transportation import SparseMatrix, generate_transportation_problem
+
+# Textbook instance with known North-West Corner, Least Cost and Vogel costs
+COSTS = np.array([[19, 30, 50, 10], [70, 30, 40, 60], [40, 8, 70, 20]])
+SUPPLY = [7, 9, 18]
+DEMAND = [5, 8, 7, 14]
+
+
+def _reference_least_cost(supply, demand, costs):
+    """Plain cheapest-cell-first filling, ties in row-major order"""
+    supply, demand = list(supply), list(demand)
+    solution = np.zeros(costs.shape)
+    for k in np.argsort(costs, axis=None, kind='stable'):
+        i, j = divmod(int(k), costs.shape[1])
+        quantity = min(supply[i], demand[j])
+        solution[i, j] = quantity
+        supply[i] -= quantity
+        demand[j] -= quantity
+    return solution
+
+
+@pytest.mark.parametrize("build, expected", [(north_west_corner_allocation, 1015),
+                                             (least_cost_allocation, 814),
+                                             (vogel_allocation, 779)])
+def test_textbook_costs(build, expected):
+    allocation = build(SUPPLY, DEMAND, COSTS)
+    assert (allocation * COSTS).sum() == expected
+    assert np.count_nonzero(allocation) <= len(SUPPLY) + len(DEMAND) - 1
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_least_cost_matches_the_plain_method(seed):
+    supply, demand, costs = generate_transportation_problem(9, seed=seed)
+    assert np.array_equal(least_cost_allocation(supply, demand, costs),
+                          _reference_least_cost(supply, demand, costs))
+
+
+@pytest.mark.parametrize("method", sorted(INITIAL_METHODS))
+@pytest.mark.parametrize("seed", range(3))
+def test_allocations_are_feasible(method, seed):
+    supply, demand, costs = generate_transportation_problem(15, seed=seed)
+    allocation = initial_allocation(method, supply, demand, costs)
+    assert (allocation >= 0).all()
+    assert np.allclose(allocation.sum(axis=1), supply)
+    assert np.allclose(allocation.sum(axis=0), demand)
+
+
+def test_vogel_on_sparse_costs_matches_dense():
+    supply, demand, costs = generate_transportation_problem(8, seed=6)
+    sparse = SparseMatrix.from_dense(costs.astype(float))
+    dense_cost = (vogel_allocation(supply, demand, costs) * costs).sum()
+    assert (vogel_allocation(supply, demand, sparse).toarray() * costs).sum() == dense_cost
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        initial_allocation("nope", SUPPLY, DEMAND, COSTS)
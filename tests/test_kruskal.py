@@ -0,0 +1,53 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from graph_generator import generate_random_graph
+from kruskal import generate_kruskal_graph, minimum_spanning_forest, solve_kruskal
+
+METHODS = ["kruskal", "boruvka", "prim", "auto"]
+
+
+def _is_spanning_forest(graph, result):
+    forest = nx.Graph()
+    forest.add_nodes_from(graph.nodes())
+    forest.add_edges_from((u, v) for u, v, _ in result.edges)
+    return (nx.is_forest(forest)
+            and nx.number_connected_components(forest) == nx.number_connected_components(graph))
+
+
+@pytest.mark.parametrize("method", METHODS)
+@pytest.mark.parametrize("seed", range(3))
+def test_weight_matches_networkx(method, seed):
+    graph = generate_kruskal_graph(40, seed=seed)
+    result = solve_kruskal(graph, method)
+    assert result.total_weight == pytest.approx(nx.minimum_spanning_tree(graph).size(weight='weight'))
+    assert len(result.edges) == graph.number_of_nodes() - 1
+    assert _is_spanning_forest(graph, result)
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_disconnected_graphs_give_a_forest(method):
+    edges = generate_random_graph(60, 0.02, connected=False, seed=5)
+    graph = edges.to_networkx()
+    result = minimum_spanning_forest(edges.vertices, edges.sources, edges.targets, edges.weights, method)
+    expected = nx.minimum_spanning_tree(graph).size(weight='weight')
+    assert result.total_weight == pytest.approx(expected)
+    assert _is_spanning_forest(graph, result)
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_parallel_edges_use_the_lightest(method):
+    result = minimum_spanning_forest(3, np.array([0, 0, 1, 1]), np.array([1, 1, 2, 0]),
+                                     np.array([5.0, 2.0, 3.0, 1.0]), method)
+    assert result.total_weight == 4.0
+
+
+def test_empty_graph():
+    result = minimum_spanning_forest(4, np.empty(0), np.empty(0), np.empty(0), "kruskal")
+    assert result.edges == [] and result.total_weight == 0
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        solve_kruskal(generate_kruskal_graph(5, seed=0), "nope")
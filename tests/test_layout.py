@@ -0,0 +1,42 @@
+import networkx as nx
+
+from layout import LayoutCache, compute_layout, edge_keys, get_layout
+
+
+def _warm_starts(monkeypatch):
+    import layout
+    starts = []
+    original = layout.compute_layout
+
+    def recording(graph, method="auto", initial=None, seed=None):
+        starts.append(initial)
+        return original(graph, method, initial, seed)
+    monkeypatch.setattr(layout, 'compute_layout', recording)
+    return starts
+
+
+def test_unrelated_graph_with_same_labels_is_laid_out_cold(monkeypatch):
+    starts = _warm_starts(monkeypatch)
+    cache = LayoutCache()
+    get_layout(nx.gnp_random_graph(20, 0.3, seed=1), cache=cache)
+    get_layout(nx.gnp_random_graph(20, 0.3, seed=2), cache=cache)
+    assert starts == [None, None]
+
+
+def test_slightly_changed_graph_is_warm_started(monkeypatch):
+    starts = _warm_starts(monkeypatch)
+    cache = LayoutCache()
+    graph = nx.gnp_random_graph(30, 0.3, seed=1)
+    first = get_layout(graph, cache=cache)
+    changed = graph.copy()
+    changed.remove_edge(*next(iter(graph.edges())))
+    get_layout(changed, cache=cache)
+    assert starts[1] is first
+
+
+def test_warm_start_requires_the_same_method():
+    cache = LayoutCache()
+    graph = nx.path_graph(10)
+    cache.put(("h", "spring"), compute_layout(graph, "spring", seed=0), edge_keys(graph))
+    assert cache.closest(graph.nodes(), edge_keys(graph), "force") is None
+    assert cache.closest(graph.nodes(), edge_keys(graph), "spring") is not None
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("matplotlib")
+
+from matplotlib.backend_bases import MouseEvent
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from matrix_renderer import draw_matrix
+from transportation import SparseMatrix
+
+
+def _axes():
+    fig = Figure(figsize=(4, 4))
+    FigureCanvasAgg(fig)
+    return fig.subplots()
+
+
+def test_small_matrix_annotates_every_cell():
+    values = np.arange(12.0).reshape(3, 4)
+    renderer = draw_matrix(_axes(), values, costs=values + 1)
+    assert len(renderer.texts) == 12
+    assert renderer.texts[5].get_text() == '5\n(6)'
+
+
+def test_large_matrix_is_downsampled_and_not_annotated():
+    values = np.random.default_rng(0).random((2000, 1500))
+    renderer = draw_matrix(_axes(), values, max_pixels=200)
+    image = renderer.image.get_array()
+    assert max(image.shape) <= 200
+    # Max pooling keeps the largest value of each block
+    assert np.nanmax(image) == values.max()
+    assert renderer.texts == []
+
+
+def test_zooming_in_annotates_the_visible_cells():
+    values = np.arange(10000.0).reshape(100, 100)
+    ax = _axes()
+    renderer = draw_matrix(ax, values)
+    assert renderer.texts == []
+    ax.set_xlim(9.5, 14.5)
+    ax.set_ylim(24.5, 19.5)
+    assert sorted(float(t.get_text()) for t in renderer.texts) == sorted(
+        values[20:25, 10:15].ravel().tolist())
+
+
+def test_sparse_allocation_annotates_only_stored_cells():
+    allocation = SparseMatrix.from_coo((500, 500), [1, 200, 499], [3, 7, 499], [5.0, 6.0, 7.0], fill=0)
+    renderer = draw_matrix(_axes(), allocation)
+    assert sorted(t.get_text() for t in renderer.texts) == ['5', '6', '7']
+
+
+def test_forbidden_cells_are_blank():
+    costs = np.array([[1.0, np.inf], [np.inf, 4.0]])
+    renderer = draw_matrix(_axes(), costs)
+    # Non-finite cells are masked out of the image instead of stretching the colour scale
+    assert np.ma.getmaskarray(renderer.image.get_array()).tolist() == [[False, True], [True, False]]
+    assert len(renderer.texts) == 2
+
+
+def test_hover_shows_the_cell_tooltip():
+    values = np.arange(4.0).reshape(2, 2)
+    ax = _axes()
+    renderer = draw_matrix(ax, values, costs=values * 10)
+    ax.figure.canvas.draw()
+    x, y = ax.transData.transform((1, 0))
+    renderer._hover(MouseEvent('motion_notify_event', ax.figure.canvas, x, y))
+    assert renderer.tooltip.get_visible()
+    assert renderer.tooltip.get_text() == 'Cell (0, 1)\nValue: 1\nCost: 10'
@@ -0,0 +1,49 @@
+import importlib.util
+
+import numpy as np
+import pytest
+
+from benchmark import transportation_optimum
+from initial_solutions import initial_allocation
+from potential_method import optimize_basis, solve_potential_method
+from transportation import TransportationBasis, generate_transportation_problem
+
+requires_scipy = pytest.mark.skipif(importlib.util.find_spec("scipy") is None,
+                                    reason="the reference optimum needs scipy")
+
+
+@requires_scipy
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("initial", ["vogel", "north_west_corner"])
+def test_cost_matches_linear_programming(seed, initial):
+    supply, demand, costs = generate_transportation_problem(8, seed=seed)
+    result = solve_potential_method(supply, demand, costs, initial=initial)
+    assert np.allclose(result.allocation.sum(axis=1), supply)
+    assert np.allclose(result.allocation.sum(axis=0), demand)
+    assert result.total_cost == pytest.approx(transportation_optimum(supply, demand, costs))
+
+
+def test_potentials_certify_optimality():
+    supply, demand, costs = generate_transportation_problem(10, seed=11)
+    result = solve_potential_method(supply, demand, costs)
+    reduced = costs - (result.u[:, None] + result.v)
+    # Dual feasible everywhere, tight on the basis
+    assert reduced.min() >= -1e-9
+    rows, cols = result.basis.T
+    assert np.allclose(reduced[rows, cols], 0)
+    assert len(result.basis) == len(supply) + len(demand) - 1
+
+
+def test_small_blocks_reach_the_same_optimum():
+    supply, demand, costs = generate_transportation_problem(12, seed=5)
+    expected = solve_potential_method(supply, demand, costs).total_cost
+    basis = TransportationBasis.from_allocation(initial_allocation("north_west_corner", supply, demand, costs))
+    optimize_basis(basis, costs, block_size=1)
+    assert float((basis.allocation() * costs).sum()) == pytest.approx(expected)
+
+
+def test_max_iterations_stops_early():
+    supply, demand, costs = generate_transportation_problem(10, seed=2)
+    result = solve_potential_method(supply, demand, costs, max_iterations=1, initial="north_west_corner")
+    assert result.iterations <= 1
+    assert np.allclose(result.allocation.sum(axis=1), supply)
@@ -0,0 +1,43 @@
+import os
+import struct
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _loaded_after(code, modules):
+    """Which of ``modules`` a fresh interpreter has imported after running ``code``"""
+    probe = f"{code}\nimport sys\nprint(','.join(m for m in {modules!r} if m in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, capture_output=True,
+                            text=True, check=True).stdout.strip()
+    return output.split(',') if output else []
+
+
+def test_gui_module_starts_without_heavy_imports():
+    pytest.importorskip("tkinter")
+    assert _loaded_after("import GUI", ("numpy", "networkx", "matplotlib", "PIL", "scipy")) == []
+
+
+def test_headless_runs_never_import_the_gui_stack():
+    code = ("from algorithms import ALGORITHMS, run_algorithm\n"
+            "for name in ALGORITHMS:\n"
+            "    run_algorithm(name, {'vertices': 5, 'seed': 0})")
+    assert _loaded_after(code, ("tkinter", "matplotlib", "PIL")) == []
+
+
+def test_algorithm_modules_are_imported_on_first_use():
+    code = "import algorithms\nalgorithms.run_algorithm('Kruskal', {'vertices': 4, 'seed': 0})"
+    assert _loaded_after(code, ("kruskal", "dijkstra", "potential_method")) == ["kruskal"]
+
+
+def test_bundled_logo_is_pre_scaled():
+    pytest.importorskip("tkinter")
+    from GUI import LOGO_SIZE
+    path = os.path.join(ROOT, 'img', 'logo emsi {}x{}.png'.format(*LOGO_SIZE))
+    with open(path, 'rb') as f:
+        header = f.read(24)
+    assert header[:8] == b'\x89PNG\r\n\x1a\n'
+    assert struct.unpack('>II', header[16:24]) == LOGO_SIZE
@@ -0,0 +1,63 @@
+import importlib.util
+
+import numpy as np
+import pytest
+
+from benchmark import transportation_optimum
+from initial_solutions import initial_allocation
+from stepping_stone import evaluate_empty_cells, evaluate_empty_cells_batched, solve_stepping_stone
+from transportation import TransportationBasis, generate_transportation_problem
+
+requires_scipy = pytest.mark.skipif(importlib.util.find_spec("scipy") is None,
+                                    reason="the reference optimum needs scipy")
+
+
+def _check_feasible(supply, demand, allocation):
+    allocation = np.asarray(allocation)
+    assert (allocation >= 0).all()
+    assert np.allclose(allocation.sum(axis=1), supply)
+    assert np.allclose(allocation.sum(axis=0), demand)
+
+
+@requires_scipy
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("batched", [False, True])
+def test_cost_matches_linear_programming(seed, batched):
+    supply, demand, costs = generate_transportation_problem(7, seed=seed)
+    result = solve_stepping_stone(supply, demand, costs, batched=batched)
+    _check_feasible(supply, demand, result.allocation)
+    assert result.total_cost == pytest.approx(float((result.allocation * costs).sum()))
+    assert result.total_cost == pytest.approx(transportation_optimum(supply, demand, costs))
+
+
+@requires_scipy
+def test_rectangular_degenerate_instance():
+    supply, demand = [30, 30, 40], [30, 30, 20, 20]
+    costs = np.array([[4, 6, 8, 8], [6, 8, 6, 7], [5, 7, 6, 8]])
+    result = solve_stepping_stone(supply, demand, costs)
+    _check_feasible(supply, demand, result.allocation)
+    assert result.total_cost == pytest.approx(transportation_optimum(supply, demand, costs))
+
+
+def test_loop_search_agrees_with_batched_evaluation():
+    supply, demand, costs = generate_transportation_problem(6, seed=9)
+    costs = costs.astype(float)
+    basis = TransportationBasis.from_allocation(initial_allocation("north_west_corner", supply, demand, costs))
+    loops = evaluate_empty_cells(basis, costs)
+    assert np.allclose(loops, evaluate_empty_cells_batched(basis, costs))
+    for i, j in basis.flows:
+        assert loops[i, j] == 0
+
+
+def test_loops_alternate_rows_and_columns():
+    supply, demand, costs = generate_transportation_problem(5, seed=4)
+    basis = TransportationBasis.from_allocation(initial_allocation("north_west_corner", supply, demand, costs))
+    for i in range(5):
+        for j in range(5):
+            if (i, j) in basis.flows:
+                continue
+            loop = basis.cycle(i, j)
+            assert loop[0] == (i, j) and len(loop) % 2 == 0
+            assert all(cell in basis.flows for cell in loop[1:])
+            for a, b in zip(loop, loop[1:] + loop[:1]):
+                assert a[0] == b[0] or a[1] == b[1]
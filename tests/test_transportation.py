@@ -0,0 +1,70 @@
+import importlib.util
+
+import numpy as np
+import pytest
+
+from benchmark import transportation_optimum
+from least_cost import solve_least_cost
+from north_west_corner import solve_north_west_corner
+from potential_method import solve_potential_method
+from stepping_stone import solve_stepping_stone
+from transportation import SparseMatrix, as_costs, generate_sparse_transportation_problem
+
+requires_scipy = pytest.mark.skipif(importlib.util.find_spec("scipy") is None,
+                                    reason="the reference optimum needs scipy")
+SOLVERS = [solve_north_west_corner, solve_least_cost, solve_stepping_stone, solve_potential_method]
+OPTIMIZERS = [solve_stepping_stone, solve_potential_method]
+
+
+def _dense(allocation):
+    return allocation.toarray() if isinstance(allocation, SparseMatrix) else np.asarray(allocation)
+
+
+def _penalized(costs):
+    """Dense costs with forbidden routes priced out, for the LP reference"""
+    dense = costs.toarray()
+    return np.where(np.isfinite(dense), dense, 1e6)
+
+
+def test_sparse_matrix_lookup_and_round_trip():
+    dense = np.array([[1.0, np.inf, 3.0], [np.inf, 5.0, np.inf]])
+    sparse = as_costs(dense)
+    assert isinstance(sparse, SparseMatrix) and sparse.nnz == 3
+    assert sparse[0, 2] == 3.0 and sparse[1, 0] == np.inf
+    assert np.array_equal(sparse.toarray(), dense)
+    assert np.array_equal(sparse.sum(axis=1), [4.0, 5.0])
+
+
+def test_duplicate_cells_keep_the_last_value():
+    sparse = SparseMatrix.from_coo((2, 2), [1, 0, 1], [1, 0, 1], [7.0, 2.0, 9.0])
+    assert sparse.nnz == 2 and sparse[1, 1] == 9.0
+
+
+@pytest.mark.parametrize("solve", SOLVERS)
+def test_forbidden_routes_carry_no_flow(solve):
+    supply, demand = np.array([20, 30, 25]), np.array([25, 25, 25])
+    costs = np.array([[4.0, np.inf, 6.0], [5.0, 8.0, np.inf], [np.inf, 3.0, 7.0]])
+    result = solve(supply, demand, costs)
+    allocation = _dense(result.allocation)
+    assert (allocation[~np.isfinite(costs)] == 0).all()
+    assert np.allclose(allocation.sum(axis=1), supply)
+    assert np.allclose(allocation.sum(axis=0), demand)
+    assert np.isfinite(result.total_cost)
+
+
+@pytest.mark.parametrize("solve", SOLVERS)
+def test_generated_sparse_instances_are_feasible(solve):
+    supply, demand, costs = generate_sparse_transportation_problem(40, 30, 0.05, seed=1)
+    allocation = _dense(solve(supply, demand, costs).allocation)
+    assert (allocation[~np.isfinite(costs.toarray())] == 0).all()
+    assert np.allclose(allocation.sum(axis=1), supply)
+    assert np.allclose(allocation.sum(axis=0), demand)
+
+
+@requires_scipy
+@pytest.mark.parametrize("solve", OPTIMIZERS)
+@pytest.mark.parametrize("seed", range(3))
+def test_sparse_optimum_matches_linear_programming(solve, seed):
+    supply, demand, costs = generate_sparse_transportation_problem(15, 12, 0.3, seed=seed)
+    result = solve(supply, demand, costs)
+    assert result.total_cost == pytest.approx(transportation_optimum(supply, demand, _penalized(costs)))
@@ -0,0 +1,63 @@
+import os
+
+import numpy as np
+import pytest
+
+import transportation_io
+from transportation_io import MappedArray, open_cost_matrix
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(transportation_io, 'CACHE_DIR', str(tmp_path / 'cache'))
+
+
+@pytest.mark.parametrize("order", ["C", "F"])
+def test_npy_cost_matrix_round_trip(tmp_path, order):
+    costs = np.arange(12, dtype=np.float64).reshape(3, 4) * 1.5
+    path = str(tmp_path / 'costs.npy')
+    np.save(path, np.asarray(costs, order=order))
+    opened = open_cost_matrix(path)
+    assert isinstance(opened, MappedArray)
+    assert opened.shape == (3, 4)
+    assert np.array_equal(opened, costs)
+
+
+def test_transposed_matrix_round_trip(tmp_path):
+    # np.save of a transpose writes a Fortran-ordered file
+    costs = np.random.default_rng(0).integers(1, 20, size=(5, 3)).astype(np.float64)
+    path = str(tmp_path / 'costs.npy')
+    np.save(path, costs.T)
+    assert np.array_equal(open_cost_matrix(path), costs.T)
+
+
+def test_changed_cost_file_replaces_its_cache_entry(tmp_path):
+    path = tmp_path / 'costs.csv'
+    path.write_text("1,2\n3,4\n")
+    open_cost_matrix(str(path))
+    path.write_text("1,2,3\n4,5,6\n")
+    os.utime(path, ns=(1, 1))
+    opened = open_cost_matrix(str(path))
+    assert opened.shape == (2, 3)
+    assert len(os.listdir(transportation_io.CACHE_DIR)) == 1
+
+
+def test_cost_cache_is_trimmed_to_its_limit(tmp_path):
+    for i in range(3):
+        path = tmp_path / f'costs{i}.csv'
+        path.write_text(f"{i},1\n1,{i}\n")
+        open_cost_matrix(str(path), cache_limit=0)
+    # Only the entry just written survives a zero limit
+    assert len(os.listdir(transportation_io.CACHE_DIR)) == 1
+
+
+def test_cost_file_that_fails_to_parse_leaves_no_cache_entry(tmp_path):
+    path = tmp_path / 'costs.csv'
+    path.write_text("1,2\n3,oops\n")
+    with pytest.raises(ValueError):
+        open_cost_matrix(str(path))
+    assert os.listdir(transportation_io.CACHE_DIR) == []
+    # The fixed file is converted normally
+    path.write_text("1,2\n3,4\n")
+    os.utime(path, ns=(1, 1))
+    assert np.array_equal(open_cost_matrix(str(path)), [[1, 2], [3, 4]])
@@ -0,0 +1,29 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from csr_graph import CSRGraph
+from welsh_powell import COLORING_METHODS, solve_welsh_powell
+
+
+def _assert_proper(edges, colors):
+    for u, v in edges:
+        assert colors[u] != colors[v], f"{u} and {v} share color {colors[u]}"
+
+
+@pytest.mark.parametrize("method", COLORING_METHODS)
+def test_directed_networkx_graph(method):
+    graph = nx.gnp_random_graph(60, 0.2, seed=5, directed=True)
+    result = solve_welsh_powell(graph, method, seed=1)
+    _assert_proper(graph.edges(), result.colors)
+    assert result.num_colors == len(np.unique(result.colors))
+
+
+@pytest.mark.parametrize("method", COLORING_METHODS)
+def test_directed_csr_graph(method):
+    # A directed path: only out-arcs are stored
+    sources, targets = np.arange(9), np.arange(1, 10)
+    csr = CSRGraph.from_edges(10, sources, targets, directed=True)
+    result = solve_welsh_powell(csr, method, seed=1)
+    _assert_proper(zip(sources, targets), result.colors)
+    assert result.num_colors <= 3     # at most max degree + 1
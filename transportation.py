@@ -0,0 +1,470 @@
+import numpy as np
+
+# Instance helpers shared by the transportation methods (North-West Corner,
+# Least Cost, Stepping-Stone and Potential Method).
+
+class SparseMatrix:
+    """Sparse m x n matrix of allowed routes (COO, sorted row-major, so also CSR).
+
+    Used both for sparse cost matrices, where missing cells are forbidden
+    routes (``fill`` is inf), and for sparse allocations (``fill`` is 0).
+    """
+
+    def __init__(self, shape, rows, cols, data, fill=np.inf):
+        self.shape = tuple(shape)
+        self.rows = np.asarray(rows, dtype=np.int32)
+        self.cols = np.asarray(cols, dtype=np.int32)
+        self.data = np.asarray(data)
+        self.fill = fill
+        self._keys = None
+        self._indptr = None
+
+    @classmethod
+    def from_coo(cls, shape, rows, cols, data, fill=np.inf):
+        """Build from unordered triplets; duplicate cells keep the last value"""
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        keys = rows * shape[1] + cols
+        order = np.argsort(keys, kind='stable')
+        keys = keys[order]
+        last = np.append(keys[1:] != keys[:-1], True)
+        order = order[last]
+        return cls(shape, rows[order], cols[order], np.asarray(data)[order], fill)
+
+    @classmethod
+    def from_dense(cls, matrix, allowed=None):
+        """Keep the cells where ``allowed`` is true (by default the finite ones)"""
+        matrix = np.asarray(matrix)
+        if allowed is None:
+            allowed = np.isfinite(matrix)
+        rows, cols = np.nonzero(allowed)
+        return cls(matrix.shape, rows, cols, matrix[rows, cols])
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    @property
+    def keys(self):
+        """Row-major linear index of every stored cell (sorted)"""
+        if self._keys is None:
+            self._keys = self.rows.astype(np.int64) * self.shape[1] + self.cols
+        return self._keys
+
+    @property
+    def indptr(self):
+        """CSR row pointers: row i is stored in [indptr[i], indptr[i + 1])"""
+        if self._indptr is None:
+            self._indptr = np.searchsorted(self.rows, np.arange(self.shape[0] + 1))
+        return self._indptr
+
+    def lookup(self, rows, cols):
+        """Values at the given cells, ``fill`` where a cell is not stored"""
+        keys = np.asarray(rows, dtype=np.int64) * self.shape[1] + np.asarray(cols)
+        position = np.minimum(np.searchsorted(self.keys, keys), max(self.nnz - 1, 0))
+        if self.nnz == 0:
+            return np.full(np.shape(keys), self.fill)
+        found = self.keys[position] == keys
+        return np.where(found, self.data[position], self.fill)
+
+    def __getitem__(self, cell):
+        i, j = cell
+        return self.lookup(i, j).item()
+
+    def with_data(self, data, fill=None):
+        """Same cells with new values"""
+        return SparseMatrix(self.shape, self.rows, self.cols, data,
+                            self.fill if fill is None else fill)
+
+    def sum(self, axis):
+        size = self.shape[1 - axis]
+        index = self.cols if axis == 0 else self.rows
+        return np.bincount(index, weights=self.data, minlength=size)
+
+    def toarray(self):
+        dense = np.full(self.shape, self.fill, dtype=float)
+        dense[self.rows, self.cols] = self.data
+        return dense
+
+
+def as_costs(costs):
+    """Normalize a cost matrix: SparseMatrix as is, dense with forbidden (inf/nan) cells to sparse"""
+    if isinstance(costs, SparseMatrix):
+        return costs
+    costs = np.asarray(costs, dtype=float)
+    if not np.all(np.isfinite(costs)):
+        return SparseMatrix.from_dense(costs)
+    return costs
+
+
+def generate_transportation_problem(vertices, supply=None, demand=None, seed=None):
+    """Return a balanced (supply, demand, costs) instance, generating what is missing"""
+    rng = np.random.default_rng(seed)
+    if supply is None or demand is None:
+        # Generate random supply and demand if not provided
+        supply = rng.integers(10, 50, size=vertices)
+        demand = rng.integers(10, 50, size=vertices)
+        # Adjust to make balanced
+        diff = sum(supply) - sum(demand)
+        if diff > 0:
+            demand[-1] += diff
+        elif diff < 0:
+            supply[-1] -= diff
+    supply = np.asarray(supply)
+    demand = np.asarray(demand)
+
+    # Generate random costs
+    costs = rng.integers(1, 20, size=(len(supply), len(demand)))
+    return supply, demand, costs
+
+
+def generate_sparse_transportation_problem(sources, destinations, density, seed=None):
+    """Return a balanced (supply, demand, costs) instance whose costs are a SparseMatrix.
+
+    Routes are kept with probability ``density``; a staircase of routes is
+    always added so the instance stays feasible.
+    """
+    from graph_generator import bernoulli_indices
+
+    rng = np.random.default_rng(seed)
+    supply = rng.integers(10, 50, size=sources)
+    demand = rng.integers(10, 50, size=destinations)
+    diff = supply.sum() - demand.sum()
+    if diff > 0:
+        demand[-1] += diff
+    elif diff < 0:
+        supply[-1] -= diff
+
+    # The cells used by the North-West Corner rule form a feasible staircase
+    cumulative = np.concatenate((np.cumsum(supply)[:-1], np.cumsum(demand)[:-1]))
+    boundaries = np.unique(cumulative)
+    starts = np.concatenate(([0], boundaries))
+    stair_rows = np.searchsorted(np.cumsum(supply), starts, side='right')
+    stair_cols = np.searchsorted(np.cumsum(demand), starts, side='right')
+
+    keys = bernoulli_indices(sources * destinations, density, rng)
+    rows = np.concatenate((keys // destinations, stair_rows))
+    cols = np.concatenate((keys % destinations, stair_cols))
+    costs = rng.integers(1, 20, size=len(rows)).astype(float)
+    return supply, demand, SparseMatrix.from_coo((sources, destinations), rows, cols, costs)
+
+
+def total_cost(solution, costs):
+    """Total transportation cost of an allocation"""
+    if isinstance(solution, SparseMatrix):
+        rows, cols, flows = solution.rows, solution.cols, solution.data
+    elif isinstance(costs, SparseMatrix):
+        rows, cols = np.nonzero(solution)
+        flows = solution[rows, cols]
+    else:
+        return np.sum(solution * costs)
+    if isinstance(costs, SparseMatrix):
+        return float(np.sum(flows * costs.lookup(rows, cols)))
+    return float(np.sum(flows * np.asarray(costs)[rows, cols]))
+
+
+class TransportationBasis:
+    """Basic cells of a transportation solution kept as a spanning tree.
+
+    Rows are tree nodes 0..m-1 and columns are nodes m..m+n-1; every basic
+    cell (i, j) is the tree edge between row i and column j. A dense basis
+    always has m + n - 1 cells, so degenerate solutions carry basic cells
+    with a zero flow (see ``degenerate_cells``). When only some routes are
+    allowed the basis is a spanning forest with one tree per connected part
+    of the route network. Trees are rooted at their smallest node (row 0
+    first) and the parent/depth arrays are updated locally on every pivot.
+    """
+
+    def __init__(self, m, n):
+        self.m = m
+        self.n = n
+        self.flows = {}
+        self.adjacency = [set() for _ in range(m + n)]
+        self.parent = None
+        self.depth = None
+
+    def add_cell(self, i, j, flow=0):
+        self.flows[(i, j)] = flow
+        self.adjacency[i].add(self.m + j)
+        self.adjacency[self.m + j].add(i)
+
+    def remove_cell(self, i, j):
+        del self.flows[(i, j)]
+        self.adjacency[i].discard(self.m + j)
+        self.adjacency[self.m + j].discard(i)
+
+    @classmethod
+    def from_allocation(cls, allocation, allowed=None):
+        """Build a basis from an allocation, adding zero cells where it is degenerate.
+
+        ``allocation`` is a dense matrix or a SparseMatrix. Positive cells that
+        close a loop are resolved by moving flow around the loop, so any
+        feasible allocation gives a basic one of no greater size. Zero cells
+        completing a degenerate basis are taken from the ``allowed`` routes
+        (a SparseMatrix of costs, cheapest first) when given, otherwise any
+        cell may be used.
+        """
+        if isinstance(allocation, SparseMatrix):
+            (m, n), positive = allocation.shape, allocation.data > 0
+            rows, cols = allocation.rows[positive], allocation.cols[positive]
+            values = allocation.data[positive]
+        else:
+            allocation = np.asarray(allocation)
+            (m, n) = allocation.shape
+            rows, cols = np.nonzero(allocation > 0)
+            values = allocation[rows, cols]
+        basis = cls(m, n)
+        parent = list(range(m + n))
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        for i, j, flow in zip(rows.tolist(), cols.tolist(), values.tolist()):
+            ri, rj = find(i), find(m + j)
+            if ri == rj:
+                basis._cancel_loop(i, j, flow)
+                continue
+            parent[ri] = rj
+            basis.add_cell(i, j, flow)
+
+        if len(basis.flows) < m + n - 1:
+            if allowed is None:
+                basis._complete_dense(find, parent)
+            else:
+                basis._complete_allowed(find, parent, allowed)
+        basis.build_tree()
+        return basis
+
+    @classmethod
+    def from_cells(cls, m, n, cells, allowed=None):
+        """Spanning basis through as many of the given cells as form no loop,
+        completed like ``from_allocation``; every flow is 0"""
+        basis = cls(m, n)
+        parent = list(range(m + n))
+
+        def find(x):
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        for i, j in cells:
+            ri, rj = find(i), find(m + j)
+            if ri != rj:
+                parent[ri] = rj
+                basis.add_cell(i, j)
+        if len(basis.flows) < m + n - 1:
+            if allowed is None:
+                basis._complete_dense(find, parent)
+            else:
+                basis._complete_allowed(find, parent, allowed)
+        basis.build_tree()
+        return basis
+
+    def tree_flows(self, supply, demand):
+        """Set the flows that meet ``supply`` / ``demand`` using only the basic cells.
+
+        The flows of a spanning tree are unique: the cell joining a node to
+        its parent carries the net supply of the node's subtree. They can be
+        negative when the basis does not fit the amounts; the imbalance of
+        a tree that cannot be met at all is left at its root.
+        """
+        m = self.m
+        order = self.build_tree()
+        net = np.concatenate((np.asarray(supply, dtype=float), -np.asarray(demand, dtype=float))).tolist()
+        for node in reversed(order):
+            p = self.parent[node]
+            if p < 0:
+                continue
+            if node < m:
+                self.flows[(node, p - m)] = net[node]
+            else:
+                self.flows[(p, node - m)] = -net[node]
+            net[p] += net[node]
+
+    def _cancel_loop(self, i, j, flow):
+        """Add positive cell (i, j) whose ends are already connected, removing the loop"""
+        m = self.m
+        # Path from row i to column j through the current cells
+        previous = {i: None}
+        frontier = [i]
+        for node in frontier:
+            if node == m + j:
+                break
+            for neighbor in self.adjacency[node]:
+                if neighbor not in previous:
+                    previous[neighbor] = node
+                    frontier.append(neighbor)
+        path = []
+        node = m + j
+        while previous[node] is not None:
+            path.append(self._cell(node, previous[node]))
+            node = previous[node]
+        path.reverse()
+
+        # Cells alternate losing and gaining along the path from row i
+        losing, gaining = path[0::2], path[1::2]
+        leaving = min(losing, key=lambda c: self.flows[c])
+        theta = self.flows[leaving]
+        for c in losing:
+            self.flows[c] -= theta
+        for c in gaining:
+            self.flows[c] += theta
+        self.remove_cell(*leaving)
+        self.add_cell(i, j, flow + theta)
+
+    def _complete_dense(self, find, parent):
+        """Join the remaining components to row 0 / column 0 with zero cells"""
+        m = self.m
+        if find(0) != find(m):
+            parent[find(0)] = find(m)
+            self.add_cell(0, 0)
+        hub = find(0)
+        for node in range(m + self.n):
+            root = find(node)
+            if root == hub:
+                continue
+            if node < m:
+                self.add_cell(node, 0)
+            else:
+                self.add_cell(0, node - m)
+            parent[root] = hub
+
+    def _complete_allowed(self, find, parent, allowed, chunk_size=4096):
+        """Join components with the cheapest allowed routes between them"""
+        m = self.m
+        order = np.argsort(allowed.data, kind='stable')
+        rows, cols = allowed.rows[order], allowed.cols[order]
+        while len(rows):
+            roots = np.array([find(x) for x in range(m + self.n)])
+            crossing = roots[rows] != roots[m + cols]
+            rows, cols = rows[crossing], cols[crossing]
+            for i, j in zip(rows[:chunk_size].tolist(), cols[:chunk_size].tolist()):
+                ri, rj = find(i), find(m + j)
+                if ri != rj:
+                    parent[ri] = rj
+                    self.add_cell(i, j)
+            rows, cols = rows[chunk_size:], cols[chunk_size:]
+
+    @property
+    def degenerate_cells(self):
+        return [cell for cell, flow in self.flows.items() if flow == 0]
+
+    def _cell(self, x, y):
+        """Cell of the tree edge between nodes x and y"""
+        return (x, y - self.m) if x < self.m else (y, x - self.m)
+
+    def _traverse(self, start, parent, depth, blocked=-1):
+        """Breadth-first walk from ``start`` filling parent/depth, never entering ``blocked``"""
+        order = [start]
+        for node in order:
+            for neighbor in self.adjacency[node]:
+                if neighbor != parent[node] and neighbor != blocked:
+                    parent[neighbor] = node
+                    depth[neighbor] = depth[node] + 1
+                    order.append(neighbor)
+        return order
+
+    def build_tree(self):
+        """Root every tree of the basis and return the breadth-first order of all nodes"""
+        size = self.m + self.n
+        self.parent = [-1] * size
+        self.depth = [0] * size
+        order = []
+        placed = [False] * size
+        for root in range(size):
+            if not placed[root]:
+                tree = self._traverse(root, self.parent, self.depth)
+                for node in tree:
+                    placed[node] = True
+                order.extend(tree)
+        return order
+
+    def potentials(self, costs):
+        """Row (u) and column (v) potentials, 0 at every tree root, in one traversal"""
+        order = self.build_tree()
+        parent = self.parent
+        m = self.m
+        u = np.zeros(m)
+        v = np.zeros(self.n)
+        for node in order:
+            p = parent[node]
+            if p < 0:
+                continue
+            if node < m:
+                # Reached row from its parent column
+                u[node] = costs[node, p - m] - v[p - m]
+            else:
+                v[node - m] = costs[p, node - m] - u[p]
+        return u, v
+
+    def _path(self, i, j):
+        """Tree path from row i to column j as (nodes climbing from i, nodes climbing from j)"""
+        parent, depth = self.parent, self.depth
+        a, b = i, self.m + j
+        from_row, from_col = [], []
+        while a != b:
+            if depth[a] == 0 and depth[b] == 0:
+                raise ValueError(f"Cell ({i}, {j}) joins two separate parts of the basis")
+            if depth[a] >= depth[b]:
+                from_row.append(a)
+                a = parent[a]
+            else:
+                from_col.append(b)
+                b = parent[b]
+        return from_row, from_col
+
+    def cycle(self, i, j):
+        """Closed loop created by entering cell (i, j): cells in order, entering cell first.
+
+        Cells at even positions gain flow, cells at odd positions lose it.
+        """
+        from_row, from_col = self._path(i, j)
+        parent = self.parent
+        loop = [(i, j)]
+        loop.extend(self._cell(node, parent[node]) for node in from_row)
+        loop.extend(self._cell(node, parent[node]) for node in reversed(from_col))
+        return loop
+
+    def pivot(self, i, j):
+        """Bring cell (i, j) into the basis.
+
+        Returns (theta, leaving cell, moved nodes): the nodes of the subtree
+        that was re-hung under the entering cell, in breadth-first order.
+        """
+        from_row, _ = self._path(i, j)
+        loop = self.cycle(i, j)
+        losing = range(1, len(loop), 2)
+        position = min(losing, key=lambda k: self.flows[loop[k]])
+        leaving = loop[position]
+        theta = self.flows[leaving]
+
+        self.add_cell(i, j, 0)
+        for k, c in enumerate(loop):
+            self.flows[c] += theta if k % 2 == 0 else -theta
+        self.remove_cell(*leaving)
+
+        # The leaving edge lies on i's side of the loop iff it was climbed from row i;
+        # that side is cut off and re-hung below the other end of the entering cell
+        if position <= len(from_row):
+            inner, outer = i, self.m + j
+        else:
+            inner, outer = self.m + j, i
+        self.parent[inner] = outer
+        self.depth[inner] = self.depth[outer] + 1
+        moved = self._traverse(inner, self.parent, self.depth, blocked=outer)
+        return theta, leaving, moved
+
+    def allocation(self, sparse=False):
+        """Allocation matrix of the basis, as a SparseMatrix of positive cells if ``sparse``"""
+        if sparse:
+            cells = [(i, j, flow) for (i, j), flow in self.flows.items() if flow > 0]
+            rows, cols, flows = (np.array(column) for column in zip(*cells)) if cells else ([], [], [])
+            return SparseMatrix.from_coo((self.m, self.n), rows, cols, flows, fill=0)
+        solution = np.zeros((self.m, self.n))
+        for (i, j), flow in self.flows.items():
+            solution[i, j] = flow
+        return solution
@@ -0,0 +1,209 @@
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import tempfile
+import numpy as np
+
+from graph_io import (BLOCK_SIZE, CACHE_LIMIT, detect_delimiter, evict_cache, file_stamp,
+                      first_data_lines, is_numeric, parse_block, split_fields, text_blocks)
+
+# Transportation instances read from files. Supply and demand are vectors
+# (.npy, or text / CSV with one or more values per line); the cost matrix is
+# a .npy file or a text / CSV matrix, optionally with a header row of
+# destination names and a first column of source names. Cost matrices are
+# never copied into memory: float64 .npy files are opened as read-only
+# memory maps, and other files are converted once, block by block, into a
+# float64 cache file under CACHE_DIR that is mapped the same way. Like the
+# graph cache, entries of changed files are dropped and the least recently
+# used ones are removed past CACHE_LIMIT bytes.
+
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'project_tkinter', 'transportation')
+
+
+def _reopen(filename, dtype, shape, offset):
+    return MappedArray(filename, dtype=dtype, mode='r', shape=shape, offset=offset)
+
+
+class MappedArray(np.memmap):
+    """Read-only memory map that pickles as a reference to its file, so
+    sending an instance to or from a worker process does not copy it"""
+
+    def __reduce__(self):
+        if isinstance(self.base, mmap.mmap) and self.filename:
+            return _reopen, (self.filename, self.dtype.str, self.shape, self.offset)
+        # A view of the map: fall back to copying its values
+        return np.asarray(self).__reduce__()
+
+
+def read_vector(path):
+    """1-D supply or demand vector from a .npy or text / CSV file"""
+    if path.lower().endswith('.npy'):
+        values = np.load(path)
+    else:
+        lines = first_data_lines(path, 1)
+        delimiter = detect_delimiter(lines[0]) if lines else None
+        skip = 1 if lines and not is_numeric(split_fields(lines[0], delimiter)) else 0
+        values = np.loadtxt(path, delimiter=delimiter, comments=('#', '%'), skiprows=skip, ndmin=1)
+    values = np.ravel(values)
+    return values.astype(np.int64) if np.all(values == np.round(values)) else values
+
+
+def _cache_key(path):
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps(file_stamp(path)).encode())
+    return digest.hexdigest()
+
+
+def _text_matrix_rows(path, block_size):
+    """Row blocks of a text matrix, skipping a header row and row names"""
+    lines = first_data_lines(path, 2)
+    if not lines:
+        raise ValueError(f"{path}: empty cost matrix")
+    delimiter = detect_delimiter(lines[0])
+    first = split_fields(lines[0], delimiter)
+    header = not is_numeric(first[1:]) or (len(lines) > 1 and not is_numeric(first)
+                                          and is_numeric(split_fields(lines[1], delimiter)))
+    data = split_fields(lines[1], delimiter) if header and len(lines) > 1 else first
+    labeled = not is_numeric(data[:1])
+    columns = len(data) - labeled
+    with open(path, 'rb') as f:
+        if header:
+            for raw in f:
+                line = raw.strip()
+                if line and not line.startswith((b'#', b'%')):
+                    break
+        for block in text_blocks(f, block_size):
+            try:
+                yield parse_block(block, delimiter, columns, len(data), int(labeled))
+            except ValueError as e:
+                raise ValueError(f"{path}: {e}")
+
+
+def _npy_rows(path, block_size):
+    matrix = np.load(path, mmap_mode='r')
+    if matrix.ndim != 2:
+        raise ValueError(f"{path}: expected a 2-D cost matrix")
+    step = max(1, block_size // (8 * max(matrix.shape[1], 1)))
+    for start in range(0, matrix.shape[0], step):
+        yield np.asarray(matrix[start:start + step], dtype=np.float64)
+
+
+def _write_costs(path, directory, block_size):
+    """Convert a cost matrix into ``directory``. It is written to a temporary
+    directory beside it and renamed into place once complete, so a file
+    that fails to parse leaves nothing behind."""
+    parent = os.path.dirname(directory)
+    os.makedirs(parent, exist_ok=True)
+    temporary = tempfile.mkdtemp(prefix='.partial-', dir=parent)
+    try:
+        rows = _npy_rows if path.lower().endswith('.npy') else _text_matrix_rows
+        shape = [0, None]
+        with open(os.path.join(temporary, 'costs.bin'), 'wb') as out:
+            for block in rows(path, block_size):
+                if shape[1] is None:
+                    shape[1] = block.shape[1]
+                elif block.shape[1] != shape[1]:
+                    raise ValueError(f"{path}: rows of different lengths")
+                out.write(np.ascontiguousarray(block, dtype=np.float64).tobytes())
+                shape[0] += len(block)
+        with open(os.path.join(temporary, 'meta.json'), 'w') as f:
+            json.dump({'source': os.path.abspath(path), 'stamp': file_stamp(path), 'shape': shape}, f)
+        # Left over by an interrupted run of an older version
+        if os.path.isdir(directory) and not os.path.exists(os.path.join(directory, 'meta.json')):
+            shutil.rmtree(directory, ignore_errors=True)
+        try:
+            os.rename(temporary, directory)
+        except OSError:
+            # Another process stored the same file first
+            if not os.path.exists(os.path.join(directory, 'meta.json')):
+                raise
+    finally:
+        shutil.rmtree(temporary, ignore_errors=True)
+
+
+def open_cost_matrix(path, cache_dir=None, block_size=BLOCK_SIZE, cache_limit=CACHE_LIMIT):
+    """Cost matrix of a file as a read-only float64 memory map"""
+    if path.lower().endswith('.npy'):
+        matrix = np.load(path, mmap_mode='r')
+        # MappedArray maps in C order: Fortran-ordered files go through the cache
+        if (matrix.dtype == np.float64 and matrix.ndim == 2 and isinstance(matrix, np.memmap)
+                and matrix.flags.c_contiguous):
+            return _reopen(path, matrix.dtype.str, matrix.shape, matrix.offset)
+
+    cache_dir = cache_dir or CACHE_DIR
+    directory = os.path.join(cache_dir, _cache_key(path))
+    meta_path = os.path.join(directory, 'meta.json')
+    data_path = os.path.join(directory, 'costs.bin')
+    if os.path.exists(meta_path):
+        # The meta.json time orders the cache entries by last use
+        os.utime(meta_path)
+    else:
+        _write_costs(path, directory, block_size)
+        evict_cache(cache_dir, cache_limit, keep=directory)
+    with open(meta_path) as f:
+        shape = tuple(json.load(f)['shape'])
+    if shape[0] == 0:
+        raise ValueError(f"{path}: empty cost matrix")
+    return _reopen(data_path, '<f8', shape, 0)
+
+
+def _chunk_rows(n, budget=64 * 2 ** 20):
+    return max(1, budget // (8 * max(n, 1)))
+
+
+def validate_instance(supply, demand, costs):
+    """Check shapes, signs and balance of a transportation instance.
+
+    The cost matrix is scanned in row blocks, so a memory-mapped matrix is
+    never loaded as a whole.
+    """
+    supply, demand = np.asarray(supply), np.asarray(demand)
+    if supply.ndim != 1 or demand.ndim != 1 or not len(supply) or not len(demand):
+        raise ValueError("Supply and demand must be non-empty vectors")
+    for name, values in (("Supply", supply), ("Demand", demand)):
+        bad = np.flatnonzero(~np.isfinite(values) | (values < 0))
+        if len(bad):
+            raise ValueError(f"{name} must be finite and non-negative (entry {bad[0]}: {values[bad[0]]})")
+    if not np.isclose(supply.sum(), demand.sum()):
+        raise ValueError(f"Unbalanced problem: total supply {supply.sum()} != total demand {demand.sum()}")
+    shape = getattr(costs, 'shape', None)
+    if shape != (len(supply), len(demand)):
+        raise ValueError(f"Cost matrix is {shape}, expected {(len(supply), len(demand))}")
+    if isinstance(costs, np.ndarray):
+        # inf marks a forbidden route; every source and destination needs one route
+        reachable = np.zeros(shape[1], dtype=bool)
+        step = _chunk_rows(shape[1])
+        for start in range(0, shape[0], step):
+            block = costs[start:start + step]
+            if np.isnan(block).any():
+                row, col = np.argwhere(np.isnan(block))[0]
+                raise ValueError(f"Cost matrix has no value at ({start + row}, {col})")
+            allowed = ~np.isinf(block)
+            closed = np.flatnonzero(~allowed.any(axis=1))
+            if len(closed):
+                raise ValueError(f"Source {start + closed[0]} has no allowed route")
+            reachable |= allowed.any(axis=0)
+        if not reachable.all():
+            raise ValueError(f"Destination {np.flatnonzero(~reachable)[0]} has no allowed route")
+
+
+def load_transportation_problem(supply, demand, costs=None, seed=None, cache_dir=None):
+    """(supply, demand, costs) from files or values.
+
+    ``supply`` and ``demand`` are file paths or sequences; ``costs`` is a
+    file path, an array, or None for random costs.
+    """
+    from transportation import generate_transportation_problem
+
+    supply = read_vector(supply) if isinstance(supply, (str, os.PathLike)) else np.asarray(supply)
+    demand = read_vector(demand) if isinstance(demand, (str, os.PathLike)) else np.asarray(demand)
+    if costs is None:
+        supply, demand, costs = generate_transportation_problem(len(supply), supply, demand, seed=seed)
+    elif isinstance(costs, (str, os.PathLike)):
+        costs = open_cost_matrix(os.fspath(costs), cache_dir)
+    elif not hasattr(costs, 'shape'):
+        costs = np.asarray(costs, dtype=float)
+    validate_instance(supply, demand, costs)
+    return supply, demand, costs
@@ -1,33 +1,180 @@
-import tkinter as tk
-from tkinter import messagebox
+import heapq
 import numpy as np
 import networkx as nx
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from display_utils import display_graph_result
+from results import ColoringResult
+from csr_graph import CSRGraph
+from graph_generator import generate_random_graph
 
-# Welsh-Powell Algorithm for graph coloring
-def run_welsh_powell(frame, vertices):
+def generate_welsh_powell_graph(vertices, density=0.5, seed=None):
+    """Generate a random graph to color"""
+    return generate_random_graph(vertices, density, connected=False,
+                                 weights=None, seed=seed).to_networkx()
+
+# Coloring engines on CSR adjacency. Colors are small integers, so each
+# engine tracks the colors taken around a vertex as a bitset: a stamp array
+# indexed by color (Welsh-Powell), a Python int bitmask (DSatur) or a
+# uint64 mask per vertex (Jones-Plassmann).
+
+def degree_order(csr):
+    """Vertices by decreasing degree, ties by index.
+
+    Degrees are bounded by V, so the sort is a stable counting/radix sort
+    (numpy's stable sort of 8/16-bit keys) rather than a comparison sort.
+    """
+    degrees = csr.degrees()
+    key = degrees.max() - degrees if len(degrees) else degrees
+    if key.max(initial=0) < 2 ** 16:
+        key = key.astype(np.uint16)
+    return np.argsort(key, kind='stable')
+
+def welsh_powell_arrays(csr):
+    """Greedy coloring in decreasing degree order; returns the color array"""
+    n = csr.vertices
+    indptr, indices, _ = csr.lists()
+    colors = [-1] * n
+    # forbidden[c] == v marks color c as taken around v; the stamps never
+    # need clearing, and the extra last slot absorbs uncolored neighbours (-1)
+    forbidden = [-1] * (int(csr.degrees().max(initial=0)) + 2)
+    for v in degree_order(csr).tolist():
+        for k in range(indptr[v], indptr[v + 1]):
+            forbidden[colors[indices[k]]] = v
+        c = 0
+        while forbidden[c] == v:
+            c += 1
+        colors[v] = c
+    return np.array(colors, dtype=np.int64)
+
+def dsatur_arrays(csr):
+    """DSatur: always color the vertex with the most distinct neighbour
+    colors (ties by degree) next; returns the color array"""
+    n = csr.vertices
+    indptr, indices, _ = csr.lists()
+    degrees = csr.degrees().tolist()
+    colors = [-1] * n
+    taken = [0] * n          # bitmask of neighbour colors
+    saturation = [0] * n
+    heap = [(0, -degrees[v], v) for v in range(n)]
+    heapq.heapify(heap)
+    while heap:
+        negative_saturation, _, v = heapq.heappop(heap)
+        if colors[v] >= 0 or -negative_saturation != saturation[v]:
+            continue    # stale entry
+        mask = taken[v]
+        c = (~mask & (mask + 1)).bit_length() - 1    # lowest free color
+        colors[v] = c
+        bit = 1 << c
+        for k in range(indptr[v], indptr[v + 1]):
+            w = indices[k]
+            if colors[w] < 0 and not taken[w] & bit:
+                taken[w] |= bit
+                saturation[w] += 1
+                heapq.heappush(heap, (-saturation[w], -degrees[w], w))
+    return np.array(colors, dtype=np.int64)
+
+def lowest_free_colors(vertices, taken, n):
+    """Lowest color not in ``taken`` around each vertex, for arcs
+    (vertices[i], neighbour of color taken[i]); one entry per vertex 0..n-1"""
+    if len(taken) and taken.max() >= 63:
+        # Too many colors for a machine word: sort the distinct
+        # (vertex, color) pairs and find the first gap in each run
+        pairs = np.unique(vertices * (n + 1) + taken)
+        vertex, color = pairs // (n + 1), pairs % (n + 1)
+        position = np.arange(len(pairs)) - np.searchsorted(vertex, vertex)
+        lowest = np.bincount(vertex, minlength=n)
+        gap = color != position
+        np.minimum.at(lowest, vertex[gap], position[gap])
+        return lowest
+    mask = np.zeros(n, dtype=np.uint64)
+    np.bitwise_or.at(mask, vertices, np.left_shift(np.uint64(1), taken.astype(np.uint64)))
+    free = ~mask & (mask + np.uint64(1))    # lowest clear bit
+    return np.log2(free.astype(float)).astype(np.int64)
+
+def jones_plassmann_arrays(csr, seed=None):
+    """Jones-Plassmann coloring: in each round every uncolored vertex whose
+    random priority beats all its uncolored neighbours takes the lowest
+    color free around it. The rounds are vectorized over all arcs, so the
+    Python overhead is per round rather than per vertex.
+
+    Returns (colors, rounds).
+    """
+    n = csr.vertices
+    priority = np.random.default_rng(seed).permutation(n)
+    tails = np.repeat(np.arange(n), csr.degrees())
+    heads = csr.indices
+    # A vertex only waits for (and only sees the colors of) neighbours of
+    # higher priority, so the arcs pointing down are never needed
+    up = priority[heads] > priority[tails]
+    tails, heads = tails[up], heads[up]
+    pending = np.bincount(tails, minlength=n)
+    colors = np.full(n, -1, dtype=np.int64)
+    uncolored = np.ones(n, dtype=bool)
+    rounds = 0
+    while uncolored.any():
+        rounds += 1
+        chosen = uncolored & (pending == 0)
+        arcs = chosen[tails]
+        lowest = lowest_free_colors(tails[arcs], colors[heads[arcs]], n)
+        colors[chosen] = lowest[chosen]
+        uncolored &= ~chosen
+        # Drop the arcs of colored vertices and release their waiting neighbours
+        tails, heads = tails[~arcs], heads[~arcs]
+        pending -= np.bincount(tails[chosen[heads]], minlength=n)
+    return colors, rounds
+
+COLORING_METHODS = ("welsh_powell", "dsatur", "jones_plassmann")
+
+def solve_welsh_powell(graph, method="welsh_powell", seed=None):
+    """Vertex coloring of a networkx graph or CSRGraph.
+
+    ``method`` is "welsh_powell" (greedy by decreasing degree), "dsatur"
+    (usually fewer colors) or "jones_plassmann" (vectorized rounds, for
+    very large graphs). Directed graphs are colored as undirected: vertices
+    joined by an arc in either direction get different colors.
+    """
+    csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_networkx(graph)
+    csr = csr.to_undirected()
+    iterations = 0
+    if method == "welsh_powell":
+        colors = welsh_powell_arrays(csr)
+    elif method == "dsatur":
+        colors = dsatur_arrays(csr)
+    elif method == "jones_plassmann":
+        colors, iterations = jones_plassmann_arrays(csr, seed)
+    else:
+        raise ValueError(f"Unknown coloring method: {method}")
+    num_colors = int(colors.max()) + 1 if len(colors) else 0
+    return ColoringResult(colors, num_colors, iterations)
+
+CLASS_LIST_LIMIT = 60    # larger colorings are summarized by their color count
+
+def display_welsh_powell(frame, graph, result):
+    from display_utils import display_graph_result, subplots
+    from layout import get_layout
+
+    # Figure of this result window, reused across runs
+    fig, ax = subplots(frame, figsize=(8, 6))
+
+    # Plot the graph with coloring
+    pos = get_layout(graph)
+    colors = [result.colors[node] for node in graph.nodes()]
+    nx.draw(graph, pos, with_labels=True, node_color=colors, cmap='Set3', ax=ax)
+    nx.draw_networkx_edges(graph, pos, edge_color="black", ax=ax)
+
+    # Show the graph in the GUI, listing the color classes of small graphs only
+    text = f"Welsh-Powell Coloring: {result.num_colors} colors for {len(result.colors)} vertices"
+    if len(result.colors) <= CLASS_LIST_LIMIT:
+        for color in range(result.num_colors):
+            members = np.flatnonzero(result.colors == color)
+            text += f"\nColor {color}: " + ", ".join(map(str, members.tolist()))
+    display_graph_result(frame, fig, text)
+
+def run_welsh_powell(frame, vertices, method="welsh_powell"):
+    from tkinter import messagebox
     try:
-        # Generate a random graph
-        graph = nx.erdos_renyi_graph(vertices, 0.5)
-        
-        # Perform graph coloring
-        coloring = nx.coloring.greedy_color(graph, strategy="largest_first")
-        
-        # Create a new figure
-        plt.clf()  # Clear any existing figures
-        fig, ax = plt.subplots(figsize=(8, 6))
-        
-        # Plot the graph with coloring
-        pos = nx.spring_layout(graph)
-        colors = [coloring[node] for node in graph.nodes()]
-        nx.draw(graph, pos, with_labels=True, node_color=colors, cmap=plt.cm.Set3, ax=ax)
-        nx.draw_networkx_edges(graph, pos, edge_color="black", ax=ax)
-        
-        # Show the graph in the GUI
-        display_graph_result(frame, fig, f"Welsh-Powell Coloring:\n{coloring}")
-        
+        graph = generate_welsh_powell_graph(vertices)
+        result = solve_welsh_powell(graph, method)
+        display_welsh_powell(frame, graph, result)
+
     except Exception as e:
         messagebox.showerror("Error", f"An error occurred: {str(e)}")
         print(f"Error in Welsh-Powell algorithm: {str(e)}")